@@ -22,6 +22,7 @@ from optimizer.system_monitor import SystemMonitor
 from optimizer.schedule_manager import ScheduleManager
 from optimizer.universal_app_scanner import UniversalAppScanner, AppInfo
 from optimizer.special_modes import SpecialModes
+from optimizer.space_tracker import ReclaimableSpaceTracker
 
 
 class AdvancedMainWindow(ctk.CTk):
@@ -46,6 +47,12 @@ class AdvancedMainWindow(ctk.CTk):
         self.schedule_manager = ScheduleManager()
         self.special_modes = SpecialModes(self.advanced_optimizer)
         
+        # Espaço recuperável atualizado continuamente
+        self.space_tracker = ReclaimableSpaceTracker()
+        self.space_tracker.start()
+        self.system_monitor.attach_space_tracker(self.space_tracker)
+        self.schedule_manager.attach_space_tracker(self.space_tracker)
+        
         # Dados
         self.apps_list: List[AppInfo] = []
         self.selected_apps: List[AppInfo] = []
@@ -231,6 +238,33 @@ class AdvancedMainWindow(ctk.CTk):
         )
         self.system_report_btn.pack(pady=10, padx=20, fill="x")
         
+        self.app_caches_btn = ctk.CTkButton(
+            quick_frame,
+            text="📦 Caches de Aplicativos",
+            command=self.open_app_caches,
+            height=40,
+            font=("Arial", 12, "bold")
+        )
+        self.app_caches_btn.pack(pady=10, padx=20, fill="x")
+        
+        self.disk_usage_btn = ctk.CTkButton(
+            quick_frame,
+            text="🗂️ Uso do Disco",
+            command=self.open_disk_usage,
+            height=40,
+            font=("Arial", 12, "bold")
+        )
+        self.disk_usage_btn.pack(pady=10, padx=20, fill="x")
+        
+        self.large_files_btn = ctk.CTkButton(
+            quick_frame,
+            text="🐘 Arquivos Grandes e Esquecidos",
+            command=self.open_large_files,
+            height=40,
+            font=("Arial", 12, "bold")
+        )
+        self.large_files_btn.pack(pady=10, padx=20, fill="x")
+        
         # Frame de otimização avançada
         advanced_frame = ctk.CTkFrame(self.optimization_tab)
         advanced_frame.grid(row=1, column=1, sticky="nsew", padx=10, pady=10)
@@ -537,6 +571,13 @@ class AdvancedMainWindow(ctk.CTk):
         self.temp_label = ctk.CTkLabel(temp_frame, text="🌡️ Temperatura: N/A", font=("Arial", 12, "bold"))
         self.temp_label.pack(pady=5)
         
+        # Espaço recuperável
+        reclaimable_frame = ctk.CTkFrame(metrics_frame)
+        reclaimable_frame.pack(pady=10, padx=20, fill="x")
+        
+        self.reclaimable_label = ctk.CTkLabel(reclaimable_frame, text="🧹 Recuperável: Calculando...", font=("Arial", 12, "bold"))
+        self.reclaimable_label.pack(pady=5)
+        
         # Frame de processos
         processes_frame = ctk.CTkFrame(self.monitoring_tab)
         processes_frame.grid(row=1, column=1, sticky="nsew", padx=10, pady=10)
@@ -1270,6 +1311,11 @@ class AdvancedMainWindow(ctk.CTk):
             if temp:
                 self.temp_label.configure(text=f"🌡️ Temperatura: {temp}°C")
             
+            # Espaço recuperável (contador contínuo, sem nova varredura)
+            reclaimable = self.current_metrics.get('reclaimable')
+            if reclaimable and reclaimable['ready']:
+                self.reclaimable_label.configure(text=f"🧹 Recuperável: {reclaimable['bytes_formatted']}")
+            
             # Atualizar processos
             self.update_processes_display()
             
@@ -1703,11 +1749,23 @@ class AdvancedMainWindow(ctk.CTk):
                     for opt in optimizations:
                         self.after(0, lambda o=opt: self.log_optimization(f"✅ {o}"))
                     
+                    stats = getattr(self.advanced_optimizer, 'gpu_cache_stats', {})
+                    freed = stats.get('bytes_freed', 0) / (1024 * 1024)
+                    kept = stats.get('bytes_kept', 0) / (1024 * 1024)
+                    if stats.get('full', True):
+                        title = "CACHE GPU LIMPO!"
+                        summary = f"🎯 Cache DirectX e GPU limpos: {freed:.1f} MB liberados"
+                    else:
+                        title = "CACHE DE SHADERS PODADO!"
+                        summary = (f"🗑️ Cache de shaders podado: {freed:.1f} MB liberados\n"
+                                   f"🎮 Mantido para jogos recentes: {kept:.1f} MB "
+                                   f"em {stats.get('entries_kept', 0)} entradas")
+                    
                     self.after(0, lambda: self.log_optimization("🗑️ Limpeza de cache GPU concluída!"))
                     self.after(0, lambda: messagebox.showinfo("Sucesso", 
-                                            "🗑️ CACHE GPU LIMPO!\n\n" +
+                                            f"🗑️ {title}\n\n" +
                                             f"📊 Operações realizadas: {len(optimizations)}\n" +
-                                            "🎯 Cache DirectX e GPU completamente limpos!"))
+                                            summary))
                 else:
                     # Fallback para limpeza básica
                     self.advanced_cleaner.clean_browser_profiles_deep()
@@ -1721,6 +1779,165 @@ class AdvancedMainWindow(ctk.CTk):
         
         threading.Thread(target=clear_worker, daemon=True).start()
     
+    def open_app_caches(self):
+        """📦 Maiores caches de aplicativos, com limpeza dos escolhidos"""
+        self.log_optimization("📦 Medindo caches de aplicativos...")
+        
+        def scan_worker():
+            try:
+                sizes = self.advanced_cleaner.scan_app_caches()
+                self.after(0, lambda: self.show_app_caches(sizes))
+            except Exception as e:
+                error_msg = str(e)
+                self.after(0, lambda: self.log_optimization(f"❌ Erro ao medir caches: {error_msg}"))
+        
+        threading.Thread(target=scan_worker, daemon=True).start()
+    
+    def show_app_caches(self, sizes):
+        """Janela com os caches ordenados do maior para o menor"""
+        window = ctk.CTkToplevel(self)
+        window.title("📦 Caches de Aplicativos")
+        window.geometry("620x520")
+        
+        caches_frame = ctk.CTkScrollableFrame(window, height=380)
+        caches_frame.pack(pady=10, padx=10, fill="both", expand=True)
+        
+        selected = {}
+        for item in sizes:
+            if item['bytes'] == 0:
+                continue
+            text = f"{item['bytes_formatted']:>10}  {item['app']} - {item['description']}"
+            if item['running']:
+                text += " (aberto)"
+            checkbox = ctk.CTkCheckBox(caches_frame, text=text)
+            if item['risk'] == 'safe' and not item['running']:
+                checkbox.select()
+            checkbox.pack(pady=3, padx=10, anchor="w")
+            selected[item['id']] = checkbox
+        
+        if not selected:
+            ctk.CTkLabel(caches_frame, text="Nenhum cache encontrado").pack(pady=20)
+        
+        def clean_selected():
+            chosen = [cache_id for cache_id, checkbox in selected.items() if checkbox.get()]
+            window.destroy()
+            if not chosen:
+                return
+            
+            def clean_worker():
+                try:
+                    result = self.advanced_cleaner.clean_app_caches(chosen)
+                    freed = result['bytes_freed'] / (1024 * 1024)
+                    self.after(0, lambda: self.log_optimization(f"✅ Caches de aplicativos limpos: {freed:.1f} MB"))
+                    for cache_id in result['skipped']:
+                        self.after(0, lambda c=cache_id: self.log_optimization(f"  ⚠️ {c} ignorado (aplicativo aberto)"))
+                except Exception as e:
+                    error_msg = str(e)
+                    self.after(0, lambda: self.log_optimization(f"❌ Erro na limpeza: {error_msg}"))
+            
+            threading.Thread(target=clean_worker, daemon=True).start()
+        
+        clean_btn = ctk.CTkButton(window, text="🧹 Limpar Selecionados", command=clean_selected, height=40)
+        clean_btn.pack(pady=10, padx=20, fill="x")
+    
+    def open_disk_usage(self):
+        """🗂️ Maiores pastas do volume do sistema"""
+        self.log_optimization("🗂️ Analisando uso do disco...")
+        
+        def scan_worker():
+            try:
+                def progress_callback(message, listed):
+                    self.after(0, lambda: self.log_optimization(f"  📝 {message}"))
+                
+                largest = self.advanced_cleaner.get_largest_folders(progress_callback=progress_callback)
+                self.after(0, lambda: self.show_disk_usage(largest))
+            except Exception as e:
+                error_msg = str(e)
+                self.after(0, lambda: self.log_optimization(f"❌ Erro ao analisar disco: {error_msg}"))
+        
+        threading.Thread(target=scan_worker, daemon=True).start()
+    
+    def show_disk_usage(self, folders, title="Maiores pastas"):
+        """Janela com as pastas da maior para a menor; clicar abre as subpastas (do cache)"""
+        from optimizer.disk_analyzer import get_disk_analyzer
+        
+        window = ctk.CTkToplevel(self)
+        window.title(f"🗂️ Uso do Disco - {title}")
+        window.geometry("720x520")
+        
+        folders_frame = ctk.CTkScrollableFrame(window, height=440)
+        folders_frame.pack(pady=10, padx=10, fill="both", expand=True)
+        
+        def open_folder(path):
+            children = get_disk_analyzer().children(path, limit=100)
+            self.show_disk_usage(children, title=path)
+        
+        for folder in folders:
+            text = f"{folder['bytes_formatted']:>10}  {folder['path']}  ({folder['files']} arquivos)"
+            button = ctk.CTkButton(folders_frame, text=text, anchor="w", fg_color="transparent",
+                                   command=lambda p=folder['path']: open_folder(p))
+            button.pack(pady=2, padx=5, fill="x")
+        
+        if not folders:
+            ctk.CTkLabel(folders_frame, text="Nenhuma pasta encontrada").pack(pady=20)
+    
+    def open_large_files(self):
+        """🐘 Maiores arquivos e arquivos há mais tempo sem uso nas pastas do usuário"""
+        self.log_optimization("🐘 Procurando arquivos grandes e esquecidos...")
+        
+        def scan_worker():
+            try:
+                result = self.advanced_cleaner.find_large_and_old_files(limit=30)
+                self.after(0, lambda: self.show_large_files(result))
+            except Exception as e:
+                error_msg = str(e)
+                self.after(0, lambda: self.log_optimization(f"❌ Erro na busca: {error_msg}"))
+        
+        threading.Thread(target=scan_worker, daemon=True).start()
+    
+    def show_large_files(self, result):
+        """Janela com os maiores e os mais antigos; os marcados vão para a quarentena"""
+        window = ctk.CTkToplevel(self)
+        window.title("🐘 Arquivos Grandes e Esquecidos")
+        window.geometry("760x560")
+        
+        files_frame = ctk.CTkScrollableFrame(window, height=420)
+        files_frame.pack(pady=10, padx=10, fill="both", expand=True)
+        
+        selected = {}
+        sections = [("📏 Maiores arquivos", result.get('largest', [])),
+                    ("🕰️ Sem uso há mais tempo", result.get('oldest', []))]
+        for title, files in sections:
+            ctk.CTkLabel(files_frame, text=title, font=("Arial", 12, "bold")).pack(pady=(10, 3), padx=10, anchor="w")
+            for file_info in files:
+                if file_info['path'] in selected:
+                    continue
+                text = f"{file_info['size_formatted']:>10}  {file_info['age_days']:>5} dias  {file_info['path']}"
+                checkbox = ctk.CTkCheckBox(files_frame, text=text)
+                checkbox.pack(pady=2, padx=10, anchor="w")
+                selected[file_info['path']] = (checkbox, file_info)
+        
+        def remove_selected():
+            chosen = [file_info for checkbox, file_info in selected.values() if checkbox.get()]
+            window.destroy()
+            if not chosen:
+                return
+            
+            def remove_worker():
+                try:
+                    removed = self.advanced_cleaner.remove_files(chosen, label='Arquivos grandes/esquecidos')
+                    self.after(0, lambda: self.log_optimization(
+                        f"✅ {removed['removed_count']} arquivos movidos para a quarentena "
+                        f"({removed['removed_size_formatted']})"))
+                except Exception as e:
+                    error_msg = str(e)
+                    self.after(0, lambda: self.log_optimization(f"❌ Erro ao remover: {error_msg}"))
+            
+            threading.Thread(target=remove_worker, daemon=True).start()
+        
+        remove_btn = ctk.CTkButton(window, text="🗑️ Remover Selecionados (quarentena)", command=remove_selected, height=40)
+        remove_btn.pack(pady=10, padx=20, fill="x")
+    
     def manage_process_priorities(self):
         """🚀 Gerenciar prioridades de processos"""
         self.log_optimization("🚀 Iniciando gerenciamento de processos...")
@@ -1,12 +1,29 @@
 import os
 import shutil
 import subprocess
-import hashlib
 import logging
 import winreg
 from collections import defaultdict
 from pathlib import Path
 from .utils import Utils
+from .hash_index import FileHashIndex
+from .hash_engine import (ParallelHasher, DEFAULT_ALGORITHM,
+                          calculate_full_hash, calculate_partial_hash)
+from .fs_walk import iter_files
+from .duplicate_pipeline import DuplicatePipeline, collect_groups
+from .size_spill import ExternalSizeGrouper
+from .quarantine import get_quarantine_manager
+from .file_linker import link_duplicate
+from .background import current_throttle
+from .cleaning_engine import CleaningEngine
+from .browser_profiles import discover_profiles, clean_profiles
+from .app_caches import load_catalog, size_caches, select_entries, clean_caches
+from .disk_analyzer import get_disk_analyzer
+from .file_finder import find_top_files, top_files_from_inventory
+from .file_inventory import get_file_inventory
+from .io_scheduler import get_io_scheduler
+from .directory_digest import (build_directory_tree, structural_candidates,
+                               compute_digests, group_identical_directories)
 
 class AdvancedCleaner:
     """Limpeza profunda e avançada do sistema"""
@@ -14,119 +31,556 @@ class AdvancedCleaner:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.duplicate_files = []
+        self.duplicate_scan_stats = {}
+        self.duplicate_directories = []
+        self.duplicate_directory_stats = {}
+        self.large_old_files = {}  # Última busca de maiores arquivos/esquecidos
+        
+        # Inventário de arquivos compartilhado: pastas já varridas não são percorridas de novo
+        self.file_inventory = get_file_inventory()
+        
+        # Remoções vão para a quarentena do volume (desfazíveis, purgadas depois)
+        self.use_quarantine = True
         self.cleaned_size = 0
         self.cleaned_files = 0
         
-    def find_duplicate_files(self, directories=None, progress_callback=None):
-        """Encontra arquivos duplicados baseado em hash MD5"""
+        # Catálogo de caches de aplicativos (Discord, Steam, Epic...) e última medição
+        self.app_cache_catalog = load_catalog()
+        self.app_cache_sizes = []
+        
+        # Limites da análise de duplicatas
+        self.duplicate_min_size = 1024  # 1KB
+        self.duplicate_max_size = 500 * 1024 * 1024  # 500MB
+        self.partial_hash_block = 64 * 1024  # Bloco lido do início e do fim no hash parcial
+        
+        # Índice persistente de hashes (criado sob demanda)
+        self.hash_index = None
+        
+        # Pool de hash: workers None = núcleos disponíveis, executor 'thread' ou 'process'
+        self.hash_config = {
+            'workers': None,
+            'executor': 'thread',
+            'max_inflight_mb': 256,
+            'algorithm': DEFAULT_ALGORITHM,  # 'blake2b', 'xxh128' (xxhash) ou 'md5'
+            'per_device': True  # Modo 'thread': HDs na fila do disco (um arquivo por vez), o resto usa 'workers'
+        }
+        
+        # Modo de memória externa: agrupamento por tamanho em runs ordenados no disco
+        self.duplicate_memory_config = {
+            'external_mode': False,
+            'max_memory_mb': 64,
+            'spill_dir': None  # None = diretório temporário do sistema
+        }
+        
+    def find_duplicate_files(self, directories=None, progress_callback=None, use_index=True,
+                             external_memory=None):
+        """
+        Encontra arquivos duplicados (lista completa ao final da análise)
+        
+        Consome iter_duplicate_groups e retorna os grupos finais, no formato
+        usado por remove_duplicate_files. As estatísticas de bytes lidos por
+        estágio ficam em self.duplicate_scan_stats
+        """
+        # Um grupo é entregue de novo sempre que ganha arquivos
+        duplicates = collect_groups(
+            self.iter_duplicate_groups(directories, progress_callback, use_index, external_memory)
+        )
+        self.duplicate_files = duplicates
+        return duplicates
+    
+    def iter_duplicate_groups(self, directories=None, progress_callback=None, use_index=True,
+                              external_memory=None):
+        """
+        Busca duplicatas em uma única varredura, entregando grupos assim que comprovados
+        
+        Cada arquivo passa por três estágios, disparados conforme a varredura avança:
+        1. Agrupamento por tamanho (stat do DirEntry, sem leitura de conteúdo)
+        2. Hash parcial dos blocos inicial e final quando outro arquivo tem o mesmo tamanho
+        3. Hash completo apenas quando o hash parcial também colide
+        
+        Um grupo é entregue quando dois arquivos têm o mesmo hash completo e é
+        entregue novamente (mesma chave 'hash', lista atualizada) a cada novo
+        arquivo idêntico encontrado. Quem consome deve indexar os grupos por
+        tamanho e 'hash' (ver collect_groups).
+        
+        Com external_memory=True (ou duplicate_memory_config['external_mode'])
+        o agrupamento por tamanho é feito em disco e os grupos só começam a
+        sair depois da varredura, mas a memória fica limitada mesmo em discos
+        com milhões de arquivos.
+        
+        O algoritmo de hash vem de self.hash_config['algorithm'] e é registrado
+        em cada grupo ('algorithm') e nas estatísticas da análise. Com
+        use_index=True os hashes são reaproveitados do índice persistente,
+        então uma nova análise só lê arquivos novos ou alterados.
+        """
         if directories is None:
-            directories = [
-                os.path.expanduser("~/Downloads"),
-                os.path.expanduser("~/Documents"),
-                os.path.expanduser("~/Desktop"),
-                os.path.expanduser("~/Pictures"),
-                os.path.expanduser("~/Videos"),
-                os.path.expanduser("~/Music")
-            ]
+            directories = self._default_duplicate_directories()
         
         if progress_callback:
             progress_callback("Analisando arquivos para duplicatas...", 0)
         
-        file_hashes = defaultdict(list)
-        total_files = 0
-        processed_files = 0
+        stats = {
+            'files_scanned': 0,
+            'bytes_discovered': 0,
+            'size_candidates': 0,
+            'partial_candidates': 0,
+            'full_candidates': 0,
+            'bytes_read': {'size': 0, 'partial': 0, 'full': 0},
+            'index': {'enabled': False, 'hits': 0, 'misses': 0, 'pruned': 0},
+            'algorithm': self.hash_config.get('algorithm', DEFAULT_ALGORITHM)
+        }
+        self.duplicate_scan_stats = stats
+        
+        hash_index = self._get_hash_index() if use_index else None
+        if hash_index:
+            hash_index.reset_counters()
+            stats['index']['enabled'] = True
+        
+        if external_memory is None:
+            external_memory = self.duplicate_memory_config.get('external_mode', False)
+        stats['external_mode'] = bool(external_memory)
+        
+        with self._create_hasher() as hasher:
+            pipeline = DuplicatePipeline(hasher, stats, hash_index, progress_callback)
+            if all(self.file_inventory.covers(directory) for directory in directories):
+                stats['from_inventory'] = True
+                yield from self._scan_duplicates_from_inventory(directories, pipeline)
+            elif external_memory:
+                yield from self._scan_duplicates_external(directories, pipeline)
+            else:
+                yield from self._scan_duplicates_in_memory(directories, pipeline)
+            
+            # Fim da varredura: processa o restante (pode gerar novos hashes completos)
+            yield from pipeline.finish()
+        
+        if hash_index:
+            hash_index.commit()
+            stats['index']['pruned'] = hash_index.prune(directories)
+            stats['index']['hits'] = hash_index.hits
+            stats['index']['misses'] = hash_index.misses
+        
+        self.logger.info(
+            f"Duplicatas: {pipeline.group_count()} grupos. "
+            f"Bytes lidos - parcial: {Utils.format_size(stats['bytes_read']['partial'])}, completo: "
+            f"{Utils.format_size(stats['bytes_read']['full'])}. Índice - acertos: "
+            f"{stats['index']['hits']}, falhas: {stats['index']['misses']}"
+        )
         
-        # Primeira passagem: contar arquivos
-        for directory in directories:
-            if os.path.exists(directory):
-                for root, dirs, files in os.walk(directory):
-                    total_files += len(files)
+        if progress_callback:
+            progress_callback("Análise de duplicatas concluída", 100)
+    
+    def find_duplicate_directories(self, directories=None, progress_callback=None, use_index=True,
+                                   min_size=1024 * 1024):
+        """
+        Encontra pastas inteiras duplicadas usando digests Merkle
+        
+        1. Uma varredura monta a árvore e a assinatura estrutural de cada pasta
+           (nomes e tamanhos dos arquivos e subpastas), sem ler conteúdo
+        2. Só os arquivos de pastas com assinatura repetida recebem hash completo
+           (reaproveitando o índice persistente)
+        3. O digest de cada pasta combina os nomes e digests dos filhos
+        
+        Os grupos partem da maior subárvore idêntica: pastas aninhadas em
+        grupos já listados saem do grupo e o espaço recuperável conta só as
+        cópias que sobram. O resultado fica em self.duplicate_directories.
+        
+        Args:
+            min_size: Tamanho mínimo de uma pasta para ser listada
+        """
+        if directories is None:
+            directories = self._default_duplicate_directories()
         
-        # Segunda passagem: calcular hashes
-        for directory in directories:
-            if not os.path.exists(directory):
-                continue
-                
-            for root, dirs, files in os.walk(directory):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    processed_files += 1
-                    
-                    if progress_callback:
-                        progress = (processed_files / total_files) * 100 if total_files > 0 else 0
-                        progress_callback(f"Analisando: {file}", progress)
-                    
+        if progress_callback:
+            progress_callback("Mapeando estrutura das pastas...", 0)
+        
+        nodes = build_directory_tree(directories)
+        candidates = structural_candidates(nodes)
+        
+        hash_index = self._get_hash_index() if use_index else None
+        jobs = []
+        for node in candidates:
+            for name, file_size in node.files:
+                file_path = os.path.join(node.path, name)
+                cached = None
+                if hash_index:
                     try:
-                        # Ignora arquivos muito pequenos ou muito grandes
-                        file_size = os.path.getsize(file_path)
-                        if file_size < 1024 or file_size > 500 * 1024 * 1024:  # < 1KB ou > 500MB
-                            continue
-                        
-                        file_hash = self._calculate_file_hash(file_path)
-                        if file_hash:
-                            file_hashes[file_hash].append({
-                                'path': file_path,
-                                'size': file_size,
-                                'modified': os.path.getmtime(file_path)
-                            })
-                    except (PermissionError, FileNotFoundError, OSError):
+                        file_stat = os.stat(file_path)
+                    except OSError:
                         continue
+                    cached = hash_index.lookup(file_path, file_stat, 'full')
+                jobs.append((file_path, file_size, cached))
+        
+        stats = {
+            'directories_scanned': len(nodes),
+            'structural_candidates': len(candidates),
+            'files_hashed': 0,
+            'bytes_read': 0,
+            'algorithm': self.hash_config.get('algorithm', DEFAULT_ALGORITHM)
+        }
         
-        # Encontra duplicatas
-        duplicates = []
-        for file_hash, file_list in file_hashes.items():
-            if len(file_list) > 1:
-                # Ordena por data de modificação (mantém o mais antigo)
-                file_list.sort(key=lambda x: x['modified'])
-                duplicates.append({
-                    'hash': file_hash,
-                    'files': file_list,
-                    'original': file_list[0],
-                    'duplicates': file_list[1:],
-                    'total_size': sum(f['size'] for f in file_list[1:])
-                })
+        file_hashes = {path: cached for path, _, cached in jobs if cached}
+        pending = [(path, size) for path, size, cached in jobs if not cached]
+        total_bytes = sum(size for _, size in pending) or 1
+        
+        with self._create_hasher() as hasher:
+            hash_jobs = ((path, path, size, 'full') for path, size in pending)
+            for file_path, file_hash, bytes_read in hasher.map(hash_jobs):
+                stats['files_hashed'] += 1
+                stats['bytes_read'] += bytes_read
+                if not file_hash:
+                    continue
+                file_hashes[file_path] = file_hash
+                if hash_index:
+                    try:
+                        hash_index.store(file_path, os.stat(file_path), full_hash=file_hash)
+                    except OSError:
+                        pass
+                if progress_callback:
+                    progress = min(stats['bytes_read'] / total_bytes * 95, 95)
+                    progress_callback(f"Hash: {os.path.basename(file_path)}", progress)
         
-        self.duplicate_files = duplicates
+        if hash_index:
+            hash_index.commit()
+        
+        compute_digests(candidates, file_hashes)
+        groups = group_identical_directories(candidates, min_size)
+        
+        self.duplicate_directories = groups
+        self.duplicate_directory_stats = stats
+        self.logger.info(
+            f"Pastas duplicadas: {len(groups)} grupos, "
+            f"{Utils.format_size(sum(g['total_size'] for g in groups))} recuperáveis. "
+            f"{stats['structural_candidates']} de {stats['directories_scanned']} pastas "
+            f"precisaram de hash ({Utils.format_size(stats['bytes_read'])} lidos)"
+        )
         
         if progress_callback:
-            progress_callback("Análise de duplicatas concluída", 100)
+            progress_callback("Análise de pastas duplicadas concluída", 100)
         
-        return duplicates
+        return groups
+    
+    def _default_duplicate_directories(self):
+        """Pastas do usuário analisadas por padrão na busca de duplicatas"""
+        return [
+            os.path.expanduser("~/Downloads"),
+            os.path.expanduser("~/Documents"),
+            os.path.expanduser("~/Desktop"),
+            os.path.expanduser("~/Pictures"),
+            os.path.expanduser("~/Videos"),
+            os.path.expanduser("~/Music")
+        ]
     
-    def remove_duplicate_files(self, duplicates_to_remove=None, progress_callback=None):
-        """Remove arquivos duplicados selecionados"""
+    def _iter_duplicate_entries(self, directories, stats):
+        """Varre os diretórios entregando (DirEntry, stat) dos arquivos dentro dos limites de tamanho"""
+        for entry in iter_files(directories):
+            try:
+                # No Windows o stat do DirEntry vem da listagem, sem chamada extra
+                entry_stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            
+            # Ignora arquivos muito pequenos ou muito grandes
+            file_size = entry_stat.st_size
+            if file_size < self.duplicate_min_size or file_size > self.duplicate_max_size:
+                continue
+            
+            stats['files_scanned'] += 1
+            stats['bytes_discovered'] += file_size
+            yield entry, entry_stat
+    
+    def _scan_duplicates_in_memory(self, directories, pipeline):
+        """Agrupa por tamanho em memória, enviando colisões ao pipeline durante a varredura"""
+        size_buckets = defaultdict(list)  # tamanho -> arquivos
+        
+        for entry, entry_stat in self._iter_duplicate_entries(directories, pipeline.stats):
+            file_info = {
+                'path': entry.path,
+                'size': entry_stat.st_size,
+                'modified': entry_stat.st_mtime
+            }
+            
+            bucket = size_buckets[entry_stat.st_size]
+            bucket.append(file_info)
+            if len(bucket) == 2:
+                pipeline.add_candidate(bucket[0])
+                pipeline.add_candidate(bucket[1])
+            elif len(bucket) > 2:
+                pipeline.add_candidate(file_info)
+            
+            if pipeline.stats['files_scanned'] % 200 == 0:
+                pipeline.report(f"Analisando: {entry.name}")
+            
+            # Consome o que já ficou pronto sem esperar o fim da varredura
+            yield from pipeline.poll()
+    
+    def _scan_duplicates_from_inventory(self, directories, pipeline):
+        """Agrupa por tamanho direto no inventário compartilhado, sem varrer o disco"""
+        inventory = self.file_inventory
+        totals = inventory.totals(directories, min_size=self.duplicate_min_size,
+                                  max_size=self.duplicate_max_size)
+        pipeline.stats['files_scanned'] += totals['files']
+        pipeline.stats['bytes_discovered'] += totals['bytes']
+        
+        # Caminhos resolvidos de uma vez: um ensure() concorrente não invalida o que falta
+        collisions = inventory.size_collision_paths(directories, self.duplicate_min_size,
+                                                    self.duplicate_max_size)
+        for file_size, paths in collisions.items():
+            for path in paths:
+                try:
+                    file_stat = os.stat(path)
+                except OSError:
+                    continue
+                # Arquivo alterado desde a varredura: não pertence mais a este grupo
+                if file_stat.st_size != file_size:
+                    continue
+                pipeline.add_candidate({
+                    'path': path,
+                    'size': file_size,
+                    'modified': file_stat.st_mtime,
+                    'stat': file_stat
+                })
+            
+            pipeline.seal_size(file_size)
+            yield from pipeline.poll()
+    
+    def _scan_duplicates_external(self, directories, pipeline):
+        """
+        Agrupa por tamanho em disco (runs ordenados), para varreduras com milhões de arquivos
+        
+        Só os pares (tamanho, caminho) passam pela memória, limitados por
+        duplicate_memory_config['max_memory_mb']; os dados completos de um
+        arquivo são montados apenas quando o tamanho dele colide com outro.
+        """
+        config = self.duplicate_memory_config
+        with ExternalSizeGrouper(config.get('max_memory_mb', 64) * 1024 * 1024,
+                                 config.get('spill_dir')) as grouper:
+            for entry, entry_stat in self._iter_duplicate_entries(directories, pipeline.stats):
+                grouper.add(entry.path, entry_stat.st_size)
+                if pipeline.stats['files_scanned'] % 5000 == 0:
+                    pipeline.report(f"Analisando: {entry.name}")
+            
+            for file_size, paths in grouper.iter_collisions():
+                for path in paths:
+                    try:
+                        file_stat = os.stat(path)
+                    except OSError:
+                        continue
+                    # Arquivo alterado desde a varredura: não pertence mais a este grupo
+                    if file_stat.st_size != file_size:
+                        continue
+                    pipeline.add_candidate({
+                        'path': path,
+                        'size': file_size,
+                        'modified': file_stat.st_mtime,
+                        'stat': file_stat
+                    })
+                
+                # Grupos intermediários do tamanho são liberados quando os hashes terminam
+                pipeline.seal_size(file_size)
+                yield from pipeline.poll()
+    
+    def _create_hasher(self):
+        """Cria o pool de hash conforme self.hash_config"""
+        return ParallelHasher(
+            workers=self.hash_config.get('workers'),
+            mode=self.hash_config.get('executor', 'thread'),
+            max_inflight_bytes=self.hash_config.get('max_inflight_mb', 256) * 1024 * 1024,
+            partial_block=self.partial_hash_block,
+            algorithm=self.hash_config.get('algorithm', DEFAULT_ALGORITHM),
+            io_scheduler=get_io_scheduler() if self.hash_config.get('per_device', True) else None
+        )
+    
+    def _get_hash_index(self):
+        """Abre o índice persistente de hashes, se possível"""
+        if self.hash_index is None:
+            try:
+                self.hash_index = FileHashIndex(
+                    partial_block=self.partial_hash_block,
+                    algorithm=self.hash_config.get('algorithm', DEFAULT_ALGORITHM)
+                )
+            except Exception as e:
+                self.logger.warning(f"Índice de hashes indisponível: {e}")
+                return None
+        return self.hash_index
+    
+    def invalidate_hash_index(self):
+        """Descarta todos os hashes armazenados no índice persistente"""
+        hash_index = self._get_hash_index()
+        if hash_index:
+            hash_index.invalidate()
+            return True
+        return False
+    
+    def remove_duplicate_files(self, duplicates_to_remove=None, progress_callback=None, use_quarantine=None):
+        """
+        Remove arquivos duplicados selecionados
+        
+        Com a quarentena ativa (self.use_quarantine) os arquivos são apenas
+        movidos para a quarentena do volume, o que é quase instantâneo, e a
+        remoção pode ser desfeita pelo 'quarantine_run' retornado.
+        """
         if duplicates_to_remove is None:
             duplicates_to_remove = self.duplicate_files
         
+        files = [duplicate_file for duplicate_group in duplicates_to_remove
+                 for duplicate_file in duplicate_group['duplicates']]
+        result = self.remove_files(files, progress_callback, use_quarantine, label='Duplicatas')
+        
+        if progress_callback:
+            progress_callback("Remoção de duplicatas concluída", 100)
+        return result
+    
+    def remove_files(self, files, progress_callback=None, use_quarantine=None, label='Arquivos selecionados'):
+        """
+        Remove uma lista de arquivos ({'path', 'size'}), pela quarentena se ativa
+        
+        Usado pelas duplicatas e pelos maiores arquivos/arquivos esquecidos.
+        """
+        if use_quarantine is None:
+            use_quarantine = self.use_quarantine
+        
         removed_count = 0
         removed_size = 0
+        removed_paths = []
+        interrupted = False
+        
+        run = get_quarantine_manager().begin_run(label) if use_quarantine else None
+        throttle = current_throttle()
         
-        total_duplicates = sum(len(dup['duplicates']) for dup in duplicates_to_remove)
+        for processed, file_info in enumerate(files, 1):
+            if throttle and not throttle.wait(file_info['size']):
+                self.logger.info(f"Remoção interrompida ({label}) após {removed_count} arquivos")
+                interrupted = True
+                break
+            
+            if progress_callback:
+                progress = (processed / len(files)) * 100
+                progress_callback(f"Removendo: {os.path.basename(file_info['path'])}", progress)
+            
+            try:
+                if run:
+                    if run.add(file_info['path'], file_info['size'], 1) is None:
+                        raise OSError("arquivo em uso ou sem permissão")
+                else:
+                    os.remove(file_info['path'])
+                removed_count += 1
+                removed_size += file_info['size']
+                removed_paths.append(file_info['path'])
+                self.logger.info(f"Arquivo removido ({label}): {file_info['path']}")
+            except (PermissionError, FileNotFoundError, OSError) as e:
+                self.logger.warning(f"Não foi possível remover {file_info['path']}: {e}")
+        
+        if run:
+            run.close()
+        self.file_inventory.mark_removed(removed_paths)
+        
+        return {
+            'removed_count': removed_count,
+            'removed_size': removed_size,
+            'removed_size_formatted': Utils.format_size(removed_size),
+            'quarantine_run': run.run_id if run else None,
+            'interrupted': interrupted
+        }
+    
+    def find_large_and_old_files(self, directories=None, limit=50, min_size=1024 * 1024,
+                                 progress_callback=None, use_inventory=True):
+        """
+        Maiores arquivos e arquivos há mais tempo sem uso, em uma única varredura
+        
+        Usa a mesma varredura e as mesmas pastas padrão da busca de duplicatas.
+        As listas 'largest' e 'oldest' podem ir direto para remove_files.
+        Com use_inventory as pastas entram no inventário compartilhado, então
+        uma busca de duplicatas ou análise de disco logo depois não varre de
+        novo; sem ele a varredura é em fluxo, com memória limitada a K por lista.
+        """
+        if directories is None:
+            directories = self._default_duplicate_directories()
+        
+        if progress_callback:
+            progress_callback("Procurando arquivos grandes e esquecidos...", 0)
+        
+        if use_inventory:
+            inventory = self.file_inventory.ensure(directories)
+            result = top_files_from_inventory(inventory, directories, limit=limit, min_size=min_size)
+        else:
+            result = find_top_files(directories, limit=limit, min_size=min_size,
+                                    progress_callback=progress_callback)
+        self.large_old_files = result
+        self.logger.info(
+            f"Arquivos grandes/esquecidos: {result['files_scanned']} arquivos analisados, "
+            f"{Utils.format_size(result['bytes_scanned'])}"
+        )
+        
+        if progress_callback:
+            progress_callback("Busca de arquivos grandes e esquecidos concluída", 100)
+        return result
+    
+    def consolidate_duplicate_files(self, duplicates_to_link=None, mode='auto', progress_callback=None):
+        """
+        Substitui duplicatas por links para o arquivo original, em vez de removê-las
+        
+        Cada duplicata é comparada byte a byte com o original e só é trocada
+        se estiver no mesmo volume. Com reflink (clone de blocos) os arquivos
+        continuam independentes; com hardlink passam a ser o mesmo arquivo,
+        então alterar um altera todos, por isso hardlink só no modo 'hardlink'.
+        
+        Args:
+            duplicates_to_link: Grupos de find_duplicate_files (padrão: todos)
+            mode: 'auto' ou 'reflink' (clone de blocos, se suportado) ou 'hardlink'
+        
+        Returns:
+            Totais e o espaço economizado por grupo
+        """
+        if duplicates_to_link is None:
+            duplicates_to_link = self.duplicate_files
+        
+        total_duplicates = sum(len(dup['duplicates']) for dup in duplicates_to_link)
         processed_duplicates = 0
         
-        for duplicate_group in duplicates_to_remove:
+        groups = []
+        linked_count = 0
+        saved_size = 0
+        methods = defaultdict(int)
+        
+        for duplicate_group in duplicates_to_link:
+            original = duplicate_group['original']['path']
+            group_result = {'original': original, 'linked': [], 'failed': [], 'saved_size': 0}
+            
             for duplicate_file in duplicate_group['duplicates']:
                 processed_duplicates += 1
-                
                 if progress_callback:
                     progress = (processed_duplicates / total_duplicates) * 100 if total_duplicates > 0 else 0
-                    progress_callback(f"Removendo: {os.path.basename(duplicate_file['path'])}", progress)
+                    progress_callback(f"Vinculando: {os.path.basename(duplicate_file['path'])}", progress)
                 
-                try:
-                    os.remove(duplicate_file['path'])
-                    removed_count += 1
-                    removed_size += duplicate_file['size']
-                    self.logger.info(f"Arquivo duplicado removido: {duplicate_file['path']}")
-                except (PermissionError, FileNotFoundError, OSError) as e:
-                    self.logger.warning(f"Não foi possível remover {duplicate_file['path']}: {e}")
+                method = link_duplicate(original, duplicate_file['path'], mode)
+                if method is None:
+                    group_result['failed'].append(duplicate_file['path'])
+                    continue
+                
+                methods[method] += 1
+                group_result['linked'].append({'path': duplicate_file['path'], 'method': method})
+                if method != 'already_linked':
+                    group_result['saved_size'] += duplicate_file['size']
+                    linked_count += 1
+            
+            saved_size += group_result['saved_size']
+            group_result['saved_size_formatted'] = Utils.format_size(group_result['saved_size'])
+            groups.append(group_result)
+        
+        self.logger.info(
+            f"Duplicatas consolidadas: {linked_count} arquivos vinculados "
+            f"({dict(methods)}), {Utils.format_size(saved_size)} economizados"
+        )
         
         if progress_callback:
-            progress_callback("Remoção de duplicatas concluída", 100)
+            progress_callback("Consolidação de duplicatas concluída", 100)
         
         return {
-            'removed_count': removed_count,
-            'removed_size': removed_size,
-            'removed_size_formatted': Utils.format_size(removed_size)
+            'linked_count': linked_count,
+            'saved_size': saved_size,
+            'saved_size_formatted': Utils.format_size(saved_size),
+            'methods': dict(methods),
+            'groups': groups
         }
     
     def clean_old_drivers(self, progress_callback=None):
@@ -252,65 +706,110 @@ class AdvancedCleaner:
         return 0
     
     def clean_browser_profiles_deep(self, progress_callback=None):
-        """Limpeza profunda de perfis de navegadores"""
+        """
+        Limpeza profunda de todos os perfis dos navegadores (cache e armazenamento dos sites)
+        
+        Returns:
+            Dicionário com 'cleaned_browsers', arquivos e bytes liberados no total
+            e por navegador e perfil, e os navegadores ignorados por estarem abertos
+        """
         if progress_callback:
             progress_callback("Limpeza profunda de navegadores...", 0)
         
-        browsers = {
-            'Chrome': {
-                'profile_path': os.path.join(os.environ.get('LOCALAPPDATA', ''), 'Google', 'Chrome', 'User Data'),
-                'cache_folders': ['Default/Cache', 'Default/Code Cache', 'Default/GPUCache', 'ShaderCache'],
-                'data_folders': ['Default/Local Storage', 'Default/Session Storage', 'Default/IndexedDB']
-            },
-            'Edge': {
-                'profile_path': os.path.join(os.environ.get('LOCALAPPDATA', ''), 'Microsoft', 'Edge', 'User Data'),
-                'cache_folders': ['Default/Cache', 'Default/Code Cache', 'Default/GPUCache', 'ShaderCache'],
-                'data_folders': ['Default/Local Storage', 'Default/Session Storage', 'Default/IndexedDB']
-            },
-            'Firefox': {
-                'profile_path': os.path.join(os.environ.get('APPDATA', ''), 'Mozilla', 'Firefox', 'Profiles'),
-                'cache_folders': ['cache2', 'startupCache', 'OfflineCache'],
-                'data_folders': ['storage', 'webappsstore.sqlite']
-            }
-        }
+        run = get_quarantine_manager().begin_run('Navegadores') if self.use_quarantine else None
         
-        cleaned_browsers = 0
+        def engine_factory():
+            # Quarentena move pastas inteiras de uma vez; sem ela, exclusão direta
+            if run:
+                return CleaningEngine(
+                    remove_file=lambda path, size: run.add(path, size, 1) is not None,
+                    remove_tree=run.remove_tree
+                )
+            return CleaningEngine()
         
-        for i, (browser_name, browser_info) in enumerate(browsers.items()):
-            if progress_callback:
-                progress = (i / len(browsers)) * 100
-                progress_callback(f"Limpando {browser_name}...", progress)
-            
-            if os.path.exists(browser_info['profile_path']):
-                try:
-                    # Limpa cache folders
-                    for cache_folder in browser_info['cache_folders']:
-                        cache_path = os.path.join(browser_info['profile_path'], cache_folder)
-                        if os.path.exists(cache_path):
-                            shutil.rmtree(cache_path, ignore_errors=True)
-                    
-                    # Limpa dados opcionais (mais cuidadoso)
-                    for data_folder in browser_info['data_folders']:
-                        data_path = os.path.join(browser_info['profile_path'], data_folder)
-                        if os.path.exists(data_path):
-                            if os.path.isdir(data_path):
-                                shutil.rmtree(data_path, ignore_errors=True)
-                            else:
-                                try:
-                                    os.remove(data_path)
-                                except:
-                                    pass
-                    
-                    cleaned_browsers += 1
-                    self.logger.info(f"Limpeza profunda do {browser_name} concluída")
-                    
-                except Exception as e:
-                    self.logger.error(f"Erro na limpeza profunda do {browser_name}: {e}")
+        result = clean_profiles(discover_profiles(), engine_factory, include_data=True,
+                                progress_callback=progress_callback)
+        result['cleaned_browsers'] = len(result['browsers'])
+        
+        for browser_name, totals in result['browsers'].items():
+            self.logger.info(
+                f"Limpeza profunda do {browser_name} concluída: "
+                f"{len(totals['profiles'])} perfis, {Utils.format_size(totals['bytes_freed'])}"
+            )
+        
+        if run:
+            run.close()
+        self.cleaned_files += result['files_deleted']
+        self.cleaned_size += result['bytes_freed']
         
         if progress_callback:
             progress_callback("Limpeza profunda de navegadores concluída", 100)
         
-        return cleaned_browsers
+        return result
+    
+    def scan_app_caches(self, progress_callback=None):
+        """
+        Mede em paralelo os caches de aplicativos do catálogo
+        
+        Returns:
+            Lista do maior cache para o menor (ver app_caches.size_caches)
+        """
+        if progress_callback:
+            progress_callback("Medindo caches de aplicativos...", 0)
+        
+        self.app_cache_sizes = size_caches(self.app_cache_catalog, progress_callback=progress_callback)
+        total = sum(item['bytes'] for item in self.app_cache_sizes)
+        self.logger.info(f"Caches de aplicativos: {Utils.format_size(total)} em {len(self.app_cache_sizes)} entradas")
+        return self.app_cache_sizes
+    
+    def get_biggest_app_caches(self, limit=10):
+        """Maiores caches de aplicativos da última medição (mede se ainda não mediu)"""
+        if not self.app_cache_sizes:
+            self.scan_app_caches()
+        return [item for item in self.app_cache_sizes if item['bytes'] > 0][:limit]
+    
+    def get_largest_folders(self, root=None, limit=20, refresh=False, progress_callback=None):
+        """
+        Maiores pastas do volume (padrão: volume do sistema)
+        
+        A árvore fica em cache no analisador compartilhado; consultas seguintes
+        e a navegação pelas subpastas não varrem o disco de novo.
+        """
+        return get_disk_analyzer().largest_folders(root, limit, refresh=refresh,
+                                                    progress_callback=progress_callback)
+    
+    def clean_app_caches(self, selection=None, progress_callback=None):
+        """
+        Limpa os caches de aplicativos escolhidos em uma passagem
+        
+        Args:
+            selection: Ids ou categorias do catálogo (padrão: todas as entradas seguras)
+        
+        Returns:
+            Dicionário com arquivos e bytes liberados, no total e por entrada,
+            e as entradas ignoradas por o aplicativo estar aberto
+        """
+        entries = select_entries(self.app_cache_catalog, selection)
+        run = get_quarantine_manager().begin_run('Caches de aplicativos') if self.use_quarantine else None
+        
+        def engine_factory(policy):
+            if run:
+                return CleaningEngine(
+                    policy,
+                    remove_file=lambda path, size: run.add(path, size, 1) is not None,
+                    remove_tree=run.remove_tree
+                )
+            return CleaningEngine(policy)
+        
+        result = clean_caches(entries, engine_factory, progress_callback)
+        if run:
+            run.close()
+        
+        self.cleaned_files += result['files_deleted']
+        self.cleaned_size += result['bytes_freed']
+        self.app_cache_sizes = []  # Medição anterior não vale mais
+        self.logger.info(f"Caches de aplicativos limpos: {Utils.format_size(result['bytes_freed'])}")
+        return result
     
     def clean_thumbnail_cache(self, progress_callback=None):
         """Remove cache de thumbnails do Windows"""
@@ -352,15 +851,13 @@ class AdvancedCleaner:
         return cleaned_files
     
     def _calculate_file_hash(self, file_path):
-        """Calcula hash MD5 de um arquivo"""
-        try:
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
-        except:
-            return None
+        """Calcula hash de um arquivo com o algoritmo configurado"""
+        return calculate_full_hash(file_path, self.hash_config.get('algorithm', DEFAULT_ALGORITHM))
+    
+    def _calculate_partial_hash(self, file_path, file_size):
+        """Calcula hash dos blocos inicial e final de um arquivo (hash, bytes lidos)"""
+        return calculate_partial_hash(file_path, file_size, self.partial_hash_block,
+                                      self.hash_config.get('algorithm', DEFAULT_ALGORITHM))
     
     def get_advanced_cleanup_summary(self):
         """Retorna resumo da limpeza avançada"""
@@ -368,6 +865,10 @@ class AdvancedCleaner:
             'duplicate_files_found': len(self.duplicate_files),
             'duplicate_space_savings': sum(dup['total_size'] for dup in self.duplicate_files),
             'duplicate_space_formatted': Utils.format_size(sum(dup['total_size'] for dup in self.duplicate_files)),
+            'duplicate_scan_stats': self.duplicate_scan_stats,
+            'duplicate_directories_found': len(self.duplicate_directories),
+            'duplicate_directory_savings': sum(group['total_size'] for group in self.duplicate_directories),
+            'app_cache_size': sum(item['bytes'] for item in self.app_cache_sizes),
             'total_cleaned_files': self.cleaned_files,
             'total_cleaned_size': self.cleaned_size,
             'total_cleaned_formatted': Utils.format_size(self.cleaned_size)
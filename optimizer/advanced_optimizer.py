@@ -4,6 +4,8 @@ import logging
 import psutil
 import winreg
 from .utils import Utils
+from .cleaning_engine import CleaningEngine, CleaningPolicy
+from .shader_cache import ShaderCacheManager
 
 class AdvancedOptimizer:
     """Sistema de otimizações avançadas do Windows"""
@@ -11,6 +13,7 @@ class AdvancedOptimizer:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.optimizations_applied = []
+        self.gpu_cache_stats = {}
     
     def optimize_memory_management(self, progress_callback=None):
         """Otimiza gerenciamento de memória do sistema"""
@@ -1527,60 +1530,99 @@ class AdvancedOptimizer:
         except Exception as e:
             self.logger.warning(f"Erro ao aplicar otimização especial {optimization}: {e}")
     
-    def clear_gpu_cache(self, progress_callback=None):
-        """🗑️ LIMPAR CACHE DA GPU E DIRECTX"""
+    def clear_gpu_cache(self, progress_callback=None, full=False):
+        """
+        🗑️ LIMPAR CACHE DA GPU E DIRECTX
+        
+        Por padrão só poda o cache de shaders (jogos desinstalados, sem uso há
+        muito tempo ou acima do orçamento), mantendo o dos jogos jogados
+        recentemente para não causar stutter. Com full=True apaga tudo.
+        Os bytes removidos e mantidos ficam em self.gpu_cache_stats.
+        """
         if progress_callback:
             progress_callback("🗑️ Limpando cache DirectX e GPU...", 0)
         
         optimizations = []
+        stats = {'full': full, 'bytes_freed': 0, 'bytes_kept': 0, 'entries_kept': 0}
+        self.gpu_cache_stats = stats
         import subprocess
         import os
-        import shutil
         
         try:
-            # Limpar cache DirectX shader
-            shader_cache_paths = [
-                os.path.expandvars(r'%LOCALAPPDATA%\D3DSCache'),
-                os.path.expandvars(r'%LOCALAPPDATA%\NVIDIA\DXCache'),
-                os.path.expandvars(r'%LOCALAPPDATA%\AMD\GLCache'),
-                os.path.expandvars(r'%LOCALAPPDATA%\AMD\DxCache'),
-                os.path.expandvars(r'%LOCALAPPDATA%\Microsoft\XboxLive\AuthStateCache.dat'),
-                os.path.expandvars(r'%TEMP%\NV_Cache'),
-                os.path.expandvars(r'%PROGRAMDATA%\NVIDIA Corporation\NV_Cache')
-            ]
+            if not full:
+                if progress_callback:
+                    progress_callback("Podando cache de shaders por jogo...", 30)
+                
+                pruned = ShaderCacheManager().prune()
+                reasons = {
+                    'uninstalled': 'jogos desinstalados',
+                    'stale': 'sem uso',
+                    'budget': 'acima do orçamento'
+                }
+                for reason, freed in pruned['by_reason'].items():
+                    optimizations.append(
+                        f"🗑️ Cache de shaders removido ({reasons.get(reason, reason)}): {Utils.format_size(freed)}"
+                    )
+                optimizations.append(
+                    f"🎮 Cache de shaders mantido: {Utils.format_size(pruned['plan']['bytes_kept'])} "
+                    f"em {pruned['entries_kept']} entradas"
+                )
+                stats['bytes_freed'] = pruned['bytes_freed']
+                stats['bytes_kept'] = pruned['plan']['bytes_kept']
+                stats['entries_kept'] = pruned['entries_kept']
+            else:
+                # Limpar cache DirectX shader
+                shader_cache_paths = [
+                    os.path.expandvars(r'%LOCALAPPDATA%\D3DSCache'),
+                    os.path.expandvars(r'%LOCALAPPDATA%\NVIDIA\DXCache'),
+                    os.path.expandvars(r'%LOCALAPPDATA%\AMD\GLCache'),
+                    os.path.expandvars(r'%LOCALAPPDATA%\AMD\DxCache'),
+                    os.path.expandvars(r'%LOCALAPPDATA%\Microsoft\XboxLive\AuthStateCache.dat'),
+                    os.path.expandvars(r'%TEMP%\NV_Cache'),
+                    os.path.expandvars(r'%PROGRAMDATA%\NVIDIA Corporation\NV_Cache')
+                ]
             
-            if progress_callback:
-                progress_callback("Removendo cache DirectX...", 30)
+                if progress_callback:
+                    progress_callback("Removendo cache DirectX...", 30)
             
-            for cache_path in shader_cache_paths:
-                try:
-                    if os.path.exists(cache_path):
-                        if os.path.isfile(cache_path):
-                            os.remove(cache_path)
-                            optimizations.append(f"🗑️ Cache removido: {os.path.basename(cache_path)}")
-                        elif os.path.isdir(cache_path):
-                            shutil.rmtree(cache_path, ignore_errors=True)
-                            optimizations.append(f"🗑️ Diretório cache removido: {os.path.basename(cache_path)}")
-                except Exception as e:
-                    self.logger.warning(f"Erro ao remover cache {cache_path}: {e}")
+                # Remove o conteúdo e a própria pasta, contando os bytes liberados
+                cache_engine = CleaningEngine(CleaningPolicy(remove_root=True))
             
-            if progress_callback:
-                progress_callback("Limpando cache OpenGL...", 60)
+                for cache_path in shader_cache_paths:
+                    try:
+                        if os.path.exists(cache_path):
+                            cleanup = cache_engine.clean(cache_path)
+                            stats['bytes_freed'] += cleanup['bytes_freed']
+                            if cleanup['files_deleted']:
+                                optimizations.append(
+                                    f"🗑️ Cache removido: {os.path.basename(cache_path)} "
+                                    f"({Utils.format_size(cleanup['bytes_freed'])})"
+                                )
+                    except Exception as e:
+                        self.logger.warning(f"Erro ao remover cache {cache_path}: {e}")
             
-            # Limpar cache OpenGL
-            opengl_cache_paths = [
-                os.path.expandvars(r'%LOCALAPPDATA%\NVIDIA\GLCache'),
-                os.path.expandvars(r'%APPDATA%\NVIDIA\ComputeCache'),
-                os.path.expandvars(r'%LOCALAPPDATA%\AMD\GLCache')
-            ]
+                if progress_callback:
+                    progress_callback("Limpando cache OpenGL...", 60)
             
-            for gl_cache in opengl_cache_paths:
-                try:
-                    if os.path.exists(gl_cache):
-                        shutil.rmtree(gl_cache, ignore_errors=True)
-                        optimizations.append(f"🗑️ Cache OpenGL removido: {os.path.basename(gl_cache)}")
-                except Exception as e:
-                    self.logger.warning(f"Erro ao limpar cache OpenGL: {e}")
+                # Limpar cache OpenGL
+                opengl_cache_paths = [
+                    os.path.expandvars(r'%LOCALAPPDATA%\NVIDIA\GLCache'),
+                    os.path.expandvars(r'%APPDATA%\NVIDIA\ComputeCache'),
+                    os.path.expandvars(r'%LOCALAPPDATA%\AMD\GLCache')
+                ]
+            
+                for gl_cache in opengl_cache_paths:
+                    try:
+                        if os.path.exists(gl_cache):
+                            cleanup = cache_engine.clean(gl_cache)
+                            stats['bytes_freed'] += cleanup['bytes_freed']
+                            if cleanup['files_deleted']:
+                                optimizations.append(
+                                    f"🗑️ Cache OpenGL removido: {os.path.basename(gl_cache)} "
+                                    f"({Utils.format_size(cleanup['bytes_freed'])})"
+                                )
+                    except Exception as e:
+                        self.logger.warning(f"Erro ao limpar cache OpenGL: {e}")
             
             if progress_callback:
                 progress_callback("Executando limpeza avançada de GPU...", 90)
@@ -1602,7 +1644,10 @@ class AdvancedOptimizer:
             if progress_callback:
                 progress_callback("🗑️ Limpeza de cache GPU concluída!", 100)
             
-            optimizations.append("🎯 Cache DirectX e GPU totalmente limpo!")
+            if full:
+                optimizations.append("🎯 Cache DirectX e GPU totalmente limpo!")
+            else:
+                optimizations.append("🎯 Cache de shaders podado, jogos recentes preservados!")
             
         except Exception as e:
             self.logger.error(f"Erro na limpeza de cache GPU: {e}")
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Catálogo de Caches de Aplicativos
+=================================
+
+Lista de dados com as pastas de cache de aplicativos comuns em PCs gamer
+(Discord, Spotify, Steam, Epic, instaladores de drivers NVIDIA/AMD, logs
+de launchers), com regras de segurança por entrada. Cada entrada é medida
+em paralelo com o motor de limpeza em modo simulação, e as categorias
+escolhidas são limpas em uma única passagem.
+
+Regras de segurança:
+- Aplicativo aberto (processo em execução) é ignorado
+- Idade mínima e padrões de nome por entrada (logs antigos, por exemplo)
+- Caminhos com variáveis não resolvidas, raízes de unidade ou da pasta do
+  usuário e links simbólicos nunca são limpos
+- Entradas de risco 'moderate' (cache offline, que custa download) só são
+  limpas quando escolhidas explicitamente
+
+Entradas extras seguem o mesmo formato dos dicionários de APP_CACHE_CATALOG.
+"""
+
+import os
+import re
+import glob
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import psutil
+
+from .utils import Utils
+from .cleaning_engine import CleaningEngine, CleaningPolicy
+
+LOG_PATTERNS = ['*.log', '*.log.*', '*.txt', '*.dmp', '*.etl']
+
+APP_CACHE_CATALOG = [
+    {
+        'id': 'discord_cache',
+        'app': 'Discord',
+        'category': 'discord',
+        'description': 'Cache de mídia, código e GPU do Discord',
+        'paths': [r'%APPDATA%\discord\Cache', r'%APPDATA%\discord\Code Cache',
+                  r'%APPDATA%\discord\GPUCache', r'%APPDATA%\discord\DawnCache'],
+        'processes': ['Discord.exe']
+    },
+    {
+        'id': 'spotify_storage',
+        'app': 'Spotify',
+        'category': 'spotify',
+        'description': 'Cache de streaming do Spotify',
+        'paths': [r'%LOCALAPPDATA%\Spotify\Storage', r'%LOCALAPPDATA%\Spotify\Browser\Cache'],
+        'processes': ['Spotify.exe']
+    },
+    {
+        'id': 'spotify_offline',
+        'app': 'Spotify',
+        'category': 'spotify',
+        'description': 'Músicas baixadas para ouvir offline',
+        'paths': [r'%LOCALAPPDATA%\Spotify\Data'],
+        'processes': ['Spotify.exe'],
+        'risk': 'moderate'
+    },
+    {
+        'id': 'steam_htmlcache',
+        'app': 'Steam',
+        'category': 'steam',
+        'description': 'Cache do navegador interno da Steam',
+        'paths': [r'%LOCALAPPDATA%\Steam\htmlcache'],
+        'processes': ['steam.exe', 'steamwebhelper.exe']
+    },
+    {
+        'id': 'steam_appcache',
+        'app': 'Steam',
+        'category': 'steam',
+        'description': 'Cache HTTP e imagens da biblioteca da Steam',
+        'paths': [r'%PROGRAMFILES(X86)%\Steam\appcache\httpcache',
+                  r'%PROGRAMFILES(X86)%\Steam\appcache\librarycache',
+                  r'%PROGRAMFILES%\Steam\appcache\httpcache',
+                  r'%PROGRAMFILES%\Steam\appcache\librarycache'],
+        'processes': ['steam.exe', 'steamwebhelper.exe']
+    },
+    {
+        'id': 'steam_logs',
+        'app': 'Steam',
+        'category': 'launcher_logs',
+        'description': 'Logs e despejos de falha da Steam',
+        'paths': [r'%PROGRAMFILES(X86)%\Steam\logs', r'%PROGRAMFILES(X86)%\Steam\dumps',
+                  r'%PROGRAMFILES%\Steam\logs', r'%PROGRAMFILES%\Steam\dumps'],
+        'processes': ['steam.exe'],
+        'min_age_days': 1
+    },
+    {
+        'id': 'epic_webcache',
+        'app': 'Epic Games Launcher',
+        'category': 'epic',
+        'description': 'Cache web do Epic Games Launcher',
+        'paths': [r'%LOCALAPPDATA%\EpicGamesLauncher\Saved\webcache*'],
+        'processes': ['EpicGamesLauncher.exe', 'EpicWebHelper.exe']
+    },
+    {
+        'id': 'epic_logs',
+        'app': 'Epic Games Launcher',
+        'category': 'launcher_logs',
+        'description': 'Logs do Epic Games Launcher',
+        'paths': [r'%LOCALAPPDATA%\EpicGamesLauncher\Saved\Logs'],
+        'processes': ['EpicGamesLauncher.exe'],
+        'include_patterns': LOG_PATTERNS,
+        'min_age_days': 1
+    },
+    {
+        'id': 'launcher_logs',
+        'app': 'Battle.net / EA / Ubisoft / GOG',
+        'category': 'launcher_logs',
+        'description': 'Logs antigos de outros launchers',
+        'paths': [r'%PROGRAMDATA%\Battle.net\Agent\Logs',
+                  r'%LOCALAPPDATA%\Battle.net\Logs',
+                  r'%LOCALAPPDATA%\Electronic Arts\EA Desktop\Logs',
+                  r'%LOCALAPPDATA%\Ubisoft Game Launcher\logs',
+                  r'%PROGRAMDATA%\GOG.com\Galaxy\logs'],
+        'include_patterns': LOG_PATTERNS,
+        'min_age_days': 1
+    },
+    {
+        'id': 'nvidia_installers',
+        'app': 'NVIDIA',
+        'category': 'gpu_installers',
+        'description': 'Pacotes de driver NVIDIA baixados e extraídos',
+        'paths': [r'%PROGRAMDATA%\NVIDIA Corporation\Downloader', r'%SYSTEMDRIVE%\NVIDIA'],
+        'processes': ['setup.exe'],
+        'min_age_days': 1
+    },
+    {
+        'id': 'amd_installers',
+        'app': 'AMD',
+        'category': 'gpu_installers',
+        'description': 'Instaladores de driver AMD extraídos',
+        'paths': [r'%SYSTEMDRIVE%\AMD'],
+        'processes': ['Setup.exe', 'AMDSoftwareInstaller.exe'],
+        'min_age_days': 1
+    }
+]
+
+_ENV_PATTERN = re.compile(r'%([^%]+)%')
+
+
+@dataclass
+class AppCache:
+    """Entrada do catálogo com as regras de segurança"""
+    id: str
+    app: str
+    category: str
+    paths: List[str]
+    description: str = ''
+    processes: List[str] = field(default_factory=list)
+    include_patterns: List[str] = field(default_factory=list)
+    exclude_patterns: List[str] = field(default_factory=list)
+    min_age_days: float = 0
+    risk: str = 'safe'
+
+    def policy(self) -> CleaningPolicy:
+        return CleaningPolicy(min_age_seconds=self.min_age_days * 86400,
+                              include_patterns=list(self.include_patterns),
+                              exclude_patterns=list(self.exclude_patterns))
+
+    def resolve_paths(self) -> List[str]:
+        """Pastas existentes da entrada, já filtradas pelas regras de segurança"""
+        resolved = []
+        for path in self.paths:
+            expanded = _expand(path)
+            if expanded is None:
+                continue
+            candidates = glob.glob(expanded) if any(char in expanded for char in '*?') else [expanded]
+            for candidate in candidates:
+                if _is_safe_root(candidate) and candidate not in resolved:
+                    resolved.append(candidate)
+        return resolved
+
+
+def _expand(path: str) -> Optional[str]:
+    """Expande variáveis %NOME%; None se alguma não existir"""
+    missing = []
+
+    def replace(match):
+        name = match.group(1)
+        value = os.environ.get(name) or os.environ.get(name.upper())
+        if not value:
+            missing.append(name)
+            return ''
+        return value
+
+    expanded = _ENV_PATTERN.sub(replace, path)
+    if missing:
+        return None
+    return os.path.normpath(expanded.replace('\\', os.sep))
+
+
+def _is_safe_root(path: str) -> bool:
+    """Pasta real, fora de links, e que não é raiz de unidade nem a pasta do usuário"""
+    if not os.path.isdir(path) or os.path.islink(path):
+        return False
+    path = os.path.normcase(os.path.abspath(path))
+    drive, rest = os.path.splitdrive(path)
+    if len([part for part in rest.split(os.sep) if part]) < 1:
+        return False
+    protected = {os.path.normcase(os.path.abspath(os.path.expanduser('~')))}
+    for name in ('APPDATA', 'LOCALAPPDATA', 'PROGRAMDATA', 'PROGRAMFILES', 'PROGRAMFILES(X86)',
+                 'SYSTEMROOT', 'WINDIR'):
+        if os.environ.get(name):
+            protected.add(os.path.normcase(os.path.abspath(os.environ[name])))
+    return path not in protected
+
+
+def load_catalog(extra_entries: Optional[Iterable[Dict[str, Any]]] = None) -> List[AppCache]:
+    """Entradas do catálogo padrão mais as extras (mesmo id substitui a padrão)"""
+    entries = {}
+    for data in list(APP_CACHE_CATALOG) + list(extra_entries or []):
+        entries[data['id']] = AppCache(**data)
+    return list(entries.values())
+
+
+def running_processes() -> Set[str]:
+    """Nomes (em minúsculas) dos processos em execução"""
+    names = set()
+    for proc in psutil.process_iter(['name']):
+        try:
+            if proc.info['name']:
+                names.add(proc.info['name'].lower())
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return names
+
+
+def _is_running(entry: AppCache, processes: Set[str]) -> bool:
+    return any(name.lower() in processes for name in entry.processes)
+
+
+def size_caches(entries: List[AppCache], max_workers: int = 8,
+                progress_callback=None) -> List[Dict[str, Any]]:
+    """
+    Mede todas as entradas em paralelo (simulação com a política de cada uma)
+
+    Returns:
+        Lista ordenada do maior para o menor, com 'id', 'app', 'category',
+        'description', 'risk', 'paths', 'bytes', 'files', 'running' e 'bytes_formatted'
+    """
+    processes = running_processes()
+
+    def measure(entry):
+        paths = entry.resolve_paths()
+        measured = CleaningEngine(entry.policy(), dry_run=True).clean_many(paths)
+        return {
+            'id': entry.id,
+            'app': entry.app,
+            'category': entry.category,
+            'description': entry.description,
+            'risk': entry.risk,
+            'paths': paths,
+            'bytes': measured['bytes_freed'],
+            'files': measured['files_deleted'],
+            'running': _is_running(entry, processes),
+            'bytes_formatted': Utils.format_size(measured['bytes_freed'])
+        }
+
+    sizes = []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [executor.submit(measure, entry) for entry in entries]
+        for done, future in enumerate(futures, 1):
+            sizes.append(future.result())
+            if progress_callback:
+                progress_callback(f"Medindo: {sizes[-1]['app']}", done / len(futures) * 100)
+
+    sizes.sort(key=lambda item: item['bytes'], reverse=True)
+    return sizes
+
+
+def select_entries(entries: List[AppCache], selection: Optional[Iterable[str]] = None) -> List[AppCache]:
+    """
+    Entradas escolhidas por id ou categoria
+
+    Sem seleção, todas as entradas de risco 'safe'. Entradas 'moderate' só
+    entram quando o id ou a categoria são escolhidos explicitamente.
+    """
+    if selection is None:
+        return [entry for entry in entries if entry.risk == 'safe']
+    selection = set(selection)
+    return [entry for entry in entries
+            if entry.id in selection or (entry.category in selection and entry.risk == 'safe')]
+
+
+def clean_caches(entries: List[AppCache], engine_factory: Callable[[CleaningPolicy], CleaningEngine],
+                 progress_callback=None) -> Dict[str, Any]:
+    """
+    Limpa as entradas em uma passagem, ignorando aplicativos abertos
+
+    Args:
+        entries: Entradas escolhidas (select_entries)
+        engine_factory: Cria o CleaningEngine para a política de cada entrada
+
+    Returns:
+        Dicionário com 'files_deleted', 'bytes_freed', 'files_failed',
+        'skipped' (ids de aplicativos abertos) e 'entries' -> {id: resultado}
+    """
+    logger = logging.getLogger(__name__)
+    processes = running_processes()
+    result = {'files_deleted': 0, 'bytes_freed': 0, 'files_failed': 0, 'skipped': [], 'entries': {}}
+
+    for index, entry in enumerate(entries):
+        if progress_callback:
+            progress_callback(f"Limpando: {entry.app} ({entry.description})", index / len(entries) * 100)
+
+        if _is_running(entry, processes):
+            logger.warning(f"{entry.app} está aberto, {entry.id} ignorado")
+            result['skipped'].append(entry.id)
+            continue
+
+        try:
+            cleaned = engine_factory(entry.policy()).clean_many(entry.resolve_paths())
+        except Exception as e:
+            logger.error(f"Erro ao limpar {entry.id}: {e}")
+            continue
+
+        result['entries'][entry.id] = {
+            'files_deleted': cleaned['files_deleted'],
+            'bytes_freed': cleaned['bytes_freed'],
+            'files_failed': cleaned['files_failed']
+        }
+        for key in ('files_deleted', 'bytes_freed', 'files_failed'):
+            result[key] += cleaned[key]
+
+    if progress_callback:
+        progress_callback("Limpeza de caches de aplicativos concluída", 100)
+    return result
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Execução em Segundo Plano de Baixo Impacto
+==========================================
+
+Classe de execução "background" para as limpezas agendadas e do boot:
+a thread que limpa baixa a própria prioridade de CPU e de E/S, as exclusões
+passam por um balde de fichas (arquivos e bytes por segundo) e o trabalho
+pausa sozinho enquanto a CPU ou o disco estão ocupados, continuando do
+mesmo ponto depois.
+
+Uso:
+    with BackgroundThrottle():
+        cleaner.clean_temp_files()   # CleaningEngine respeita o limite ativo
+
+Funcionalidades:
+- Prioridade baixa da thread (nice/ionice via psutil; modo background no Windows)
+- Limite de arquivos e bytes removidos por segundo
+- Pausa automática por uso alto de CPU ou de disco, com histerese
+- Pausa com duração máxima e cancelamento (cancel() ou should_stop)
+- Limite ativo por thread, consultado pelos motores de limpeza
+"""
+
+import sys
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import psutil
+
+_local = threading.local()
+
+# Intervalo máximo entre consultas a should_stop durante as esperas
+STOP_POLL_INTERVAL = 0.1
+
+
+def current_throttle() -> Optional['BackgroundThrottle']:
+    """Limite de segundo plano ativo na thread atual, se houver"""
+    stack = getattr(_local, 'stack', None)
+    return stack[-1] if stack else None
+
+
+def lower_thread_priority() -> Callable[[], None]:
+    """
+    Baixa a prioridade de CPU e de E/S da thread atual
+
+    Returns:
+        Função que tenta restaurar a prioridade anterior
+    """
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+            THREAD_MODE_BACKGROUND_END = 0x00020000
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN)
+            return lambda: kernel32.SetThreadPriority(kernel32.GetCurrentThread(),
+                                                      THREAD_MODE_BACKGROUND_END)
+        except Exception:
+            return lambda: None
+
+    # No Linux nice e ionice valem por thread quando aplicados ao id da thread
+    try:
+        thread_id = threading.get_native_id() if sys.platform.startswith('linux') else None
+        process = psutil.Process(thread_id)
+    except (psutil.Error, AttributeError):
+        return lambda: None
+
+    previous_nice = None
+    previous_ionice = None
+    try:
+        previous_nice = process.nice()
+        process.nice(19)
+    except (psutil.Error, OSError):
+        pass
+    try:
+        if hasattr(psutil, 'IOPRIO_CLASS_IDLE'):
+            previous_ionice = process.ionice()
+            process.ionice(psutil.IOPRIO_CLASS_IDLE)
+    except (psutil.Error, OSError, AttributeError):
+        pass
+
+    def restore():
+        # Sem privilégio o sistema pode recusar voltar a uma prioridade maior
+        try:
+            if previous_ionice is not None:
+                process.ionice(previous_ionice.ioclass, previous_ionice.value)
+        except (psutil.Error, OSError, ValueError):
+            pass
+        try:
+            if previous_nice is not None:
+                process.nice(previous_nice)
+        except (psutil.Error, OSError):
+            pass
+
+    return restore
+
+
+class TokenBucket:
+    """Balde de fichas: limita a taxa média e permite rajadas de até capacity"""
+
+    def __init__(self, rate: Optional[float], capacity: Optional[float] = None):
+        """
+        Args:
+            rate: Fichas por segundo (None ou 0 = sem limite)
+            capacity: Tamanho máximo da rajada (padrão: um segundo de fichas)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else (rate or 0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Reserva fichas, mesmo que o saldo fique negativo
+
+        Returns:
+            Segundos a aguardar até a reserva estar paga
+        """
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+
+class BackgroundThrottle:
+    """Classe de execução em segundo plano para os motores de limpeza"""
+
+    def __init__(self, files_per_second: Optional[float] = 500,
+                 bytes_per_second: Optional[float] = 50 * 1024 * 1024,
+                 cpu_pause_percent: Optional[float] = 85.0, disk_pause_percent: Optional[float] = 80.0,
+                 resume_margin: float = 15.0, check_interval: float = 1.0,
+                 system_monitor=None, lower_priority: bool = True,
+                 max_pause: Optional[float] = 600.0,
+                 should_stop: Optional[Callable[[], bool]] = None):
+        """
+        Args:
+            files_per_second: Máximo de arquivos removidos por segundo (None = sem limite)
+            bytes_per_second: Máximo de bytes removidos por segundo (None = sem limite)
+            cpu_pause_percent: Uso de CPU que pausa a limpeza (None = não pausa por CPU)
+            disk_pause_percent: Ocupação do disco (tempo ocupado) que pausa a limpeza
+                (None = não pausa por disco)
+            resume_margin: Quanto o uso precisa cair abaixo do limite para retomar
+            check_interval: Intervalo mínimo entre leituras de carga, em segundos
+            system_monitor: SystemMonitor usado para ler a carga (padrão: um novo)
+            lower_priority: Baixa a prioridade da thread enquanto estiver ativo
+            max_pause: Pausa máxima por carga, em segundos; passado esse tempo a
+                execução é interrompida com stats['busy_timeout'] e o restante fica
+                para quem agendou (o ScheduleManager reagenda) (None = sem limite)
+            should_stop: Consultada durante as esperas; True interrompe a execução
+        """
+        self.logger = logging.getLogger(__name__)
+        self.files = TokenBucket(files_per_second)
+        self.bytes = TokenBucket(bytes_per_second, capacity=(bytes_per_second or 0) * 2)
+        self.cpu_pause_percent = cpu_pause_percent
+        self.disk_pause_percent = disk_pause_percent
+        self.resume_margin = resume_margin
+        self.check_interval = check_interval
+        self.lower_priority = lower_priority
+        self.max_pause = max_pause
+        self.should_stop = should_stop
+        self.checks_load = cpu_pause_percent is not None or disk_pause_percent is not None
+
+        if system_monitor is None and self.checks_load:
+            from .system_monitor import SystemMonitor
+            system_monitor = SystemMonitor()
+        self.system_monitor = system_monitor
+
+        self._next_check = 0.0
+        self._restore = {}  # id da thread -> função de restauração
+        self._cancelled = threading.Event()
+        self.stats = {'pauses': 0, 'paused_seconds': 0.0, 'throttled_seconds': 0.0,
+                      'interrupted': False, 'busy_timeout': False}
+
+    def __enter__(self) -> 'BackgroundThrottle':
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        if self.lower_priority and not stack:
+            self._restore[threading.get_ident()] = lower_thread_priority()
+        stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        _local.stack.pop()
+        restore = self._restore.pop(threading.get_ident(), None)
+        if restore is not None:
+            restore()
+
+    def _overloaded(self, load: Dict[str, float], margin: float) -> bool:
+        return ((self.cpu_pause_percent is not None
+                 and load['cpu_percent'] >= self.cpu_pause_percent - margin)
+                or (self.disk_pause_percent is not None
+                    and load['disk_busy_percent'] >= self.disk_pause_percent - margin))
+
+    def cancel(self) -> None:
+        """Interrompe a execução: as esperas em andamento e as seguintes retornam False"""
+        self._cancelled.set()
+
+    def reset(self) -> None:
+        """Prepara o limite para uma nova execução depois de cancel() ou de max_pause"""
+        self._cancelled.clear()
+        self.stats['interrupted'] = False
+        self.stats['busy_timeout'] = False
+
+    @property
+    def interrupted(self) -> bool:
+        return self.stats['interrupted']
+
+    @property
+    def busy_timeout(self) -> bool:
+        """A execução parou porque o sistema ficou ocupado por mais de max_pause"""
+        return self.stats['busy_timeout']
+
+    def _interrupt(self, reason: str) -> bool:
+        if not self.stats['interrupted']:
+            self.stats['interrupted'] = True
+            self.logger.info(f"Limpeza em segundo plano interrompida: {reason}")
+        self._cancelled.set()
+        return False
+
+    def _stop_requested(self) -> bool:
+        if self._cancelled.is_set():
+            return True
+        return self.should_stop is not None and self.should_stop()
+
+    def _sleep(self, seconds: float, should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        """Dorme em fatias curtas; False se a execução foi interrompida"""
+        end = time.monotonic() + seconds
+        while True:
+            if self._stop_requested():
+                return self._interrupt("cancelada")
+            if should_stop is not None and should_stop():
+                return False
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                return True
+            if self.should_stop is None and should_stop is None:
+                self._cancelled.wait(remaining)  # Só cancel() interrompe: acorda na hora
+            else:
+                self._cancelled.wait(min(remaining, STOP_POLL_INTERVAL))
+
+    def wait(self, size: int = 0, files: int = 1,
+             should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Chamado antes de cada exclusão: aguarda o limite de taxa e pausa
+        enquanto o sistema estiver ocupado. Nada é descartado, a exclusão
+        apenas acontece mais tarde.
+
+        Args:
+            size: Bytes da exclusão
+            files: Arquivos da exclusão
+            should_stop: Parada de quem chama (ex.: prazo do boot), consultada
+                durante as esperas; só encerra esta espera, sem cancelar o limite
+
+        Returns:
+            True para seguir com a exclusão; False se a execução foi cancelada
+            ou a pausa passou de max_pause (o chamador deve parar)
+        """
+        if self._stop_requested():
+            return self._interrupt("cancelada")
+        if should_stop is not None and should_stop():
+            return False
+
+        now = time.monotonic()
+        if self.checks_load and now >= self._next_check:
+            self._next_check = now + self.check_interval
+            load = self.system_monitor.get_load()
+            if self._overloaded(load, 0) and not self._pause(load, should_stop):
+                return False
+
+        delay = max(self.files.reserve(files), self.bytes.reserve(size))
+        if delay > 0:
+            self.stats['throttled_seconds'] += delay
+            return self._sleep(delay, should_stop)
+        return True
+
+    def _pause(self, load: Dict[str, float], should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        """Aguarda a carga cair abaixo do limite menos a margem; False se interrompida"""
+        self.stats['pauses'] += 1
+        self.logger.info(
+            f"Limpeza pausada: CPU {load['cpu_percent']:.0f}%, disco {load['disk_busy_percent']:.0f}%"
+        )
+        start = time.monotonic()
+        resumed = True
+        while True:
+            if self.max_pause is not None and time.monotonic() - start >= self.max_pause:
+                # Quem agenda decide o que fazer com o restante (o agendador reagenda)
+                self.stats['busy_timeout'] = True
+                resumed = self._interrupt(f"sistema ocupado por mais de {self.max_pause:.0f}s")
+                break
+            step = self.check_interval
+            if self.max_pause is not None:
+                step = min(step, max(0.0, start + self.max_pause - time.monotonic()))
+            if not self._sleep(step, should_stop):
+                resumed = False
+                break
+            load = self.system_monitor.get_load()
+            if not self._overloaded(load, self.resume_margin):
+                break
+        paused = time.monotonic() - start
+        self.stats['paused_seconds'] += paused
+        self._next_check = time.monotonic() + self.check_interval
+        if resumed:
+            self.logger.info(f"Limpeza retomada após {paused:.1f}s")
+        return resumed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pausas, tempo gasto aguardando o limite de taxa e se a execução foi interrompida"""
+        return dict(self.stats)
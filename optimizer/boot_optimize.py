@@ -13,10 +13,15 @@ Funcionalidades:
 - Ajuste automático de plano de energia
 - Verificação e otimização de rede/DNS
 - Otimização de memória inicial
+- Prazo de execução (max_execution_time) com estimativa aprendida por etapa
+- Etapas que não cabem no prazo adiadas para uma execução ociosa
+- Etapas independentes executadas em paralelo (StepExecutor)
+- Histórico de tempo de boot e detecção de regressões (BootProfiler)
 """
 
 import os
 import sys
+import json
 import time
 import psutil
 import logging
@@ -27,6 +32,107 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from .cleaning_engine import CleaningEngine, CleaningPolicy
+from .background import BackgroundThrottle
+from .io_scheduler import get_io_scheduler
+from .step_executor import StepExecutor
+from .boot_profiler import BootProfiler
+
+# Chave de configuração, nome da etapa, método, recurso e dependências.
+# Etapas de recursos diferentes rodam ao mesmo tempo
+BOOT_STEPS = [
+    ('clean_temp_files', 'temp_cleanup', '_clean_temp_files', 'disk', ()),
+    ('optimize_services', 'services', '_optimize_services', 'process', ()),
+    ('set_power_plan', 'power_plan', '_set_power_plan', 'process', ()),
+    ('optimize_network', 'network', '_optimize_network', 'network', ()),
+    ('clean_memory', 'memory', '_clean_memory', 'process', ()),
+    ('update_dns', 'dns', '_update_dns', 'network', ('network',)),  # Renova depois do flush
+]
+
+# Etapas que podem esperar: se não couberem no prazo, rodam na próxima execução ociosa.
+# As demais só fazem sentido durante o boot e são apenas puladas
+DEFERRABLE_STEPS = {'temp_cleanup', 'network', 'dns'}
+
+# Histórico na pasta do programa: as tarefas agendadas rodam com outra pasta atual
+DEFAULT_STATE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'boot_costs.json')
+
+# Estimativa inicial (segundos) enquanto a etapa não tem histórico
+DEFAULT_STEP_COST = {
+    'temp_cleanup': 15.0,
+    'services': 2.0,
+    'power_plan': 1.0,
+    'network': 3.0,
+    'memory': 1.0,
+    'dns': 8.0,
+}
+
+
+class StepCostModel:
+    """
+    Duração esperada de cada etapa, aprendida das execuções anteriores
+
+    Guarda a média móvel exponencial e a maior duração recente por etapa
+    em um JSON pequeno, junto com a lista de etapas adiadas.
+    """
+
+    def __init__(self, state_file: str = DEFAULT_STATE_FILE, alpha: float = 0.3,
+                 safety_factor: float = 1.25):
+        """
+        Args:
+            state_file: Arquivo com o histórico e as etapas adiadas
+            alpha: Peso da execução mais recente na média
+            safety_factor: Margem aplicada à média ao planejar
+        """
+        self.logger = logging.getLogger(__name__)
+        self.state_file = Path(state_file)
+        self.alpha = alpha
+        self.safety_factor = safety_factor
+        self.costs: Dict[str, Dict[str, float]] = {}
+        self.deferred: List[str] = []
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.costs = state.get('costs', {})
+            self.deferred = state.get('deferred', [])
+        except (OSError, ValueError):
+            self.costs, self.deferred = {}, []
+
+    def save(self) -> None:
+        try:
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump({'costs': self.costs, 'deferred': self.deferred}, f, indent=2)
+        except OSError as e:
+            self.logger.warning(f"Erro ao salvar histórico do boot: {e}")
+
+    def estimate(self, step: str) -> float:
+        """Segundos previstos para a etapa (média com margem)"""
+        cost = self.costs.get(step)
+        if not cost:
+            return DEFAULT_STEP_COST.get(step, 5.0)
+        return cost['average'] * self.safety_factor
+
+    def record(self, step: str, duration: float, interrupted: bool = False) -> None:
+        """
+        Registra a duração de uma execução
+
+        Uma etapa interrompida pelo prazo só informa um limite inferior:
+        a média só sobe, nunca desce, com esse valor.
+        """
+        cost = self.costs.get(step)
+        if cost is None:
+            self.costs[step] = {'average': duration, 'last': duration, 'runs': 1}
+            return
+        if interrupted and duration <= cost['average']:
+            return
+        cost['average'] = self.alpha * duration + (1 - self.alpha) * cost['average']
+        cost['last'] = duration
+        cost['runs'] = cost.get('runs', 0) + 1
+
+
 class BootOptimizer:
     """Otimizador para execução no boot do sistema"""
     
@@ -45,6 +151,28 @@ class BootOptimizer:
             'update_dns': True,
             'max_execution_time': 60,  # segundos
         }
+        
+        # Histórico de duração por etapa e prazo da execução atual
+        self.cost_model = StepCostModel()
+        self._deadline: Optional[float] = None
+    
+    def _time_left(self) -> Optional[float]:
+        """Segundos até o prazo (None fora de uma execução com prazo)"""
+        if self._deadline is None:
+            return None
+        return self._deadline - time.monotonic()
+    
+    def _deadline_passed(self) -> bool:
+        """Consultada pelas etapas longas para parar quando o prazo acaba"""
+        left = self._time_left()
+        return left is not None and left <= 0
+    
+    def _step_timeout(self, default: float) -> float:
+        """Timeout de um comando externo, limitado ao tempo restante"""
+        left = self._time_left()
+        if left is None:
+            return default
+        return max(1.0, min(default, left))
     
     def run_boot_optimization(self, config: Optional[Dict] = None) -> Dict[str, Any]:
         """
@@ -60,38 +188,50 @@ class BootOptimizer:
             self.config.update(config)
         
         self.logger.info("Iniciando otimização de boot")
+        budget = self.config.get('max_execution_time') or 0
         results = {
             'start_time': datetime.now().isoformat(),
             'optimizations': {},
             'total_time': 0,
             'success': True,
-            'errors': []
+            'errors': [],
+            'time_budget': budget,
+            'planned': {},      # Etapa -> segundos previstos
+            'deferred': [],     # Adiadas para a execução ociosa
+            'skipped': [],      # Não couberam e só fazem sentido no boot
+            'interrupted': []   # Paradas no meio pelo prazo
         }
         
+        # Prazo em relógio monotônico; 0 ou None desativa o limite
+        deadline = time.monotonic() + budget if budget > 0 else None
+        
         try:
-            # 1. Limpeza de arquivos temporários
-            if self.config['clean_temp_files']:
-                results['optimizations']['temp_cleanup'] = self._clean_temp_files()
-            
-            # 2. Otimização de serviços
-            if self.config['optimize_services']:
-                results['optimizations']['services'] = self._optimize_services()
-            
-            # 3. Configuração de plano de energia
-            if self.config['set_power_plan']:
-                results['optimizations']['power_plan'] = self._set_power_plan()
-            
-            # 4. Otimização de rede
-            if self.config['optimize_network']:
-                results['optimizations']['network'] = self._optimize_network()
-            
-            # 5. Limpeza de memória
-            if self.config['clean_memory']:
-                results['optimizations']['memory'] = self._clean_memory()
-            
-            # 6. Atualização de DNS
-            if self.config['update_dns']:
-                results['optimizations']['dns'] = self._update_dns()
+            plan = self._plan_steps(budget)
+            results['planned'] = {step: round(estimate, 2) for step, estimate in plan['estimates'].items()}
+            results['deferred'].extend(plan['deferred'])
+            results['skipped'].extend(plan['skipped'])
+            for step in plan['deferred'] + plan['skipped']:
+                self.logger.info(
+                    f"Etapa {step} {'adiada' if step in plan['deferred'] else 'pulada'}: "
+                    f"prevista {plan['estimates'][step]:.1f}s não cabe em {budget}s"
+                )
+            
+            # As etapas longas consultam o prazo e param sozinhas quando ele acaba
+            self._deadline = deadline
+            pipeline = self._run_pipeline(plan['run'])
+            results['step_times'] = {step: round(info['duration'], 3)
+                                     for step, info in pipeline['steps'].items()}
+            for _, step, _, _, _ in plan['run']:
+                if step not in pipeline['results']:
+                    continue
+                step_result = pipeline['results'][step]
+                results['optimizations'][step] = step_result
+                if step_result.get('interrupted'):
+                    results['interrupted'].append(step)
+                    if step in DEFERRABLE_STEPS:
+                        results['deferred'].append(step)
+            for step in pipeline['failed']:
+                results['errors'].append(f"{step}: {pipeline['steps'][step]['error']}")
             
         except Exception as e:
             self.logger.error(f"Erro durante otimização de boot: {e}")
@@ -99,18 +239,116 @@ class BootOptimizer:
             results['errors'].append(str(e))
         
         finally:
+            self._deadline = None
+            self._save_deferred(results['optimizations'], results['deferred'])
             results['total_time'] = time.time() - self.start_time
             results['end_time'] = datetime.now().isoformat()
             self.logger.info(f"Otimização de boot concluída em {results['total_time']:.2f}s")
+            if results['deferred']:
+                self.logger.info(f"Etapas adiadas para a execução ociosa: {', '.join(results['deferred'])}")
+        
+        return results
+    
+    def run_deferred_steps(self) -> Dict[str, Any]:
+        """
+        Executa, sem prazo, as etapas adiadas pelos boots anteriores
+        
+        Chamado pela tarefa agendada de ociosidade (--run-deferred).
+        
+        Returns:
+            Dicionário no mesmo formato de run_boot_optimization
+        """
+        self.cost_model.load()
+        results = {
+            'start_time': datetime.now().isoformat(),
+            'optimizations': {},
+            'total_time': 0,
+            'success': True,
+            'errors': []
+        }
+        start_time = time.time()
+        
+        try:
+            self._deadline = None
+            steps = [entry for entry in BOOT_STEPS if entry[1] in self.cost_model.deferred]
+            results['optimizations'].update(self._run_pipeline(steps)['results'])
+        except Exception as e:
+            self.logger.error(f"Erro nas etapas adiadas: {e}")
+            results['success'] = False
+            results['errors'].append(str(e))
+        finally:
+            self._save_deferred(results['optimizations'], [])
+            results['total_time'] = time.time() - start_time
+            results['end_time'] = datetime.now().isoformat()
         
         return results
     
+    def _plan_steps(self, budget: float) -> Dict[str, Any]:
+        """
+        Decide quais etapas cabem no prazo
+        
+        As etapas de um mesmo recurso rodam uma depois da outra e as de
+        recursos diferentes em paralelo, então o término previsto de cada
+        etapa é o fim da fila do seu recurso (ou das dependências) mais a
+        estimativa. O que não termina antes do prazo é adiado ou pulado,
+        junto com as etapas que dependem dela.
+        """
+        lane_end: Dict[str, float] = {}
+        finish: Dict[str, float] = {}
+        plan = {'run': [], 'deferred': [], 'skipped': [], 'estimates': {}}
+        
+        for entry in BOOT_STEPS:
+            config_key, step, _, resource, depends_on = entry
+            if not self.config.get(config_key):
+                continue
+            estimate = self.cost_model.estimate(step)
+            plan['estimates'][step] = estimate
+            
+            blocked = any(dependency in plan['deferred'] or dependency in plan['skipped']
+                          for dependency in depends_on)
+            start = max([lane_end.get(resource, 0.0)] +
+                        [finish[dependency] for dependency in depends_on if dependency in finish])
+            if blocked or (budget > 0 and start + estimate > budget):
+                plan['deferred' if step in DEFERRABLE_STEPS else 'skipped'].append(step)
+                continue
+            
+            finish[step] = lane_end[resource] = start + estimate
+            plan['run'].append(entry)
+        return plan
+    
+    def _run_pipeline(self, steps: List[tuple]) -> Dict[str, Any]:
+        """Executa as etapas pelo StepExecutor (dependências ausentes são ignoradas)"""
+        names = {entry[1] for entry in steps}
+        executor = StepExecutor()
+        for _, step, method, resource, depends_on in steps:
+            executor.add_step(step, lambda step=step, method=method: self._run_step(step, method),
+                              depends_on=[dependency for dependency in depends_on if dependency in names],
+                              resource=resource)
+        return executor.run()
+    
+    def _run_step(self, step: str, method: str) -> Dict[str, Any]:
+        """Executa uma etapa e registra a duração no histórico"""
+        started = time.monotonic()
+        result = getattr(self, method)()
+        duration = time.monotonic() - started
+        self.cost_model.record(step, duration, interrupted=bool(result.get('interrupted')))
+        return result
+    
+    def _save_deferred(self, completed: Dict[str, Dict[str, Any]], deferred: List[str]) -> None:
+        """Atualiza as etapas pendentes: concluídas saem, adiadas agora entram"""
+        pending = [step for step in self.cost_model.deferred
+                   if step not in completed or completed[step].get('interrupted')]
+        pending.extend(step for step in deferred if step not in pending)
+        self.cost_model.deferred = pending
+        self.cost_model.save()
+    
     def _clean_temp_files(self) -> Dict[str, Any]:
         """Limpa arquivos temporários do sistema"""
         result = {
             'files_deleted': 0,
             'space_freed_mb': 0,
             'time_taken': 0,
+            'interrupted': False,
             'success': True,
             'errors': []
         }
@@ -127,65 +365,42 @@ class BootOptimizer:
                 os.path.expanduser(r"~\AppData\Local\Microsoft\Windows\INetCache"),
             ]
             
-            initial_space = 0
+            # Uma única passagem: apenas arquivos com mais de 1 dia, pastas vazias removidas.
+            # Em segundo plano, para não disputar o disco com o restante do boot.
+            # Pastas em discos diferentes são limpas em paralelo, um disco por vez cada.
+            # Quando o prazo do boot acaba, a limpeza para antes do próximo arquivo,
+            # mesmo no meio de uma pausa por carga (que nunca passa do tempo restante)
+            policy = CleaningPolicy(min_age_seconds=86400)
+            time_left = self._time_left()
+            throttle = BackgroundThrottle(
+                max_pause=600.0 if time_left is None else max(0.0, time_left),
+                should_stop=self._deadline_passed
+            )
+            
+            def run_throttled(work):
+                with throttle:
+                    work()
+            
+            existing = [temp_dir for temp_dir in dict.fromkeys(temp_dirs) if os.path.exists(temp_dir)]
+            cleanups = get_io_scheduler().run_per_device(
+                existing,
+                lambda temp_dir: CleaningEngine(policy, use_dir_fd=True,
+                                                should_stop=self._deadline_passed).clean(temp_dir),
+                wrapper=run_throttled
+            )
+            
+            bytes_freed = 0
             files_deleted = 0
-            
-            for temp_dir in temp_dirs:
-                if os.path.exists(temp_dir):
-                    try:
-                        # Calcular espaço inicial
-                        for root, dirs, files in os.walk(temp_dir):
-                            for file in files:
-                                try:
-                                    file_path = os.path.join(root, file)
-                                    if os.path.exists(file_path):
-                                        initial_space += os.path.getsize(file_path)
-                                except:
-                                    continue
-                        
-                        # Limpar arquivos
-                        for root, dirs, files in os.walk(temp_dir, topdown=False):
-                            for file in files:
-                                try:
-                                    file_path = os.path.join(root, file)
-                                    # Apenas arquivos com mais de 1 dia
-                                    if os.path.exists(file_path) and \
-                                       time.time() - os.path.getmtime(file_path) > 86400:
-                                        os.remove(file_path)
-                                        files_deleted += 1
-                                except:
-                                    continue
-                            
-                            # Remover diretórios vazios
-                            for dir_name in dirs:
-                                try:
-                                    dir_path = os.path.join(root, dir_name)
-                                    if os.path.exists(dir_path) and not os.listdir(dir_path):
-                                        os.rmdir(dir_path)
-                                except:
-                                    continue
-                    
-                    except Exception as e:
-                        result['errors'].append(f"Erro ao limpar {temp_dir}: {e}")
-            
-            # Calcular espaço liberado
-            final_space = 0
-            for temp_dir in temp_dirs:
-                if os.path.exists(temp_dir):
-                    try:
-                        for root, dirs, files in os.walk(temp_dir):
-                            for file in files:
-                                try:
-                                    file_path = os.path.join(root, file)
-                                    if os.path.exists(file_path):
-                                        final_space += os.path.getsize(file_path)
-                                except:
-                                    continue
-                    except:
-                        continue
+            for temp_dir, cleanup in cleanups:
+                if isinstance(cleanup, Exception):
+                    result['errors'].append(f"Erro ao limpar {temp_dir}: {cleanup}")
+                    continue
+                files_deleted += cleanup['files_deleted']
+                bytes_freed += cleanup['bytes_freed']
+                result['interrupted'] = result['interrupted'] or cleanup.get('interrupted', False)
             
             result['files_deleted'] = files_deleted
-            result['space_freed_mb'] = max(0, (initial_space - final_space) / (1024 * 1024))
+            result['space_freed_mb'] = bytes_freed / (1024 * 1024)
             
         except Exception as e:
             result['success'] = False
@@ -199,6 +414,7 @@ class BootOptimizer:
         result = {
             'services_optimized': 0,
             'time_taken': 0,
+            'interrupted': False,
             'success': True,
             'errors': [],
             'optimized_services': []
@@ -216,6 +432,9 @@ class BootOptimizer:
             
             # Verificar serviços ativos desnecessários
             for proc in psutil.process_iter(['pid', 'name', 'cpu_percent']):
+                if self._deadline_passed():
+                    result['interrupted'] = True
+                    break
                 try:
                     proc_info = proc.info
                     # Se um processo está usando muita CPU, podemos verificar
@@ -287,7 +506,7 @@ class BootOptimizer:
                 subprocess.run(['ipconfig', '/flushdns'], 
                              capture_output=True, 
                              text=True, 
-                             timeout=10,
+                             timeout=self._step_timeout(10),
                              check=True)
                 result['dns_flushed'] = True
             except:
@@ -356,14 +575,14 @@ class BootOptimizer:
             subprocess.run(['ipconfig', '/flushdns'], 
                          capture_output=True, 
                          text=True, 
-                         timeout=5,
+                         timeout=self._step_timeout(5),
                          check=True)
             
             # Renovar configuração de rede
             subprocess.run(['ipconfig', '/renew'], 
                          capture_output=True, 
                          text=True, 
-                         timeout=10,
+                         timeout=self._step_timeout(10),
                          check=True)
             
             result['dns_updated'] = True
@@ -403,6 +622,20 @@ class BootOptimizer:
             
             if result.returncode == 0:
                 self.logger.info(f"Tarefa de boot '{task_name}' criada com sucesso")
+                
+                # Etapas adiadas pelo prazo do boot rodam quando o PC ficar ocioso
+                idle_cmd = [
+                    'schtasks', '/create',
+                    '/tn', f"{task_name}Adiadas",
+                    '/tr', f'"{python_path}" "{script_path}" --run-deferred',
+                    '/sc', 'onidle',
+                    '/i', '10',
+                    '/ru', 'SYSTEM',
+                    '/f'
+                ]
+                idle_result = subprocess.run(idle_cmd, capture_output=True, text=True)
+                if idle_result.returncode != 0:
+                    self.logger.warning(f"Erro ao criar tarefa das etapas adiadas: {idle_result.stderr}")
                 return True
             else:
                 self.logger.error(f"Erro ao criar tarefa: {result.stderr}")
@@ -425,6 +658,8 @@ class BootOptimizer:
         try:
             cmd = ['schtasks', '/delete', '/tn', task_name, '/f']
             result = subprocess.run(cmd, capture_output=True, text=True)
+            subprocess.run(['schtasks', '/delete', '/tn', f"{task_name}Adiadas", '/f'],
+                           capture_output=True, text=True)
             
             if result.returncode == 0:
                 self.logger.info(f"Tarefa de boot '{task_name}' removida com sucesso")
@@ -438,12 +673,48 @@ class BootOptimizer:
             return False
 
 
+def spawn_boot_profiler() -> bool:
+    """
+    Inicia o perfil do boot (--profile-boot) em um processo separado
+
+    O processo espera a CPU ficar ociosa contando a partir do boot e grava
+    first_idle_s no histórico, sem segurar a tarefa de boot. No Windows ele
+    sai do grupo e do console da tarefa; se o job da tarefa não permitir
+    sair dele (CREATE_BREAKAWAY_FROM_JOB), inicia dentro do job mesmo.
+
+    Returns:
+        True se o processo foi iniciado
+    """
+    cmd = [sys.executable, os.path.abspath(__file__), '--profile-boot']
+    options = {'stdin': subprocess.DEVNULL, 'stdout': subprocess.DEVNULL,
+               'stderr': subprocess.DEVNULL, 'close_fds': True}
+    if sys.platform != 'win32':
+        options['start_new_session'] = True
+        attempts = [0]
+    else:
+        flags = (getattr(subprocess, 'DETACHED_PROCESS', 0)
+                 | getattr(subprocess, 'CREATE_NEW_PROCESS_GROUP', 0))
+        attempts = [flags | getattr(subprocess, 'CREATE_BREAKAWAY_FROM_JOB', 0), flags]
+
+    for creationflags in attempts:
+        try:
+            subprocess.Popen(cmd, creationflags=creationflags, **options)
+            return True
+        except OSError as e:
+            error = e
+    logging.getLogger(__name__).warning(f"Erro ao iniciar o perfil do boot: {error}")
+    return False
+
+
 # Função principal para execução via linha de comando
 def main():
     """Função principal para execução standalone"""
     if "--boot-optimize" in sys.argv:
         print("🚀 Executando otimização de boot...")
         
+        # Tempo até ficar ocioso: medido desde o boot por um processo à parte
+        spawn_boot_profiler()
+        
         optimizer = BootOptimizer()
         results = optimizer.run_boot_optimization()
         
@@ -455,6 +726,66 @@ def main():
             else:
                 print(f"  ❌ {opt_name}: ERRO")
         
+        for opt_name in results['deferred']:
+            print(f"  ⏳ {opt_name}: adiada para quando o PC estiver ocioso")
+        
+        # Perfil do boot: etapas e área de trabalho (no máximo 30s de espera); o tempo
+        # até ficar ocioso fica com o processo --profile-boot, sem segurar esta tarefa
+        try:
+            profiler = BootProfiler()
+            record = profiler.record_boot(step_times=results.get('step_times'),
+                                          max_wait=30, measure_idle=False)
+            if record.get('desktop_s') is not None:
+                print(f"🖥️ Área de trabalho em {record['desktop_s']:.1f}s após o boot")
+            for regression in profiler.check_regressions()['regressions']:
+                print(f"  ⚠️ {regression['message']}")
+        except Exception as e:
+            print(f"  ⚠️ Perfil do boot indisponível: {e}")
+        
+        return results['success']
+    
+    elif "--boot-report" in sys.argv:
+        profiler = BootProfiler()
+        history = profiler.load_history()
+        print(f"📈 Histórico de boot: {len(history)} boots")
+        for record in history[-10:]:
+            desktop = record.get('desktop_s')
+            idle = record.get('first_idle_s')
+            print(f"  {record['date']}: área de trabalho "
+                  f"{'-' if desktop is None else f'{desktop:.1f}s'}, ocioso "
+                  f"{'-' if idle is None else f'{idle:.1f}s'}")
+        
+        regressions = profiler.check_regressions()['regressions']
+        for regression in regressions:
+            print(f"⚠️ {regression['message']}")
+            for suspect in regression['suspects']:
+                kind = 'Etapa' if suspect['kind'] == 'step' else 'Inicialização'
+                detail = 'novo' if suspect['new'] else f"+{suspect['delta_s']:.1f}s"
+                print(f"    • {kind} {suspect['name']}: {detail}")
+        if not regressions:
+            print("✅ Nenhuma regressão no tempo de boot")
+        
+        return True
+    
+    elif "--profile-boot" in sys.argv:
+        # Processo iniciado pela tarefa de boot: amostra a CPU até a primeira
+        # janela ociosa (até 30min após o boot) e completa a linha deste boot
+        try:
+            record = BootProfiler().record_boot(timeout=1800)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Perfil do boot indisponível: {e}")
+            return False
+        return record.get('first_idle_s') is not None
+    
+    elif "--run-deferred" in sys.argv:
+        print("⏳ Executando etapas adiadas do boot...")
+        
+        optimizer = BootOptimizer()
+        results = optimizer.run_deferred_steps()
+        
+        for opt_name, opt_result in results['optimizations'].items():
+            print(f"  {'✅' if opt_result['success'] else '❌'} {opt_name}")
+        
         return results['success']
     
     else:
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Perfil de Tempo do Boot
+=======================
+
+Mede se a otimização de boot está de fato deixando o boot mais rápido.
+A cada inicialização grava uma linha em um histórico compacto (JSON Lines)
+com o tempo até a área de trabalho, o tempo até o sistema ficar ocioso, a
+duração de cada etapa do BootOptimizer e o início de cada programa da
+inicialização. Comparando os boots recentes com os anteriores, aponta
+regressões ("boot 40% mais lento desde terça-feira") e as etapas ou
+programas de inicialização que mais mudaram.
+
+Funcionalidades:
+- Boot até a área de trabalho (psutil.boot_time até o explorer.exe)
+- Tempo até a primeira janela ociosa de CPU, medido por um processo separado
+  (--profile-boot) que a tarefa de boot inicia sem esperar
+- Duração das etapas do BootOptimizer e início/CPU dos programas de inicialização
+- Histórico de uma linha por boot, com tamanho limitado
+- Detecção de regressões pela mediana dos boots anteriores, com suspeitos
+"""
+
+import os
+import json
+import time
+import logging
+import statistics
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+try:
+    import winreg
+    WINREG_AVAILABLE = True
+except ImportError:
+    WINREG_AVAILABLE = False
+
+# Histórico na pasta do programa (o boot roda como tarefa agendada, com outra pasta atual)
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'boot_history.jsonl')
+
+# psutil.boot_time() pode variar ~1s entre processos: boots a até 2s são o mesmo
+BOOT_TIME_TOLERANCE = 2
+
+# Métricas do boot inteiro analisadas na detecção de regressões
+BOOT_METRICS = {
+    'desktop_s': 'Boot',
+    'first_idle_s': 'Tempo até ficar ocioso'
+}
+
+_WEEKDAYS = ['segunda-feira', 'terça-feira', 'quarta-feira', 'quinta-feira',
+             'sexta-feira', 'sábado', 'domingo']
+
+_RUN_KEYS = [
+    ('HKEY_CURRENT_USER', r"Software\Microsoft\Windows\CurrentVersion\Run"),
+    ('HKEY_LOCAL_MACHINE', r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run"),
+    ('HKEY_LOCAL_MACHINE', r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Run"),
+]
+
+
+def _executable_name(command: str) -> str:
+    """Nome do executável de uma linha de comando da inicialização"""
+    command = os.path.expandvars(command.strip())
+    if command.startswith('"'):
+        path = command[1:].split('"', 1)[0]
+    else:
+        lower = command.lower()
+        end = lower.find('.exe')
+        path = command[:end + 4] if end >= 0 else command.split(' ', 1)[0]
+    return os.path.basename(path).lower()
+
+
+def startup_entries() -> Dict[str, str]:
+    """Programas da inicialização: nome da entrada -> executável (minúsculo)"""
+    entries = {}
+    if WINREG_AVAILABLE:
+        for hive_name, key_path in _RUN_KEYS:
+            try:
+                with winreg.OpenKey(getattr(winreg, hive_name), key_path) as key:
+                    index = 0
+                    while True:
+                        try:
+                            name, value, _ = winreg.EnumValue(key, index)
+                        except OSError:
+                            break
+                        if isinstance(value, str) and value.strip():
+                            entries[name] = _executable_name(value)
+                        index += 1
+            except OSError:
+                continue
+
+    # Atalhos das pastas de inicialização: o nome do atalho costuma ser o do programa
+    folders = [
+        os.path.expandvars(r"%APPDATA%\Microsoft\Windows\Start Menu\Programs\Startup"),
+        os.path.expandvars(r"%PROGRAMDATA%\Microsoft\Windows\Start Menu\Programs\StartUp"),
+    ]
+    for folder in folders:
+        try:
+            with os.scandir(folder) as items:
+                for item in items:
+                    stem, extension = os.path.splitext(item.name)
+                    if extension.lower() in ('.lnk', '.exe', '.bat', '.cmd'):
+                        entries.setdefault(stem, (stem + '.exe').lower())
+        except OSError:
+            continue
+    return entries
+
+
+def _median(values: List[float]) -> Optional[float]:
+    return statistics.median(values) if values else None
+
+
+class BootProfiler:
+    """Mede cada boot, guarda o histórico e aponta regressões"""
+
+    def __init__(self, history_file: str = HISTORY_FILE, max_entries: int = 180):
+        """
+        Args:
+            history_file: Arquivo JSON Lines com uma linha por boot
+            max_entries: Boots mantidos no histórico (os mais antigos saem)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.history_file = history_file
+        self.max_entries = max_entries
+
+    @staticmethod
+    def _desktop_ready(boot_time: float) -> Optional[float]:
+        """Segundos do boot até o primeiro explorer.exe da sessão (área de trabalho)"""
+        started = [proc.info['create_time'] for proc in psutil.process_iter(['name', 'create_time'])
+                   if (proc.info['name'] or '').lower() == 'explorer.exe'
+                   and (proc.info['create_time'] or 0) >= boot_time]
+        return min(started) - boot_time if started else None
+
+    def measure_boot(self, timeout: float = 600, idle_cpu_percent: float = 20.0,
+                     idle_window: int = 10, max_wait: Optional[float] = None,
+                     wait_idle: bool = True) -> Dict[str, Any]:
+        """
+        Mede o boot atual
+
+        Espera a área de trabalho aparecer e a CPU ficar abaixo de
+        idle_cpu_percent por idle_window segundos seguidos. Se o programa
+        começou muito depois do boot (mais que timeout), o tempo até ficar
+        ocioso não é medido.
+
+        Args:
+            timeout: Fim da medição, em segundos após o boot
+            idle_cpu_percent: Uso de CPU abaixo do qual o sistema está ocioso
+            idle_window: Segundos seguidos abaixo do limite para contar como ocioso
+            max_wait: Espera máxima a partir de agora (None = até timeout)
+            wait_idle: Espera a ociosidade; False mede só a área de trabalho
+
+        Returns:
+            Dicionário com boot_time, desktop_s e first_idle_s (None quando não medido)
+        """
+        boot_time = psutil.boot_time()
+        limit = boot_time + timeout
+        if max_wait is not None:
+            limit = min(limit, time.time() + max_wait)
+        result = {'boot_time': boot_time, 'desktop_s': None, 'first_idle_s': None}
+
+        desktop = self._desktop_ready(boot_time)
+        while desktop is None and time.time() < limit:
+            time.sleep(2)
+            desktop = self._desktop_ready(boot_time)
+        result['desktop_s'] = desktop
+        if not wait_idle:
+            return result
+
+        quiet_since = None
+        psutil.cpu_percent(interval=None)
+        while time.time() < limit:
+            sample_start = time.time()
+            if psutil.cpu_percent(interval=1) < idle_cpu_percent:
+                quiet_since = quiet_since or sample_start
+                if time.time() - quiet_since >= idle_window:
+                    result['first_idle_s'] = quiet_since - boot_time
+                    break
+            else:
+                quiet_since = None
+        return result
+
+    @staticmethod
+    def measure_startup_items(boot_time: float) -> Dict[str, Dict[str, float]]:
+        """
+        Início (segundos após o boot) e CPU consumida de cada programa da
+        inicialização que está rodando
+        """
+        first_process: Dict[str, Any] = {}
+        for proc in psutil.process_iter(['name', 'create_time', 'cpu_times']):
+            name = (proc.info['name'] or '').lower()
+            created = proc.info['create_time'] or 0
+            if created < boot_time or not proc.info['cpu_times']:
+                continue
+            if name not in first_process or created < first_process[name]['create_time']:
+                first_process[name] = proc.info
+
+        items = {}
+        for entry, executable in startup_entries().items():
+            info = first_process.get(executable)
+            if info is None:
+                continue
+            cpu = info['cpu_times']
+            items[entry] = {'started_s': round(info['create_time'] - boot_time, 1),
+                            'cpu_s': round(cpu.user + cpu.system, 1)}
+        return items
+
+    def record_boot(self, step_times: Optional[Dict[str, float]] = None, measure: bool = True,
+                    timeout: float = 600, max_wait: Optional[float] = None,
+                    measure_idle: bool = True) -> Dict[str, Any]:
+        """
+        Grava (ou completa) a linha do boot atual no histórico
+
+        A tarefa de boot grava as etapas e a área de trabalho sem esperar a
+        ociosidade; o processo --profile-boot completa a mesma linha com
+        first_idle_s (medido uma única vez por boot). As linhas são casadas
+        pelo horário do boot com tolerância de BOOT_TIME_TOLERANCE segundos.
+
+        Args:
+            step_times: Duração de cada etapa do BootOptimizer (results['step_times'])
+            measure: Mede área de trabalho, ociosidade e programas da inicialização
+            timeout: Fim da medição, contado a partir do boot
+            max_wait: Espera máxima da medição a partir de agora (None = até timeout)
+            measure_idle: Espera a ociosidade, se ela ainda não foi medida neste boot
+
+        Returns:
+            A linha gravada
+        """
+        boot_time = psutil.boot_time()
+        record: Dict[str, Any] = {
+            'boot': int(boot_time),
+            'date': datetime.fromtimestamp(boot_time).isoformat(timespec='seconds')
+        }
+        if measure:
+            current = next((existing for existing in self.load_history()
+                            if self._same_boot(existing, record)), {})
+            wait_idle = measure_idle and current.get('first_idle_s') is None
+            measured = self.measure_boot(timeout=timeout, max_wait=max_wait, wait_idle=wait_idle)
+            for metric in BOOT_METRICS:
+                if measured[metric] is not None:
+                    record[metric] = round(measured[metric], 1)
+            record['startup'] = self.measure_startup_items(boot_time)
+        if step_times:
+            record['steps'] = {step: round(duration, 2) for step, duration in step_times.items()}
+
+        history = self.load_history()
+        for existing in history:
+            if self._same_boot(existing, record):
+                record['boot'] = existing['boot']  # Mantém a chave da primeira gravação
+                existing.update(record)
+                record = existing
+                break
+        else:
+            history.append(record)
+        self._save_history(history)
+        return record
+
+    @staticmethod
+    def _same_boot(existing: Dict[str, Any], record: Dict[str, Any]) -> bool:
+        """Linhas do mesmo boot (boot_time medido em processos diferentes)"""
+        boot = existing.get('boot')
+        return boot is not None and abs(boot - record['boot']) <= BOOT_TIME_TOLERANCE
+
+    def load_history(self) -> List[Dict[str, Any]]:
+        """Boots gravados, do mais antigo para o mais recente"""
+        history = []
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        history.append(json.loads(line))
+                    except ValueError:
+                        continue  # Linha cortada por um desligamento no meio da escrita
+        except OSError:
+            return []
+        history.sort(key=lambda record: record.get('boot', 0))
+        return history
+
+    def _save_history(self, history: List[Dict[str, Any]]) -> None:
+        history = history[-self.max_entries:]
+        temp_file = self.history_file + '.tmp'
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                for record in history:
+                    f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+            os.replace(temp_file, self.history_file)
+        except OSError as e:
+            self.logger.warning(f"Erro ao salvar histórico de boot: {e}")
+
+    @staticmethod
+    def _is_slow(value: float, baseline: float, threshold: float, min_delta: float) -> bool:
+        return value > baseline * (1 + threshold) and value - baseline >= min_delta
+
+    @staticmethod
+    def _suspects(baseline: List[Dict[str, Any]], recent: List[Dict[str, Any]],
+                  min_delta: float) -> List[Dict[str, Any]]:
+        """Etapas e programas da inicialização que mais pioraram (ou apareceram)"""
+        suspects = []
+        for kind, section, field in (('step', 'steps', None), ('startup', 'startup', 'cpu_s')):
+            def values(records, name):
+                found = []
+                for record in records:
+                    value = record.get(section, {}).get(name)
+                    if value is not None:
+                        found.append(value[field] if field else value)
+                return found
+
+            names = set()
+            for record in recent:
+                names.update(record.get(section, {}))
+            for name in names:
+                before = _median(values(baseline, name))
+                after = _median(values(recent, name))
+                if after is None:
+                    continue
+                is_new = kind == 'startup' and before is None
+                delta = after - (before or 0.0)
+                if is_new or delta >= min_delta:
+                    suspects.append({'kind': kind, 'name': name, 'baseline_s': before,
+                                     'current_s': after, 'delta_s': round(delta, 1), 'new': is_new})
+        suspects.sort(key=lambda suspect: suspect['delta_s'], reverse=True)
+        return suspects[:5]
+
+    def check_regressions(self, threshold: float = 0.2, min_delta: float = 3.0,
+                          baseline_boots: int = 10, min_baseline: int = 3) -> Dict[str, Any]:
+        """
+        Compara os boots recentes com os anteriores
+
+        Os boots lentos mais recentes formam a sequência analisada; a base é
+        a mediana dos baseline_boots boots antes dela. Um boot é lento quando
+        passa da base em mais de threshold (fração) e de min_delta segundos.
+
+        Returns:
+            Dicionário com 'regressions' (métrica, base, atual, variação, desde,
+            mensagem e suspeitos) e 'boots_analyzed'
+        """
+        history = self.load_history()
+        regressions = []
+
+        for metric, title in BOOT_METRICS.items():
+            boots = [record for record in history if record.get(metric) is not None]
+            streak_start = None
+            for start in range(len(boots) - 1, 0, -1):
+                baseline = boots[max(0, start - baseline_boots):start]
+                if len(baseline) < min_baseline:
+                    break
+                base = _median([record[metric] for record in baseline])
+                if not all(self._is_slow(record[metric], base, threshold, min_delta)
+                           for record in boots[start:]):
+                    break
+                streak_start = start
+            if streak_start is None:
+                continue
+
+            baseline = boots[max(0, streak_start - baseline_boots):streak_start]
+            recent = boots[streak_start:]
+            base = _median([record[metric] for record in baseline])
+            current = _median([record[metric] for record in recent])
+            change = (current / base - 1) * 100 if base else 0.0
+            since = datetime.fromisoformat(recent[0]['date'])
+            suspects = self._suspects(baseline, recent, min_delta=max(0.5, (current - base) * 0.1))
+
+            message = (f"{title} {change:.0f}% mais lento desde {_WEEKDAYS[since.weekday()]} "
+                       f"({since.strftime('%d/%m')}): {current:.0f}s contra {base:.0f}s antes")
+            if suspects:
+                top = suspects[0]
+                kind = 'etapa' if top['kind'] == 'step' else 'programa de inicialização'
+                detail = 'novo' if top['new'] else f"+{top['delta_s']:.1f}s"
+                message += f" - provável causa: {kind} {top['name']} ({detail})"
+
+            regressions.append({
+                'metric': metric,
+                'baseline_s': round(base, 1),
+                'current_s': round(current, 1),
+                'change_percent': round(change, 1),
+                'since': recent[0]['date'],
+                'boots': len(recent),
+                'suspects': suspects,
+                'message': message
+            })
+
+        for regression in regressions:
+            self.logger.info(regression['message'])
+        return {'regressions': regressions, 'boots_analyzed': len(history)}
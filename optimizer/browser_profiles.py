@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Perfis de Navegadores
+=====================
+
+Descobre todos os perfis dos navegadores instalados e limpa os caches de
+cada um com o motor de limpeza, em paralelo, contando exatamente os bytes
+e arquivos liberados por navegador e por perfil.
+
+Funcionalidades:
+- Perfis Chromium (Chrome, Edge, Brave, Vivaldi) pelo arquivo Local State
+- Perfis do Firefox pelo profiles.ini (pasta Roaming e pasta Local de cache)
+- Navegador aberto é detectado e ignorado (arquivos em uso)
+- Limpeza concorrente dos perfis, com quarentena ou exclusão direta
+"""
+
+import os
+import json
+import logging
+import configparser
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import psutil
+
+from .cleaning_engine import CleaningEngine
+from .background import current_throttle
+
+# Pastas de cache de um perfil Chromium e da pasta User Data
+CHROMIUM_CACHE_DIRS = ['Cache', 'Code Cache', 'GPUCache', 'DawnCache', 'DawnGraphiteCache',
+                       os.path.join('Service Worker', 'CacheStorage'),
+                       os.path.join('Service Worker', 'ScriptCache')]
+CHROMIUM_SHARED_CACHE_DIRS = ['ShaderCache', 'GrShaderCache', 'GraphiteDawnCache']
+CHROMIUM_DATA_DIRS = ['Local Storage', 'Session Storage', 'IndexedDB']
+
+FIREFOX_CACHE_DIRS = ['cache2', 'startupCache', 'OfflineCache', 'jumpListCache']
+FIREFOX_DATA_DIRS = ['storage', 'webappsstore.sqlite']
+
+
+def _browser_definitions() -> Dict[str, Dict[str, Any]]:
+    """Navegadores conhecidos: tipo, pasta de dados e processos"""
+    local = os.environ.get('LOCALAPPDATA', '')
+    roaming = os.environ.get('APPDATA', '')
+    return {
+        'Chrome': {
+            'kind': 'chromium',
+            'user_data': os.path.join(local, 'Google', 'Chrome', 'User Data'),
+            'processes': {'chrome.exe', 'chrome'}
+        },
+        'Edge': {
+            'kind': 'chromium',
+            'user_data': os.path.join(local, 'Microsoft', 'Edge', 'User Data'),
+            'processes': {'msedge.exe', 'msedge'}
+        },
+        'Brave': {
+            'kind': 'chromium',
+            'user_data': os.path.join(local, 'BraveSoftware', 'Brave-Browser', 'User Data'),
+            'processes': {'brave.exe', 'brave'}
+        },
+        'Vivaldi': {
+            'kind': 'chromium',
+            'user_data': os.path.join(local, 'Vivaldi', 'User Data'),
+            'processes': {'vivaldi.exe', 'vivaldi'}
+        },
+        'Firefox': {
+            'kind': 'firefox',
+            'user_data': os.path.join(roaming, 'Mozilla', 'Firefox'),
+            'local_data': os.path.join(local, 'Mozilla', 'Firefox'),
+            'processes': {'firefox.exe', 'firefox'}
+        }
+    }
+
+
+@dataclass
+class BrowserProfile:
+    """Perfil de um navegador e as pastas que a limpeza pode remover"""
+    browser: str
+    name: str
+    path: str
+    cache_paths: List[str] = field(default_factory=list)
+    data_paths: List[str] = field(default_factory=list)
+
+
+def _existing(base: str, names: Iterable[str]) -> List[str]:
+    return [os.path.join(base, name) for name in names if os.path.exists(os.path.join(base, name))]
+
+
+def _chromium_profile_names(user_data: str) -> List[str]:
+    """Perfis listados no Local State; sem ele, pastas Default e Profile N"""
+    names = []
+    try:
+        with open(os.path.join(user_data, 'Local State'), 'r', encoding='utf-8') as f:
+            info_cache = json.load(f).get('profile', {}).get('info_cache', {})
+        names = [name for name in info_cache if os.path.isdir(os.path.join(user_data, name))]
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    if not names:
+        try:
+            for entry in os.scandir(user_data):
+                if entry.is_dir() and (entry.name == 'Default' or entry.name.startswith('Profile ')
+                                       or entry.name == 'Guest Profile'):
+                    names.append(entry.name)
+        except OSError:
+            pass
+    return sorted(names)
+
+
+def _firefox_profile_dirs(user_data: str) -> List[str]:
+    """Pastas de perfil do Firefox pelo profiles.ini; sem ele, a pasta Profiles"""
+    paths = []
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        parser.read(os.path.join(user_data, 'profiles.ini'), encoding='utf-8')
+    except (OSError, configparser.Error):
+        pass
+
+    for section in parser.sections():
+        if not section.startswith('Profile') or not parser.has_option(section, 'Path'):
+            continue
+        path = parser.get(section, 'Path')
+        if parser.get(section, 'IsRelative', fallback='1') == '1':
+            path = os.path.join(user_data, *path.replace('\\', '/').split('/'))
+        if os.path.isdir(path):
+            paths.append(os.path.normpath(path))
+
+    if not paths:
+        profiles_root = os.path.join(user_data, 'Profiles')
+        try:
+            paths = [entry.path for entry in os.scandir(profiles_root) if entry.is_dir()]
+        except OSError:
+            pass
+    return sorted(set(paths))
+
+
+def discover_profiles(browsers: Optional[Iterable[str]] = None,
+                      definitions: Optional[Dict[str, Dict[str, Any]]] = None) -> List[BrowserProfile]:
+    """
+    Descobre os perfis dos navegadores instalados
+
+    Args:
+        browsers: Nomes dos navegadores (padrão: todos os conhecidos)
+        definitions: Definições dos navegadores (padrão: pastas do usuário atual)
+
+    Returns:
+        Lista de BrowserProfile com as pastas de cache e de dados existentes
+    """
+    definitions = definitions or _browser_definitions()
+    wanted = set(browsers) if browsers is not None else set(definitions)
+    profiles = []
+
+    for browser, info in definitions.items():
+        if browser not in wanted or not os.path.isdir(info['user_data']):
+            continue
+
+        if info['kind'] == 'chromium':
+            user_data = info['user_data']
+            for name in _chromium_profile_names(user_data):
+                path = os.path.join(user_data, name)
+                profiles.append(BrowserProfile(browser, name, path,
+                                               _existing(path, CHROMIUM_CACHE_DIRS),
+                                               _existing(path, CHROMIUM_DATA_DIRS)))
+            shared = _existing(user_data, CHROMIUM_SHARED_CACHE_DIRS)
+            if shared:
+                profiles.append(BrowserProfile(browser, '(compartilhado)', user_data, shared))
+        else:
+            for path in _firefox_profile_dirs(info['user_data']):
+                cache_paths = _existing(path, FIREFOX_CACHE_DIRS)
+                # No Windows o cache fica na cópia do perfil em AppData\Local
+                local_data = info.get('local_data')
+                if local_data:
+                    relative = os.path.relpath(path, info['user_data'])
+                    local_path = os.path.join(local_data, relative)
+                    if os.path.normcase(local_path) != os.path.normcase(path):
+                        cache_paths += _existing(local_path, FIREFOX_CACHE_DIRS)
+                profiles.append(BrowserProfile(browser, os.path.basename(path), path, cache_paths,
+                                               _existing(path, FIREFOX_DATA_DIRS)))
+
+    return profiles
+
+
+def running_browsers(definitions: Optional[Dict[str, Dict[str, Any]]] = None) -> Set[str]:
+    """Navegadores com algum processo aberto"""
+    definitions = definitions or _browser_definitions()
+    names = {}
+    for browser, info in definitions.items():
+        for process_name in info['processes']:
+            names[process_name.lower()] = browser
+
+    running = set()
+    for proc in psutil.process_iter(['name']):
+        try:
+            browser = names.get((proc.info['name'] or '').lower())
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        if browser:
+            running.add(browser)
+    return running
+
+
+def _new_totals() -> Dict[str, int]:
+    return {'files_deleted': 0, 'bytes_freed': 0, 'files_failed': 0}
+
+
+def clean_profiles(profiles: List[BrowserProfile], engine_factory: Callable[[], CleaningEngine],
+                   include_data: bool = False, skip_running: bool = True,
+                   max_workers: int = 4, progress_callback=None,
+                   definitions: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Limpa os perfis em paralelo
+
+    Args:
+        profiles: Perfis de discover_profiles()
+        engine_factory: Cria o CleaningEngine de cada perfil (exclusão direta ou quarentena)
+        include_data: Remove também armazenamento local dos sites (Local Storage, IndexedDB...)
+        skip_running: Ignora navegadores abertos
+        max_workers: Perfis limpos ao mesmo tempo
+        progress_callback: Função (mensagem, porcentagem)
+
+    Returns:
+        Dicionário com 'files_deleted', 'bytes_freed', 'files_failed', 'skipped'
+        (navegadores abertos) e 'browsers' -> {navegador: totais + 'profiles'}
+    """
+    logger = logging.getLogger(__name__)
+    skipped = sorted(running_browsers(definitions)) if skip_running else []
+    for browser in skipped:
+        logger.warning(f"{browser} está aberto, perfis ignorados")
+    pending = [profile for profile in profiles if profile.browser not in skipped]
+
+    # Threads do pool não herdam o limite de segundo plano da thread atual
+    throttle = current_throttle()
+
+    def clean_profile(profile):
+        engine = engine_factory()
+        if throttle is not None and engine.throttle is None:
+            engine.throttle = throttle
+        paths = profile.cache_paths + (profile.data_paths if include_data else [])
+        return engine.clean_many(paths)
+
+    result = _new_totals()
+    result.update({'skipped': skipped, 'browsers': {}})
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [(profile, executor.submit(clean_profile, profile)) for profile in pending]
+        for done, (profile, future) in enumerate(futures, 1):
+            try:
+                cleaned = future.result()
+            except Exception as e:
+                logger.error(f"Erro ao limpar {profile.browser} ({profile.name}): {e}")
+                continue
+
+            browser = result['browsers'].setdefault(profile.browser, dict(_new_totals(), profiles={}))
+            browser['profiles'][profile.name] = {key: cleaned[key] for key in _new_totals()}
+            for key in _new_totals():
+                browser[key] += cleaned[key]
+                result[key] += cleaned[key]
+
+            if progress_callback:
+                progress_callback(f"{profile.browser}: {profile.name}", done / len(futures) * 100)
+
+    return result
@@ -4,6 +4,10 @@ import subprocess
 import logging
 import tempfile
 from .utils import Utils
+from .quarantine import get_quarantine_manager
+from .cleaning_engine import CleaningEngine
+from .space_estimator import ReclaimableSpaceEstimator
+from .browser_profiles import discover_profiles, clean_profiles
 
 class SystemCleaner:
     """Classe responsável pela limpeza do sistema"""
@@ -13,6 +17,14 @@ class SystemCleaner:
         self.cleaned_size = 0
         self.cleaned_files = 0
         
+        # Remoções vão para a quarentena do volume (desfazíveis, purgadas depois)
+        self.use_quarantine = True
+        self.last_quarantine_run = None
+        self._quarantine_run = None
+        
+        # Estimativa do espaço recuperável antes da limpeza
+        self.space_estimator = None
+        
         # Apps bloatware comuns do Windows 10
         self.bloatware_apps = [
             "Microsoft.3DBuilder",
@@ -57,6 +69,7 @@ class SystemCleaner:
             except Exception as e:
                 self.logger.error(f"Erro ao limpar {temp_dir}: {e}")
         
+        self._finish_quarantine_run()
         self.logger.info(f"Limpeza concluída. {self.cleaned_files} arquivos removidos, {Utils.format_size(self.cleaned_size)} liberados")
         return self.cleaned_files, self.cleaned_size
     
@@ -65,25 +78,42 @@ class SystemCleaner:
         if not os.path.exists(directory):
             return
         
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                file_path = os.path.join(root, file)
-                try:
-                    file_size = os.path.getsize(file_path)
-                    os.remove(file_path)
-                    self.cleaned_size += file_size
-                    self.cleaned_files += 1
-                except (PermissionError, FileNotFoundError, OSError):
-                    continue
-            
-            # Remove diretórios vazios
-            for dir_name in dirs:
-                dir_path = os.path.join(root, dir_name)
-                try:
-                    if not os.listdir(dir_path):
-                        os.rmdir(dir_path)
-                except (PermissionError, OSError):
-                    continue
+        result = self._new_engine().clean(directory)
+        self.cleaned_files += result['files_deleted']
+        self.cleaned_size += result['bytes_freed']
+    
+    def _new_engine(self):
+        """Motor de limpeza com quarentena ou exclusão direta"""
+        if self.use_quarantine:
+            # Pastas inteiras são renomeadas para a quarentena de uma vez
+            run = self._get_quarantine_run()
+            return CleaningEngine(
+                remove_file=lambda path, size: run.add(path, size, 1) is not None,
+                remove_tree=run.remove_tree
+            )
+        # Exclusão direta: relativa ao descritor da pasta onde o sistema suporta
+        return CleaningEngine(use_dir_fd=True)
+    
+    def _get_quarantine_run(self):
+        """Execução de quarentena da limpeza em andamento"""
+        if self._quarantine_run is None:
+            self._quarantine_run = get_quarantine_manager().begin_run('Limpeza do sistema')
+        return self._quarantine_run
+    
+    def _finish_quarantine_run(self):
+        """Fecha a execução de quarentena atual (guardada para desfazer)"""
+        if self._quarantine_run is not None:
+            self._quarantine_run.close()
+            self.last_quarantine_run = self._quarantine_run.run_id
+            self._quarantine_run = None
+    
+    def undo_last_cleanup(self):
+        """Restaura os arquivos da última limpeza enviada para a quarentena"""
+        if not self.last_quarantine_run:
+            return None
+        result = get_quarantine_manager().undo_run(self.last_quarantine_run)
+        self.last_quarantine_run = None
+        return result
     
     def clean_recycle_bin(self, progress_callback=None):
         """Esvazia a lixeira"""
@@ -116,51 +146,30 @@ class SystemCleaner:
             return False
     
     def clean_browser_data(self, progress_callback=None):
-        """Limpa dados dos navegadores"""
+        """
+        Limpa o cache de todos os perfis dos navegadores
+        
+        Returns:
+            Dicionário com arquivos e bytes liberados, no total e por
+            navegador e perfil, e os navegadores ignorados por estarem abertos
+        """
         if progress_callback:
             progress_callback("Limpando dados dos navegadores...", 0)
         
-        browser_paths = {
-            'Chrome': [
-                os.path.join(os.environ.get('LOCALAPPDATA', ''), 'Google', 'Chrome', 'User Data', 'Default', 'Cache'),
-                os.path.join(os.environ.get('LOCALAPPDATA', ''), 'Google', 'Chrome', 'User Data', 'Default', 'Code Cache'),
-            ],
-            'Edge': [
-                os.path.join(os.environ.get('LOCALAPPDATA', ''), 'Microsoft', 'Edge', 'User Data', 'Default', 'Cache'),
-                os.path.join(os.environ.get('LOCALAPPDATA', ''), 'Microsoft', 'Edge', 'User Data', 'Default', 'Code Cache'),
-            ],
-            'Firefox': [
-                os.path.join(os.environ.get('APPDATA', ''), 'Mozilla', 'Firefox', 'Profiles'),
-            ]
-        }
+        # Cria a execução de quarentena antes, para as threads do pool usarem a mesma
+        if self.use_quarantine:
+            self._get_quarantine_run()
         
-        total_browsers = len(browser_paths)
-        for i, (browser, paths) in enumerate(browser_paths.items()):
-            if progress_callback:
-                progress_callback(f"Limpando {browser}...", (i / total_browsers) * 100)
-            
-            for path in paths:
-                if os.path.exists(path):
-                    try:
-                        if 'Profiles' in path:  # Firefox
-                            self._clean_firefox_profiles(path)
-                        else:
-                            self._clean_directory(path)
-                        self.logger.info(f"Cache do {browser} limpo")
-                    except Exception as e:
-                        self.logger.error(f"Erro ao limpar {browser}: {e}")
-    
-    def _clean_firefox_profiles(self, profiles_path):
-        """Limpa profiles do Firefox"""
-        if not os.path.exists(profiles_path):
-            return
+        result = clean_profiles(discover_profiles(), self._new_engine,
+                                progress_callback=progress_callback)
+        
+        for browser, totals in result['browsers'].items():
+            self.logger.info(f"Cache do {browser} limpo: {Utils.format_size(totals['bytes_freed'])}")
         
-        for profile_dir in os.listdir(profiles_path):
-            profile_path = os.path.join(profiles_path, profile_dir)
-            if os.path.isdir(profile_path):
-                cache_path = os.path.join(profile_path, 'cache2')
-                if os.path.exists(cache_path):
-                    self._clean_directory(cache_path)
+        self.cleaned_files += result['files_deleted']
+        self.cleaned_size += result['bytes_freed']
+        self._finish_quarantine_run()
+        return result
     
     def remove_bloatware(self, progress_callback=None):
         """Remove aplicativos bloatware do Windows"""
@@ -223,6 +232,8 @@ class SystemCleaner:
                     self._clean_directory(log_path)
                 except Exception as e:
                     self.logger.error(f"Erro ao limpar logs em {log_path}: {e}")
+        
+        self._finish_quarantine_run()
     
     def run_disk_cleanup(self, progress_callback=None):
         """Executa limpeza de disco do Windows"""
@@ -248,10 +259,31 @@ class SystemCleaner:
             self.logger.error(f"Erro na limpeza de disco: {e}")
             return False
     
+    def estimate_reclaimable_space(self, refine=True, callback=None):
+        """
+        Estima em menos de um segundo o espaço recuperável em temporários e caches
+        
+        Args:
+            refine: Mede as pastas por completo em segundo plano depois da estimativa
+            callback: Chamado (de outra thread) com cada estimativa refinada
+        
+        Returns:
+            Estimativa inicial com intervalo de confiança (ver ReclaimableSpaceEstimator)
+        """
+        if self.space_estimator is not None:
+            self.space_estimator.stop_refinement()
+        
+        self.space_estimator = ReclaimableSpaceEstimator()
+        estimate = self.space_estimator.estimate()
+        if refine:
+            self.space_estimator.start_refinement(callback)
+        return estimate
+    
     def get_cleanup_summary(self):
         """Retorna resumo da limpeza realizada"""
         return {
             'files_cleaned': self.cleaned_files,
             'space_freed': self.cleaned_size,
-            'space_freed_formatted': Utils.format_size(self.cleaned_size)
+            'space_freed_formatted': Utils.format_size(self.cleaned_size),
+            'reclaimable_estimate': self.space_estimator.get_estimate() if self.space_estimator else None
         }
\ No newline at end of file
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor de Limpeza Unificado
+==========================
+
+Limpa diretórios em uma única passagem de baixo para cima com os.scandir.
+O tamanho de cada arquivo vem do stat do próprio DirEntry, então os bytes
+liberados são exatos sem medir o diretório antes e depois, e as pastas que
+ficam vazias são removidas na mesma passagem.
+
+Funcionalidades:
+- Políticas por idade, tamanho, padrões de nome e lista de preservação
+- Modo de simulação (dry run)
+- Remoção plugável (exclusão direta ou quarentena)
+- Remoção de pastas inteiras de uma vez quando a política aceita tudo
+- Exclusão relativa a descritores de diretório (dir_fd), opcional, onde o sistema suporta
+- Limite de taxa e pausa por carga em segundo plano (BackgroundThrottle)
+- Interrupção cooperativa (prazo esgotado), arquivo a arquivo
+
+Benchmark: python -m optimizer.cleaning_engine --benchmark [arquivos]
+"""
+
+import os
+import sys
+import time
+import shutil
+import fnmatch
+import logging
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .background import BackgroundThrottle, current_throttle
+
+# Exclusão por dir_fd: unlink/rmdir relativos a um descritor e scandir(fd)
+DIR_FD_SUPPORTED = (
+    os.unlink in os.supports_dir_fd
+    and os.rmdir in os.supports_dir_fd
+    and os.open in os.supports_dir_fd
+    and os.scandir in os.supports_fd
+)
+_DIR_OPEN_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0) | getattr(os, 'O_NOFOLLOW', 0)
+
+
+@dataclass
+class CleaningPolicy:
+    """Regras que decidem quais arquivos podem ser removidos"""
+    min_age_seconds: float = 0            # Idade mínima pela data de modificação
+    min_size: int = 0                     # Tamanho mínimo em bytes
+    max_size: Optional[int] = None        # Tamanho máximo em bytes (None = sem limite)
+    include_patterns: List[str] = field(default_factory=list)  # Vazio = todos os arquivos
+    exclude_patterns: List[str] = field(default_factory=list)  # Arquivos e pastas preservados
+    keep_paths: List[str] = field(default_factory=list)        # Caminhos preservados (com conteúdo)
+    remove_empty_dirs: bool = True
+    remove_root: bool = False             # Remove o próprio diretório se ficar vazio
+
+    def __post_init__(self):
+        self._keep = {os.path.normcase(os.path.normpath(path)) for path in self.keep_paths}
+        self._include = [pattern.lower() for pattern in self.include_patterns]
+        self._exclude = [pattern.lower() for pattern in self.exclude_patterns]
+
+    def removes_everything(self) -> bool:
+        """Indica se a política aceita qualquer arquivo (permite remover pastas inteiras)"""
+        return not (self.min_age_seconds or self.min_size or self.max_size is not None
+                    or self._include or self._exclude or self._keep)
+
+    @property
+    def has_keep_paths(self) -> bool:
+        return bool(self._keep)
+
+    def is_kept(self, path: str, name: str) -> bool:
+        """Caminho protegido pela lista de preservação ou por um padrão de exclusão"""
+        if self._keep and os.path.normcase(os.path.normpath(path)) in self._keep:
+            return True
+        lowered = name.lower()
+        return any(fnmatch.fnmatch(lowered, pattern) for pattern in self._exclude)
+
+    def accepts(self, name: str, stat_result: os.stat_result, now: float) -> bool:
+        """Decide se um arquivo pode ser removido"""
+        if self.min_age_seconds and now - stat_result.st_mtime < self.min_age_seconds:
+            return False
+        if stat_result.st_size < self.min_size:
+            return False
+        if self.max_size is not None and stat_result.st_size > self.max_size:
+            return False
+        if self._include:
+            lowered = name.lower()
+            return any(fnmatch.fnmatch(lowered, pattern) for pattern in self._include)
+        return True
+
+
+def _remove_file(path: str, size: int) -> bool:
+    """Remoção padrão: exclusão direta"""
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+class CleaningEngine:
+    """Executa uma política de limpeza sobre um ou mais diretórios"""
+
+    def __init__(self, policy: Optional[CleaningPolicy] = None, dry_run: bool = False,
+                 remove_file: Optional[Callable[[str, int], bool]] = None,
+                 remove_tree: Optional[Callable[[str], Optional[Tuple[int, int]]]] = None,
+                 use_dir_fd: bool = False,
+                 throttle: Optional[BackgroundThrottle] = None,
+                 should_stop: Optional[Callable[[], bool]] = None):
+        """
+        Args:
+            policy: Regras de limpeza (padrão: remove tudo)
+            dry_run: Apenas contabiliza o que seria removido
+            remove_file: Função (caminho, tamanho) -> bool que remove um arquivo
+            remove_tree: Função (caminho) -> (arquivos, bytes) ou None que remove uma
+                pasta inteira; só é usada quando a política aceita todos os arquivos
+            use_dir_fd: Exclui relativo a descritores de diretório (opcional; só tem
+                efeito onde o sistema suporta e com a exclusão direta padrão)
+            throttle: Limite de segundo plano (padrão: o ativo na thread, se houver)
+            should_stop: Consultada a cada pasta e antes de cada exclusão, inclusive
+                durante as esperas do limite; True encerra a limpeza (o que já foi
+                removido continua removido)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.policy = policy or CleaningPolicy()
+        self.dry_run = dry_run
+        self.remove_file = remove_file or _remove_file
+        self.remove_tree = remove_tree
+
+        self.use_dir_fd = (use_dir_fd and DIR_FD_SUPPORTED
+                           and remove_file is None and remove_tree is None)
+        self.throttle = throttle
+        self._throttle = None
+        self.should_stop = should_stop
+        self._stopped = False
+
+    @staticmethod
+    def _new_result() -> Dict[str, Any]:
+        return {
+            'files_deleted': 0,
+            'bytes_freed': 0,
+            'dirs_removed': 0,
+            'files_kept': 0,
+            'files_failed': 0,
+            'time_taken': 0
+        }
+
+    def clean(self, path: str) -> Dict[str, Any]:
+        """
+        Limpa um diretório (ou um único arquivo)
+
+        Returns:
+            Dicionário com arquivos removidos, bytes liberados, pastas removidas,
+            arquivos preservados, falhas e 'interrupted' (parou por should_stop
+            ou porque o limite de segundo plano foi cancelado)
+        """
+        start_time = time.time()
+        result = self._new_result()
+        self._throttle = None if self.dry_run else (self.throttle or current_throttle())
+        self._stopped = False
+
+        if os.path.isfile(path) and not os.path.islink(path):
+            self._clean_single_file(path, result)
+        elif os.path.isdir(path):
+            if self.use_dir_fd:
+                self._clean_tree_fd(path, result)
+            else:
+                self._clean_tree(path, result)
+
+        result['time_taken'] = time.time() - start_time
+        result['interrupted'] = self._stopped
+        return result
+
+    def _stop_requested(self) -> bool:
+        if not self._stopped and self.should_stop is not None and self.should_stop():
+            self._stopped = True
+        return self._stopped
+
+    def clean_many(self, paths: Iterable[str]) -> Dict[str, Any]:
+        """Limpa vários diretórios somando os resultados"""
+        total = self._new_result()
+        for path in paths:
+            if self._stop_requested():
+                break
+            result = self.clean(path)
+            for key in total:
+                total[key] += result[key]
+        return total
+
+    def _may_remove(self, size: int = 0, files: int = 1) -> bool:
+        """
+        Consultado antes de cada exclusão: False se should_stop pediu a parada
+        ou o limite de segundo plano interrompeu a execução (inclusive no meio
+        de uma pausa ou espera de taxa)
+        """
+        if self._stop_requested():
+            return False
+        if self._throttle is None or self._throttle.wait(size, files, self._stop_requested):
+            return True
+        self._stopped = True
+        return False
+
+    def _clean_single_file(self, path: str, result: Dict[str, Any]) -> None:
+        try:
+            file_stat = os.lstat(path)
+        except OSError:
+            return
+        name = os.path.basename(path)
+        if self.policy.is_kept(path, name) or not self.policy.accepts(name, file_stat, time.time()):
+            result['files_kept'] += 1
+        elif not self.dry_run and not self._may_remove(file_stat.st_size):
+            return
+        elif self.dry_run or self.remove_file(path, file_stat.st_size):
+            result['files_deleted'] += 1
+            result['bytes_freed'] += file_stat.st_size
+        else:
+            result['files_failed'] += 1
+
+    def _clean_tree(self, root: str, result: Dict[str, Any]) -> None:
+        """Passagem única de baixo para cima: arquivos primeiro, pastas vazias na volta"""
+        policy = self.policy
+        now = time.time()
+        whole_trees = self.remove_tree is not None and policy.removes_everything() and not self.dry_run
+
+        # (caminho, já listado?) - a pasta volta à pilha depois dos filhos para o rmdir
+        stack = [(root, False)]
+        while stack:
+            directory, expanded = stack.pop()
+
+            if expanded:
+                if policy.remove_empty_dirs and (directory != root or policy.remove_root) and not self.dry_run:
+                    try:
+                        os.rmdir(directory)  # Falha sozinho se não estiver vazia
+                        result['dirs_removed'] += 1
+                    except OSError:
+                        pass
+                continue
+
+            if self._stop_requested():
+                break
+            stack.append((directory, True))
+            try:
+                with os.scandir(directory) as entries:
+                    entries = list(entries)
+            except OSError:
+                continue
+
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if policy.is_kept(entry.path, entry.name):
+                            continue
+                        if whole_trees:
+                            if not self._may_remove(files=0):
+                                break
+                            removed = self.remove_tree(entry.path)
+                            if removed is not None:
+                                result['files_deleted'] += removed[0]
+                                result['bytes_freed'] += removed[1]
+                                result['dirs_removed'] += 1
+                                continue
+                        stack.append((entry.path, False))
+                        continue
+
+                    entry_stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+
+                if policy.is_kept(entry.path, entry.name) or not policy.accepts(entry.name, entry_stat, now):
+                    result['files_kept'] += 1
+                elif not self.dry_run and not self._may_remove(entry_stat.st_size):
+                    break
+                elif self.dry_run or self.remove_file(entry.path, entry_stat.st_size):
+                    result['files_deleted'] += 1
+                    result['bytes_freed'] += entry_stat.st_size
+                else:
+                    result['files_failed'] += 1
+
+    def _clean_tree_fd(self, root: str, result: Dict[str, Any]) -> None:
+        """
+        Mesma passagem de _clean_tree, mas com descritores de diretório
+
+        Cada pasta é aberta uma vez e os arquivos são removidos pelo nome
+        relativo (unlink com dir_fd), sem o sistema resolver o caminho
+        completo a cada arquivo. Ficam abertos no máximo um descritor por
+        nível da árvore.
+        """
+        policy = self.policy
+        now = time.time()
+
+        try:
+            root_fd = os.open(root, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+        except OSError:
+            return
+
+        # Quadro: [descritor, caminho, subpastas pendentes]
+        stack = [[root_fd, root, self._scan_fd(root_fd, root, now, result)]]
+        while stack:
+            frame = stack[-1]
+            fd, directory, subdirs = frame
+            if self._stop_requested():
+                for fd, _, _ in stack:
+                    os.close(fd)
+                return
+            if subdirs:
+                name = subdirs.pop()
+                try:
+                    child_fd = os.open(name, _DIR_OPEN_FLAGS, dir_fd=fd)
+                except OSError:
+                    continue
+                child_path = os.path.join(directory, name)
+                stack.append([child_fd, child_path, self._scan_fd(child_fd, child_path, now, result)])
+                continue
+
+            # Subpastas concluídas: fecha e tenta remover a pasta vazia
+            os.close(fd)
+            stack.pop()
+            if not policy.remove_empty_dirs or self.dry_run:
+                continue
+            try:
+                if stack:
+                    os.rmdir(os.path.basename(directory), dir_fd=stack[-1][0])
+                elif policy.remove_root:
+                    os.rmdir(directory)
+                else:
+                    continue
+                result['dirs_removed'] += 1
+            except OSError:
+                pass
+
+    def _scan_fd(self, fd: int, directory: str, now: float, result: Dict[str, Any]) -> List[str]:
+        """Remove os arquivos aceitos de uma pasta aberta; retorna os nomes das subpastas"""
+        policy = self.policy
+        check_paths = policy.has_keep_paths
+        subdirs = []
+
+        try:
+            with os.scandir(fd) as entries:
+                entries = list(entries)
+        except OSError:
+            return subdirs
+
+        for entry in entries:
+            name = entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not policy.is_kept(os.path.join(directory, name) if check_paths else name, name):
+                        subdirs.append(name)
+                    continue
+                entry_stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+
+            if (policy.is_kept(os.path.join(directory, name) if check_paths else name, name)
+                    or not policy.accepts(name, entry_stat, now)):
+                result['files_kept'] += 1
+                continue
+
+            if not self.dry_run:
+                if not self._may_remove(entry_stat.st_size):
+                    break
+                try:
+                    os.unlink(name, dir_fd=fd)
+                except OSError:
+                    result['files_failed'] += 1
+                    continue
+            result['files_deleted'] += 1
+            result['bytes_freed'] += entry_stat.st_size
+
+        # Invertido para visitar na ordem de listagem (pop do fim)
+        subdirs.reverse()
+        return subdirs
+
+
+def _legacy_clean(directory: str) -> int:
+    """Laço antigo de SystemCleaner._clean_directory (referência do benchmark)"""
+    removed = 0
+    for root, dirs, files in os.walk(directory):
+        for file in files:
+            file_path = os.path.join(root, file)
+            try:
+                os.path.getsize(file_path)
+                os.remove(file_path)
+                removed += 1
+            except OSError:
+                continue
+        for dir_name in dirs:
+            dir_path = os.path.join(root, dir_name)
+            try:
+                if not os.listdir(dir_path):
+                    os.rmdir(dir_path)
+            except OSError:
+                continue
+    return removed
+
+
+def _build_benchmark_tree(root: str, files: int, per_dir: int = 500) -> None:
+    """Cria uma árvore sintética de arquivos pequenos (3 níveis, estilo %TEMP%)"""
+    for index in range(files):
+        directory = os.path.join(root, f"d{index // (per_dir * 20)}", f"s{(index // per_dir) % 20}")
+        if index % per_dir == 0:
+            os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"tmp{index}.tmp"), 'wb') as f:
+            f.write(b'x' * (index % 64))
+
+
+def benchmark(files: int = 100000, base_dir: Optional[str] = None) -> Dict[str, float]:
+    """
+    Compara o laço antigo com o motor (caminhos e dir_fd) em uma árvore sintética
+
+    Returns:
+        Segundos de cada variante
+    """
+    variants = {
+        'laço antigo (os.walk + getsize + remove)': lambda path: _legacy_clean(path),
+        'motor (caminhos)': lambda path: CleaningEngine(use_dir_fd=False).clean(path)['files_deleted'],
+    }
+    if DIR_FD_SUPPORTED:
+        variants['motor (dir_fd)'] = lambda path: CleaningEngine(use_dir_fd=True).clean(path)['files_deleted']
+
+    timings = {}
+    work_dir = tempfile.mkdtemp(prefix='clean_bench_', dir=base_dir)
+    try:
+        for label, run in variants.items():
+            tree = os.path.join(work_dir, 'tree')
+            _build_benchmark_tree(tree, files)
+            start = time.perf_counter()
+            removed = run(tree)
+            timings[label] = time.perf_counter() - start
+            print(f"{label:45s} {timings[label]:7.2f}s  ({removed} arquivos)")
+            shutil.rmtree(tree, ignore_errors=True)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return timings
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        position = sys.argv.index("--benchmark")
+        count = int(sys.argv[position + 1]) if len(sys.argv) > position + 1 else 100000
+        print(f"Benchmark de limpeza com {count} arquivos (dir_fd suportado: {DIR_FD_SUPPORTED})")
+        benchmark(count)
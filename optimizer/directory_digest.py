@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Digests Merkle de Diretórios
+============================
+
+Encontra pastas inteiras duplicadas (cópias de mod packs, backups de
+Documentos, árvores _CommonRedist repetidas) combinando os hashes dos
+arquivos e dos subdiretórios em um digest por diretório.
+
+Funcionalidades:
+- Varredura única montando a árvore de diretórios (nomes e tamanhos)
+- Assinatura estrutural barata (nomes + tamanhos) para descartar pastas únicas
+- Digest Merkle de conteúdo apenas para pastas com assinatura repetida
+- Grupos pela maior subárvore idêntica, sem contar duas vezes pastas aninhadas
+"""
+
+import os
+import hashlib
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class DirectoryNode:
+    """Diretório da árvore analisada"""
+
+    __slots__ = ('path', 'parent', 'files', 'subdirs', 'size', 'file_count',
+                 'modified', 'structure', 'digest')
+
+    def __init__(self, path: str, parent: Optional['DirectoryNode']):
+        self.path = path
+        self.parent = parent
+        self.files = []     # (nome, tamanho)
+        self.subdirs = []   # DirectoryNode
+        self.size = 0
+        self.file_count = 0
+        self.modified = 0.0
+        self.structure = None
+        self.digest = None
+
+
+def _combine(entries: List[tuple]) -> str:
+    """Digest de uma lista de entradas (tipo, nome, valor), independente da ordem de listagem"""
+    digest = hashlib.blake2b(digest_size=16)
+    for kind, name, value in sorted(entries):
+        digest.update(f"{kind}\0{name}\0{value}\n".encode('utf-8', 'surrogateescape'))
+    return digest.hexdigest()
+
+
+def build_directory_tree(roots: Iterable[str]) -> List[DirectoryNode]:
+    """
+    Varre os diretórios e monta a árvore com tamanhos e assinaturas estruturais
+
+    Returns:
+        Lista de nós em pós-ordem (filhos antes dos pais)
+    """
+    preorder = []
+    stack = [DirectoryNode(os.path.normpath(root), None)
+             for root in reversed(list(roots)) if os.path.isdir(root)]
+
+    while stack:
+        node = stack.pop()
+        preorder.append(node)
+
+        try:
+            with os.scandir(node.path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            child = DirectoryNode(entry.path, node)
+                            node.subdirs.append(child)
+                        elif entry.is_file(follow_symlinks=False):
+                            entry_stat = entry.stat(follow_symlinks=False)
+                            node.files.append((entry.name, entry_stat.st_size))
+                            node.size += entry_stat.st_size
+                            node.modified = max(node.modified, entry_stat.st_mtime)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+        node.file_count = len(node.files)
+        stack.extend(reversed(node.subdirs))
+
+    # Pós-ordem: agrega tamanhos e assinaturas dos filhos nos pais
+    postorder = preorder[::-1]
+    for node in postorder:
+        entries = [('f', name, size) for name, size in node.files]
+        for child in node.subdirs:
+            node.size += child.size
+            node.file_count += child.file_count
+            node.modified = max(node.modified, child.modified)
+            entries.append(('d', os.path.basename(child.path), child.structure))
+        node.structure = _combine(entries)
+
+    return postorder
+
+
+def structural_candidates(nodes: Iterable[DirectoryNode]) -> List[DirectoryNode]:
+    """
+    Diretórios cuja estrutura (nomes e tamanhos) se repete em outro lugar
+
+    Se dois diretórios têm a mesma assinatura, os subdiretórios deles também
+    têm, então a lista continua em pós-ordem e fechada para os filhos.
+    """
+    nodes = [node for node in nodes if node.file_count]
+    counts = defaultdict(int)
+    for node in nodes:
+        counts[node.structure] += 1
+    return [node for node in nodes if counts[node.structure] > 1]
+
+
+def compute_digests(nodes: Iterable[DirectoryNode], file_hashes: Dict[str, str]) -> None:
+    """
+    Calcula o digest Merkle de conteúdo dos nós (em pós-ordem)
+
+    Um nó fica sem digest se algum arquivo dele não pôde ser lido ou se
+    algum subdiretório ficou sem digest.
+    """
+    for node in nodes:
+        entries = []
+        for name, _ in node.files:
+            file_hash = file_hashes.get(os.path.join(node.path, name))
+            if not file_hash:
+                break
+            entries.append(('f', name, file_hash))
+        else:
+            for child in node.subdirs:
+                if child.file_count and not child.digest:
+                    break
+                entries.append(('d', os.path.basename(child.path), child.digest or ''))
+            else:
+                node.digest = _combine(entries)
+                continue
+        node.digest = None
+
+
+def _inside(path: str, roots: Iterable[str]) -> Optional[str]:
+    """Pasta de roots que contém path (ou é o próprio path), se houver"""
+    for root in roots:
+        if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+            return root
+    return None
+
+
+def group_identical_directories(nodes: Iterable[DirectoryNode],
+                                min_size: int = 0) -> List[Dict[str, Any]]:
+    """
+    Agrupa diretórios com o mesmo digest de conteúdo
+
+    Os grupos são montados da maior subárvore idêntica para a menor. Pastas
+    dentro de pastas já listadas saem do grupo: se ficam dentro da pasta
+    mantida, continuam como original (a cópia segue existindo); o espaço
+    recuperável conta só as cópias que sobram. Pastas que contêm pastas já
+    listadas também saem, para o mesmo espaço não ser contado duas vezes.
+
+    Returns:
+        Lista de grupos no formato {'digest', 'directories', 'original',
+        'duplicates', 'size', 'file_count', 'total_size'}, do maior espaço
+        recuperável para o menor
+    """
+    by_digest = defaultdict(list)
+    for node in nodes:
+        if node.digest and node.size >= min_size:
+            by_digest[node.digest].append(node)
+
+    candidates = [members for members in by_digest.values() if len(members) > 1]
+    # Subárvores maiores primeiro; em empate (pasta que só contém a subpasta
+    # duplicada) a mais externa vem primeiro
+    candidates.sort(key=lambda members: (members[0].size, -members[0].path.count(os.sep)),
+                    reverse=True)
+
+    kept = []     # Pastas mantidas dos grupos já listados
+    removed = []  # Pastas marcadas como duplicadas
+
+    def describe(node):
+        return {'path': node.path, 'size': node.size, 'file_count': node.file_count,
+                'modified': node.modified}
+
+    groups = []
+    for members in candidates:
+        inside_kept = [node for node in members if _inside(node.path, kept)]
+        free = [node for node in members
+                if not _inside(node.path, kept) and not _inside(node.path, removed)
+                and not any(_inside(path, [node.path]) for path in kept + removed)]
+
+        # Ordena por data de modificação (mantém a cópia mais antiga)
+        free.sort(key=lambda node: node.modified)
+        if inside_kept:
+            original = min(inside_kept, key=lambda node: node.modified)
+            duplicates = free
+        else:
+            if len(free) < 2:
+                continue
+            original, duplicates = free[0], free[1:]
+        if not duplicates:
+            continue
+
+        kept.append(original.path)
+        removed.extend(node.path for node in duplicates)
+        directories = [describe(original)] + [describe(node) for node in duplicates]
+        groups.append({
+            'digest': members[0].digest,
+            'directories': directories,
+            'original': directories[0],
+            'duplicates': directories[1:],
+            'size': members[0].size,
+            'file_count': members[0].file_count,
+            'total_size': members[0].size * len(duplicates)
+        })
+
+    groups.sort(key=lambda group: group['total_size'], reverse=True)
+    return groups
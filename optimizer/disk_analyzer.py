@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analisador de Uso do Disco
+==========================
+
+Mostra onde o espaço de um volume está sendo usado, pasta por pasta.
+A varredura lista vários diretórios ao mesmo tempo (os.scandir libera o
+GIL durante a listagem) e soma os tamanhos de baixo para cima em uma
+árvore compacta: cada pasta é uma posição em arrays de inteiros com o
+índice da pasta pai, sem um dicionário por nó.
+
+Funcionalidades:
+- Varredura paralela com os.scandir pelas filas por disco, sem seguir links simbólicos
+- Tamanho e quantidade de arquivos próprios e totais de cada pasta
+- Árvore em cache: navegar pelas subpastas nunca varre de novo
+- Ranking das maiores pastas, sem repetir a cadeia de pastas pai
+- Tamanho de qualquer pasta já analisada, para uso pelos limpadores
+- Pastas já no inventário de arquivos compartilhado não são varridas de novo
+"""
+
+import os
+import time
+import heapq
+import logging
+import threading
+from array import array
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .utils import Utils
+from .file_inventory import FileInventory, get_file_inventory
+from .io_scheduler import IOScheduler, get_io_scheduler
+
+
+def _list_directory(path: str) -> Tuple[int, int, List[Tuple[str, str]], bool]:
+    """Bytes e arquivos próprios de uma pasta e suas subpastas (nome, caminho)"""
+    size = 0
+    files = 0
+    subdirectories = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append((entry.name, entry.path))
+                    elif entry.is_file(follow_symlinks=False):
+                        size += entry.stat(follow_symlinks=False).st_size
+                        files += 1
+                except OSError:
+                    continue
+    except OSError:
+        return 0, 0, [], False
+    return size, files, subdirectories, True
+
+
+class DiskUsageTree:
+    """Árvore de pastas em arrays: a pasta i tem pai parent[i] (raiz = 0, pai -1)"""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.names: List[str] = [self.root]
+        self.parent = array('i', [-1])
+        self.own_bytes = array('q', [0])
+        self.own_files = array('q', [0])
+        self.total_bytes = array('q')
+        self.total_files = array('q')
+        self.depth = array('i', [0])
+        self._child_start = array('i')
+        self._child_index = array('i')
+        self.errors = 0
+        self.scanned_at = 0.0
+        self.duration = 0.0
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _add(self, parent: int, name: str) -> int:
+        self.names.append(name)
+        self.parent.append(parent)
+        self.own_bytes.append(0)
+        self.own_files.append(0)
+        self.depth.append(self.depth[parent] + 1)
+        return len(self.names) - 1
+
+    @classmethod
+    def from_inventory(cls, inventory: FileInventory, root: str) -> Optional['DiskUsageTree']:
+        """Árvore de uma pasta já coberta pelo inventário de arquivos (sem varrer)"""
+        tree = cls(root)
+        snapshot = inventory.subtree_snapshot(tree.root)
+        if snapshot is None:
+            return None
+        tree.own_bytes[0] = snapshot['bytes'][0]
+        tree.own_files[0] = snapshot['files'][0]
+        # No retrato as pastas também vêm depois da pasta pai, com root no índice 0
+        for index in range(1, len(snapshot['names'])):
+            child = tree._add(snapshot['parents'][index], snapshot['names'][index])
+            tree.own_bytes[child] = snapshot['bytes'][index]
+            tree.own_files[child] = snapshot['files'][index]
+        tree._finish()
+        tree.scanned_at = time.time()
+        return tree
+
+    def _finish(self) -> None:
+        """Soma de baixo para cima e monta o índice de filhos"""
+        count = len(self.names)
+        self.total_bytes = array('q', self.own_bytes)
+        self.total_files = array('q', self.own_files)
+        # Filhos sempre têm índice maior que o pai: basta percorrer de trás para frente
+        for index in range(count - 1, 0, -1):
+            parent = self.parent[index]
+            self.total_bytes[parent] += self.total_bytes[index]
+            self.total_files[parent] += self.total_files[index]
+
+        start = array('i', [0]) * (count + 1)
+        for index in range(1, count):
+            start[self.parent[index] + 1] += 1
+        for index in range(count):
+            start[index + 1] += start[index]
+        children = array('i', [0]) * max(0, count - 1)
+        position = array('i', start)
+        for index in range(1, count):
+            parent = self.parent[index]
+            children[position[parent]] = index
+            position[parent] += 1
+        self._child_start = start
+        self._child_index = children
+
+    def children(self, index: int) -> List[int]:
+        """Índices das subpastas, da maior para a menor"""
+        items = self._child_index[self._child_start[index]:self._child_start[index + 1]]
+        return sorted(items, key=lambda child: self.total_bytes[child], reverse=True)
+
+    def iter_subtree(self, index: int = 0) -> Iterator[int]:
+        """Índices da pasta e de todas as subpastas"""
+        stack = [index]
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(self._child_index[self._child_start[current]:self._child_start[current + 1]])
+
+    def path(self, index: int) -> str:
+        parts = []
+        while index > 0:
+            parts.append(self.names[index])
+            index = self.parent[index]
+        return os.path.join(self.root, *reversed(parts))
+
+    def find(self, path: str) -> Optional[int]:
+        """Índice de uma pasta da árvore, ou None"""
+        path = os.path.abspath(path)
+        root = os.path.normcase(self.root)
+        target = os.path.normcase(path)
+        if target == root:
+            return 0
+        if not target.startswith(root.rstrip(os.sep) + os.sep):
+            return None
+
+        index = 0
+        for part in os.path.relpath(target, root).split(os.sep):
+            start, end = self._child_start[index], self._child_start[index + 1]
+            index = next((child for child in self._child_index[start:end]
+                          if os.path.normcase(self.names[child]) == part), None)
+            if index is None:
+                return None
+        return index
+
+    def node(self, index: int) -> Dict[str, Any]:
+        """Dados de uma pasta"""
+        parent = self.parent[index]
+        reference = self.total_bytes[parent] if parent >= 0 else self.total_bytes[index]
+        return {
+            'path': self.path(index),
+            'name': self.names[index] if index else self.root,
+            'bytes': self.total_bytes[index],
+            'files': self.total_files[index],
+            'own_bytes': self.own_bytes[index],
+            'own_files': self.own_files[index],
+            'percent': self.total_bytes[index] / reference * 100 if reference else 0.0,
+            'bytes_formatted': Utils.format_size(self.total_bytes[index])
+        }
+
+    def largest_folders(self, limit: int = 20, index: int = 0, max_depth: Optional[int] = None,
+                        dominance: float = 0.9) -> List[Dict[str, Any]]:
+        """
+        Maiores pastas abaixo de index
+
+        Uma pasta cuja maior subpasta tem pelo menos `dominance` do seu total
+        fica de fora: o espaço está na subpasta, que já aparece no ranking.
+        """
+        base_depth = self.depth[index]
+        candidates = []
+        for current in self.iter_subtree(index):
+            if current == index:
+                continue
+            relative_depth = self.depth[current] - base_depth
+            if max_depth is not None and relative_depth > max_depth:
+                continue
+            total = self.total_bytes[current]
+            if not total:
+                continue
+            # No limite de profundidade as subpastas não entram, então a pasta fica
+            if max_depth is None or relative_depth < max_depth:
+                children = self._child_index[self._child_start[current]:self._child_start[current + 1]]
+                biggest = max((self.total_bytes[child] for child in children), default=0)
+                if biggest >= total * dominance:
+                    continue
+            candidates.append(current)
+
+        ranked = heapq.nlargest(limit, candidates, key=lambda current: self.total_bytes[current])
+        return [self.node(current) for current in ranked]
+
+
+def scan_tree(root: str, progress_callback: Optional[Callable[[str, float], None]] = None,
+              io_scheduler: Optional[IOScheduler] = None) -> DiskUsageTree:
+    """
+    Varre uma pasta ou volume e monta a árvore de uso
+
+    Args:
+        root: Pasta raiz
+        progress_callback: Função (mensagem, pastas lidas) chamada periodicamente
+        io_scheduler: Filas por disco que listam as pastas (padrão: o agendador compartilhado)
+    """
+    scheduler = io_scheduler or get_io_scheduler()
+    tree = DiskUsageTree(root)
+    started = time.monotonic()
+    listed = 0
+
+    # Cada pasta vai para a fila do seu disco (pontos de montagem internos incluídos)
+    pending = {scheduler.submit(tree.root, _list_directory, tree.root): 0}
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            index = pending.pop(future)
+            size, files, subdirectories, readable = future.result()
+            tree.own_bytes[index] = size
+            tree.own_files[index] = files
+            if not readable:
+                tree.errors += 1
+            for name, path in subdirectories:
+                child = tree._add(index, name)
+                pending[scheduler.submit(path, _list_directory, path)] = child
+            listed += 1
+            if progress_callback and listed % 500 == 0:
+                progress_callback(f"{listed} pastas analisadas", listed)
+
+    tree._finish()
+    tree.scanned_at = time.time()
+    tree.duration = time.monotonic() - started
+    return tree
+
+
+def default_root() -> str:
+    """Raiz do volume do sistema"""
+    if os.name == 'nt':
+        return os.environ.get('SystemDrive', 'C:') + os.sep
+    return os.sep
+
+
+class DiskAnalyzer:
+    """Analisador com cache das árvores já varridas"""
+
+    def __init__(self, cache_ttl: float = 1800, io_scheduler: Optional[IOScheduler] = None):
+        """
+        Args:
+            cache_ttl: Segundos em que uma árvore varrida continua válida
+            io_scheduler: Filas por disco usadas na varredura (padrão: o agendador compartilhado)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.io_scheduler = io_scheduler
+        self.cache_ttl = cache_ttl
+        self._trees: Dict[str, DiskUsageTree] = {}
+        self._lock = threading.Lock()
+
+    def analyze(self, root: Optional[str] = None, refresh: bool = False,
+                progress_callback: Optional[Callable[[str, float], None]] = None) -> DiskUsageTree:
+        """Árvore de uso de root (do cache, se ainda válida)"""
+        root = os.path.abspath(root or default_root())
+        if not refresh:
+            cached = self._cached(root)
+            if cached is not None:
+                return cached[0]
+
+        tree = None
+        inventory = get_file_inventory()
+        if not refresh and inventory.covers(root):
+            tree = DiskUsageTree.from_inventory(inventory, root)
+        if tree is None:
+            tree = scan_tree(root, progress_callback, self.io_scheduler)
+        self.logger.info(
+            f"Uso do disco em {root}: {Utils.format_size(tree.total_bytes[0])} em "
+            f"{len(tree)} pastas ({tree.duration:.1f}s)"
+        )
+        with self._lock:
+            # A nova árvore substitui as que ela contém
+            self._trees = {key: cached for key, cached in self._trees.items()
+                           if tree.find(cached.root) is None}
+            self._trees[os.path.normcase(root)] = tree
+        return tree
+
+    def _cached(self, path: str) -> Optional[Tuple[DiskUsageTree, int]]:
+        """Árvore válida que contém path e o índice da pasta nela"""
+        now = time.time()
+        with self._lock:
+            trees = list(self._trees.values())
+        for tree in trees:
+            if now - tree.scanned_at > self.cache_ttl:
+                continue
+            index = tree.find(path)
+            if index is not None:
+                return tree, index
+        return None
+
+    def children(self, path: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Subpastas de path, da maior para a menor (varre só se ainda não estiver em cache)"""
+        cached = self._cached(os.path.abspath(path))
+        if cached is None:
+            tree, index = self.analyze(path), 0
+        else:
+            tree, index = cached
+        return [tree.node(child) for child in tree.children(index)[:limit]]
+
+    def largest_folders(self, root: Optional[str] = None, limit: int = 20,
+                        max_depth: Optional[int] = None, refresh: bool = False,
+                        progress_callback: Optional[Callable[[str, float], None]] = None
+                        ) -> List[Dict[str, Any]]:
+        """Ranking das maiores pastas abaixo de root (que pode estar dentro de uma árvore em cache)"""
+        root = os.path.abspath(root or default_root())
+        cached = None if refresh else self._cached(root)
+        if cached is None:
+            tree, index = self.analyze(root, refresh, progress_callback), 0
+        else:
+            tree, index = cached
+        return tree.largest_folders(limit, index, max_depth)
+
+    def size_of(self, path: str) -> Optional[Dict[str, Any]]:
+        """Tamanho de uma pasta já analisada, sem varrer (None se não estiver em cache)"""
+        cached = self._cached(os.path.abspath(path))
+        if cached is None:
+            return None
+        tree, index = cached
+        return tree.node(index)
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Descarta as árvores que contêm path (ou todas)"""
+        with self._lock:
+            if path is None:
+                self._trees.clear()
+            else:
+                self._trees = {key: tree for key, tree in self._trees.items()
+                               if tree.find(path) is None}
+
+
+_default_analyzer = None
+_default_analyzer_lock = threading.Lock()
+
+
+def get_disk_analyzer() -> DiskAnalyzer:
+    """Analisador compartilhado (o cache vale para a interface e os limpadores)"""
+    global _default_analyzer
+    with _default_analyzer_lock:
+        if _default_analyzer is None:
+            _default_analyzer = DiskAnalyzer()
+        return _default_analyzer
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline de Confirmação de Duplicatas
+=====================================
+
+Recebe arquivos que já colidem em tamanho e os leva pelos estágios de
+hash parcial e hash completo, entregando grupos de duplicatas assim que
+são comprovados.
+
+Funcionalidades:
+- Hash parcial (início + fim) e hash completo sob demanda
+- Reaproveitamento do índice persistente de hashes
+- Execução no pool de hash paralelo, sem bloquear a varredura
+- Liberação da memória de tamanhos já concluídos
+"""
+
+import os
+from collections import defaultdict, deque
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from .hash_engine import ParallelHasher, job_cost
+
+
+class DuplicatePipeline:
+    """Estágios de hash parcial e completo alimentados incrementalmente"""
+
+    def __init__(self, hasher: ParallelHasher, stats: Dict[str, Any],
+                 hash_index=None, progress_callback: Optional[Callable] = None):
+        """
+        Args:
+            hasher: Pool de hash
+            stats: Dicionário de estatísticas da análise (atualizado no lugar)
+            hash_index: FileHashIndex opcional
+            progress_callback: Função (mensagem, porcentagem)
+        """
+        self.hasher = hasher
+        self.stats = stats
+        self.hash_index = hash_index
+        self.progress_callback = progress_callback
+        self.small_file_limit = 2 * hasher.partial_block
+
+        self.partial_buckets = defaultdict(list)  # (tamanho, hash parcial) -> arquivos
+        self.full_buckets = defaultdict(list)     # (tamanho, hash completo) -> arquivos
+        self.resolved = deque()                   # (file_info, tipo, hash) prontos para processar
+
+        # Controle de tamanhos concluídos (usado para liberar memória)
+        self.outstanding = defaultdict(int)
+        self.sealed_sizes = set()
+        self.keys_by_size = defaultdict(set)
+
+        self.groups_found = 0
+        self.bytes_scheduled = 0
+        self.bytes_done = 0
+        self.last_progress = 0.0
+
+    def report(self, message: str) -> None:
+        """Reporta progresso estimado pelos bytes descobertos até agora, sem recuar"""
+        if not self.progress_callback:
+            return
+        estimate = (self.bytes_done / self.bytes_scheduled) * 99 if self.bytes_scheduled else 0
+        self.last_progress = max(self.last_progress, min(estimate, 99))
+        self.progress_callback(message, self.last_progress)
+
+    def add_candidate(self, file_info: Dict[str, Any]) -> None:
+        """Envia para hash parcial um arquivo que tem o mesmo tamanho de outro"""
+        self.stats['size_candidates'] += 1
+        self._request(file_info, 'partial')
+
+    def seal_size(self, size: int) -> None:
+        """
+        Indica que não chegarão mais arquivos deste tamanho
+
+        Quando os hashes pendentes do tamanho terminam, os grupos intermediários
+        dele são descartados para liberar memória.
+        """
+        self.sealed_sizes.add(size)
+        self._release_if_done(size)
+
+    def poll(self) -> Iterator[Dict[str, Any]]:
+        """Processa os resultados já prontos, sem bloquear"""
+        if self.hasher.is_saturated():
+            yield from self._process([self.hasher.next_result()])
+        yield from self._process(self.hasher.ready())
+
+    def finish(self) -> Iterator[Dict[str, Any]]:
+        """Aguarda todos os hashes pendentes (podem gerar novos hashes completos)"""
+        while self.hasher.pending_count() or self.resolved:
+            yield from self._process(self.hasher.drain())
+
+    def group_count(self) -> int:
+        """Número de grupos de duplicatas encontrados (inclusive os já liberados)"""
+        return self.groups_found
+
+    def _request(self, file_info: Dict[str, Any], kind: str) -> None:
+        """Resolve o hash pelo índice ou envia o arquivo para o pool"""
+        if 'stat' not in file_info:
+            try:
+                file_info['stat'] = os.stat(file_info['path'])
+            except OSError:
+                return
+
+        cost = job_cost(file_info['size'], kind, self.hasher.partial_block)
+        self.bytes_scheduled += cost
+        self.outstanding[file_info['size']] += 1
+
+        cached = self.hash_index.lookup(file_info['path'], file_info['stat'], kind) if self.hash_index else None
+        if cached:
+            self.bytes_done += cost
+            self.resolved.append((file_info, kind, cached))
+            return
+
+        self.hasher.submit((file_info, kind, cost), file_info['path'], file_info['size'], kind)
+
+    def _store(self, file_info: Dict[str, Any], kind: str, file_hash: str) -> None:
+        """Grava no índice o hash recém-calculado"""
+        if not self.hash_index:
+            return
+        if kind == 'partial':
+            # Arquivos pequenos são lidos por inteiro: parcial == completo
+            full_hash = file_hash if file_info['size'] <= self.small_file_limit else None
+            self.hash_index.store(file_info['path'], file_info['stat'], file_hash, full_hash)
+        else:
+            self.hash_index.store(file_info['path'], file_info['stat'], full_hash=file_hash)
+
+    def _handle(self, file_info: Dict[str, Any], kind: str, file_hash: str) -> Optional[Dict[str, Any]]:
+        """Avança um arquivo para o próximo estágio; retorna o grupo se houver duplicata"""
+        size = file_info['size']
+
+        if kind == 'partial':
+            if size > self.small_file_limit:
+                key = (size, file_hash)
+                bucket = self.partial_buckets[key]
+                bucket.append(file_info)
+                self.keys_by_size[size].add(key)
+                if len(bucket) == 2:
+                    self.stats['partial_candidates'] += 2
+                    self.stats['full_candidates'] += 2
+                    self._request(bucket[0], 'full')
+                    self._request(bucket[1], 'full')
+                elif len(bucket) > 2:
+                    self.stats['partial_candidates'] += 1
+                    self.stats['full_candidates'] += 1
+                    self._request(file_info, 'full')
+                return None
+
+            # Colisão de hash parcial em arquivo pequeno já é duplicata
+            previous = len(self.full_buckets.get((size, file_hash), ()))
+            if previous:
+                self.stats['partial_candidates'] += 2 if previous == 1 else 1
+
+        # Estágio final: o stat só era necessário para o índice
+        file_info.pop('stat', None)
+
+        key = (size, file_hash)
+        bucket = self.full_buckets[key]
+        bucket.append(file_info)
+        self.keys_by_size[size].add(key)
+        if len(bucket) < 2:
+            return None
+        if len(bucket) == 2:
+            self.groups_found += 1
+
+        # Ordena por data de modificação (mantém o mais antigo)
+        file_list = sorted(bucket, key=lambda x: x['modified'])
+        return {
+            'hash': file_hash,
+            'algorithm': self.stats['algorithm'],
+            'files': file_list,
+            'original': file_list[0],
+            'duplicates': file_list[1:],
+            'total_size': sum(f['size'] for f in file_list[1:])
+        }
+
+    def _drain_resolved(self) -> Iterator[Dict[str, Any]]:
+        """Processa hashes resolvidos (do pool ou do índice)"""
+        while self.resolved:
+            file_info, kind, file_hash = self.resolved.popleft()
+            group = self._handle(file_info, kind, file_hash)
+
+            size = file_info['size']
+            self.outstanding[size] -= 1
+            self._release_if_done(size)
+
+            if group:
+                yield group
+
+    def _process(self, results: Iterable) -> Iterator[Dict[str, Any]]:
+        """Processa resultados do pool, entregando grupos comprovados"""
+        for (file_info, kind, cost), file_hash, bytes_read in results:
+            self.bytes_done += cost
+            self.stats['bytes_read'][kind] += bytes_read
+            if file_hash:
+                self._store(file_info, kind, file_hash)
+                self.resolved.append((file_info, kind, file_hash))
+            else:
+                self.outstanding[file_info['size']] -= 1
+                self._release_if_done(file_info['size'])
+
+            self.report(f"Hash {'parcial' if kind == 'partial' else 'completo'}: "
+                        f"{os.path.basename(file_info['path'])}")
+            yield from self._drain_resolved()
+
+        yield from self._drain_resolved()
+
+    def _release_if_done(self, size: int) -> None:
+        """Descarta os grupos de um tamanho selado sem hashes pendentes"""
+        if size not in self.sealed_sizes or self.outstanding.get(size, 0) > 0:
+            return
+
+        for key in self.keys_by_size.pop(size, ()):
+            self.partial_buckets.pop(key, None)
+            self.full_buckets.pop(key, None)
+        self.outstanding.pop(size, None)
+        self.sealed_sizes.discard(size)
+
+
+def collect_groups(groups: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Consolida grupos entregues várias vezes (mesmo 'hash') na versão final"""
+    final = {}
+    for group in groups:
+        final[(group['original']['size'], group['hash'])] = group
+    return list(final.values())
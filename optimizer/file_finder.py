@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Maiores Arquivos e Arquivos Esquecidos
+======================================
+
+Encontra os maiores arquivos e os arquivos há mais tempo sem uso em uma
+única passagem pelas pastas (mesma varredura da busca de duplicatas).
+Cada categoria guarda só os K melhores candidatos em um heap de mínimo,
+então a memória não cresce com a quantidade de arquivos varridos.
+
+Funcionalidades:
+- Maiores arquivos (tamanho)
+- Arquivos esquecidos (último uso = maior entre modificação e acesso)
+- Tamanho mínimo e pastas ignoradas
+- Mesma consulta sobre o inventário compartilhado, sem nova varredura
+- Resultado no formato aceito por AdvancedCleaner.remove_files
+"""
+
+import os
+import heapq
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .fs_walk import iter_files
+from .utils import Utils
+from .file_inventory import FileInventory
+
+CATEGORIES = ('largest', 'oldest')
+
+
+class TopK:
+    """Os K itens de maior chave vistos até agora (heap de mínimo com K posições)"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._sequence = 0  # Desempate: nunca compara os itens
+
+    def push(self, key: float, item: Any) -> None:
+        self._sequence += 1
+        if len(self._heap) < self.limit:
+            heapq.heappush(self._heap, (key, self._sequence, item))
+        elif key > self._heap[0][0]:
+            heapq.heapreplace(self._heap, (key, self._sequence, item))
+
+    def threshold(self) -> Optional[float]:
+        """Menor chave que ainda entra (None enquanto o heap não está cheio)"""
+        return self._heap[0][0] if len(self._heap) >= self.limit else None
+
+    def items(self) -> List[Any]:
+        """Itens da maior chave para a menor"""
+        return [item for _, _, item in sorted(self._heap, reverse=True)]
+
+
+def _file_info(path: str, size: int, modified: float, accessed: float, now: float) -> Dict[str, Any]:
+    last_used = max(modified, accessed)
+    return {
+        'path': path,
+        'size': size,
+        'size_formatted': Utils.format_size(size),
+        'modified': datetime.fromtimestamp(modified).isoformat(timespec='seconds'),
+        'last_used': datetime.fromtimestamp(last_used).isoformat(timespec='seconds'),
+        'age_days': max(0, int((now - last_used) // 86400))
+    }
+
+
+def find_top_files(roots: Iterable[str], limit: int = 50, min_size: int = 1024 * 1024,
+                   categories: Iterable[str] = CATEGORIES, exclude: Iterable[str] = (),
+                   progress_callback: Optional[Callable[[str, float], None]] = None) -> Dict[str, Any]:
+    """
+    Varre as pastas uma vez e guarda os K maiores e os K mais antigos
+
+    Args:
+        roots: Pastas analisadas
+        limit: Quantidade por categoria
+        min_size: Arquivos menores são ignorados (também nos esquecidos)
+        categories: 'largest' e/ou 'oldest'
+        exclude: Pastas que não entram na análise
+        progress_callback: Função (mensagem, arquivos varridos)
+
+    Returns:
+        Dicionário com uma lista por categoria (maior primeiro / mais antigo
+        primeiro), 'files_scanned' e 'bytes_scanned'
+    """
+    categories = [category for category in categories if category in CATEGORIES]
+    heaps = {category: TopK(limit) for category in categories}
+    excluded = tuple(os.path.normcase(os.path.abspath(path)).rstrip(os.sep) + os.sep for path in exclude)
+    now = time.time()
+    files_scanned = 0
+    bytes_scanned = 0
+
+    for entry in iter_files(roots):
+        if excluded and os.path.normcase(entry.path).startswith(excluded):
+            continue
+        try:
+            stat = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        files_scanned += 1
+        bytes_scanned += stat.st_size
+        if progress_callback and files_scanned % 5000 == 0:
+            progress_callback(f"{files_scanned} arquivos analisados", files_scanned)
+        if stat.st_size < min_size:
+            continue
+
+        # Só monta o dicionário se o arquivo entra em algum heap
+        info = None
+        last_used = max(stat.st_mtime, stat.st_atime)
+        for category, heap in heaps.items():
+            key = stat.st_size if category == 'largest' else -last_used
+            threshold = heap.threshold()
+            if threshold is not None and key <= threshold:
+                continue
+            if info is None:
+                info = _file_info(entry.path, stat.st_size, stat.st_mtime, stat.st_atime, now)
+            heap.push(key, info)
+
+    result = {category: heap.items() for category, heap in heaps.items()}
+    result.update({'files_scanned': files_scanned, 'bytes_scanned': bytes_scanned})
+    return result
+
+
+def top_files_from_inventory(inventory: FileInventory, roots: Iterable[str], limit: int = 50,
+                             min_size: int = 1024 * 1024, categories: Iterable[str] = CATEGORIES,
+                             exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """Mesmo resultado de find_top_files, consultando um inventário que já cobre as pastas"""
+    roots = list(roots)
+    now = time.time()
+    totals = inventory.totals(roots, exclude=exclude)
+    candidates = inventory.select(roots, min_size=min_size, exclude=exclude)
+
+    result = {}
+    for category in categories:
+        if category not in CATEGORIES:
+            continue
+        result[category] = []
+        for index in inventory.top(candidates, limit, by='size' if category == 'largest' else 'oldest'):
+            entry = inventory.entry(index)
+            result[category].append(_file_info(entry['path'], entry['size'], entry['modified'],
+                                               entry['accessed'], now))
+    result.update({'files_scanned': totals['files'], 'bytes_scanned': totals['bytes']})
+    return result
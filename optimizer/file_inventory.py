@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Inventário de Arquivos em Colunas
+=================================
+
+Uma única varredura das pastas, compartilhada pelos recursos que antes
+percorriam o disco cada um por conta própria (duplicatas, arquivos
+grandes, uso do disco, tamanho e ícone dos jogos).
+
+Os caminhos ficam internados em uma tabela de pastas (índice da pasta
+pai + nome) e os arquivos em colunas: pasta, nome, tamanho, datas,
+extensão e flags em arrays tipados. Somas por pasta, extensão ou idade
+viram operações sobre as colunas (bincount e máscaras com NumPy, quando
+instalado) em vez de laços sobre listas de dicionários.
+
+Funcionalidades:
+- Varredura paralela com os.scandir pelas filas por disco, sem seguir links simbólicos
+- Pastas sempre depois da pasta pai; arquivos de uma pasta contíguos
+- Consultas por subárvore, tamanho, extensão e idade
+- Totais por pasta, por extensão e por faixa de idade
+- Retrato consistente de uma subárvore de pastas (usado pelo analisador de disco)
+- Arquivos removidos pelos limpadores saem das consultas sem nova varredura
+- NumPy opcional (módulo array como alternativa)
+"""
+
+import os
+import time
+import heapq
+import logging
+import threading
+from array import array
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .io_scheduler import IOScheduler, get_io_scheduler
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Flags por arquivo
+FLAG_HIDDEN = 1
+FLAG_SYSTEM = 2
+FLAG_READONLY = 4
+FLAG_REMOVED = 8  # Removido por um limpador depois da varredura
+
+_WINDOWS_HIDDEN = 0x2
+_WINDOWS_SYSTEM = 0x4
+_WINDOWS_READONLY = 0x1
+
+DEFAULT_AGE_BUCKETS = (7, 30, 90, 365)
+
+
+def _flags(name: str, stat: os.stat_result) -> int:
+    attributes = getattr(stat, 'st_file_attributes', None)
+    if attributes is None:
+        flags = FLAG_HIDDEN if name.startswith('.') else 0
+        return flags | (0 if stat.st_mode & 0o200 else FLAG_READONLY)
+    return ((FLAG_HIDDEN if attributes & _WINDOWS_HIDDEN else 0)
+            | (FLAG_SYSTEM if attributes & _WINDOWS_SYSTEM else 0)
+            | (FLAG_READONLY if attributes & _WINDOWS_READONLY else 0))
+
+
+def _list_directory(path: str) -> Tuple[List[Tuple[str, int, float, float, int]], List[str]]:
+    """Arquivos (nome, tamanho, mtime, atime, flags) e nomes das subpastas"""
+    files = []
+    subdirectories = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.name)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        files.append((entry.name, stat.st_size, stat.st_mtime, stat.st_atime,
+                                      _flags(entry.name, stat)))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files, subdirectories
+
+
+def _is_within(path: str, root: str) -> bool:
+    """path (normcase) é root ou está dentro dele"""
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+class FileInventory:
+    """Inventário de arquivos em colunas, com varredura única por raiz"""
+
+    def __init__(self, ttl: float = 600, io_scheduler: Optional[IOScheduler] = None):
+        """
+        Args:
+            ttl: Segundos em que uma raiz varrida continua válida
+            io_scheduler: Filas de E/S por disco (padrão: o agendador compartilhado)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.ttl = ttl
+        self.io_scheduler = io_scheduler
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        # Raízes: caminho normalizado -> (índice da pasta, horário da varredura)
+        self.roots: Dict[str, Tuple[int, float]] = {}
+
+        # Tabela de pastas
+        self.dir_parent = array('i')
+        self.dir_name: List[str] = []
+        self.dir_file_start = array('q')
+        self.dir_file_count = array('i')
+        self._dir_lookup: Dict[str, int] = {}
+
+        # Colunas dos arquivos
+        self.file_dir = array('i')
+        self.file_name: List[str] = []
+        self.size = array('q')
+        self.mtime = array('d')
+        self.atime = array('d')
+        self.ext = array('i')
+        self.flags = array('B')
+
+        # Extensões internadas ('' = sem extensão)
+        self.extensions: List[str] = ['']
+        self._ext_lookup: Dict[str, int] = {'': 0}
+
+    def __len__(self) -> int:
+        return len(self.file_name)
+
+    # Varredura
+
+    def _add_dir(self, parent: int, name: str, path: str) -> int:
+        self.dir_parent.append(parent)
+        self.dir_name.append(name)
+        self.dir_file_start.append(len(self.file_name))
+        self.dir_file_count.append(0)
+        index = len(self.dir_name) - 1
+        self._dir_lookup[os.path.normcase(path)] = index
+        return index
+
+    def _add_files(self, directory: int, files: List[Tuple[str, int, float, float, int]]) -> None:
+        self.dir_file_start[directory] = len(self.file_name)
+        self.dir_file_count[directory] = len(files)
+        for name, size, mtime, atime, flags in files:
+            extension = os.path.splitext(name)[1].lower()
+            ext_id = self._ext_lookup.get(extension)
+            if ext_id is None:
+                ext_id = self._ext_lookup[extension] = len(self.extensions)
+                self.extensions.append(extension)
+            self.file_dir.append(directory)
+            self.file_name.append(name)
+            self.size.append(size)
+            self.mtime.append(mtime)
+            self.atime.append(atime)
+            self.ext.append(ext_id)
+            self.flags.append(flags)
+
+    def _scan_roots(self, roots: List[str]) -> None:
+        """Varre as raízes juntas: cada pasta vai para a fila do seu disco"""
+        scheduler = self.io_scheduler or get_io_scheduler()
+        started = time.monotonic()
+        first_file = len(self.file_name)
+        pending = {}
+        root_indices = {}
+        for root in roots:
+            root_indices[root] = self._add_dir(-1, root, root)
+            pending[scheduler.submit(root, _list_directory, root)] = (root_indices[root], root)
+
+        # Os resultados são incorporados só nesta thread
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, path = pending.pop(future)
+                files, subdirectories = future.result()
+                self._add_files(index, files)
+                for name in subdirectories:
+                    child_path = os.path.join(path, name)
+                    child = self._add_dir(index, name, child_path)
+                    pending[scheduler.submit(child_path, _list_directory, child_path)] = (child, child_path)
+
+        scanned = time.time()
+        for root, index in root_indices.items():
+            self.roots[os.path.normcase(root)] = (index, scanned)
+        self.logger.info(
+            f"Inventário de {', '.join(roots)}: {len(self.file_name) - first_file} arquivos "
+            f"({time.monotonic() - started:.1f}s)"
+        )
+
+    def _root_of(self, path: str) -> Optional[str]:
+        for root in self.roots:
+            if _is_within(path, root):
+                return root
+        return None
+
+    def covers(self, path: str) -> bool:
+        """Se path está dentro de uma raiz varrida e ainda válida"""
+        with self._lock:
+            root = self._root_of(os.path.normcase(os.path.abspath(path)))
+            return root is not None and time.time() - self.roots[root][1] <= self.ttl
+
+    def ensure(self, roots: Iterable[str]) -> 'FileInventory':
+        """
+        Garante que as raízes estão no inventário, varrendo só as que faltam
+
+        Uma raiz vencida (ttl) ou que contém raízes já varridas faz o
+        inventário ser montado de novo.
+        """
+        wanted = []
+        for root in roots:
+            root = os.path.abspath(root)
+            if os.path.isdir(root) and not self.covers(root):
+                wanted.append(root)
+        if not wanted:
+            return self
+
+        with self._lock:
+            now = time.time()
+            normalized = [os.path.normcase(root) for root in wanted]
+            stale = any(now - scanned > self.ttl for _, scanned in self.roots.values())
+            swallows = any(_is_within(old, new) for new in normalized for old in self.roots)
+            if stale or swallows:
+                kept = [self.dir_name[index] for root, (index, scanned) in self.roots.items()
+                        if now - scanned <= self.ttl]
+                self._reset()
+                wanted = kept + wanted
+
+            # Só as raízes mais externas (as internas já vêm junto)
+            outermost = []
+            for root in sorted(wanted, key=len):
+                normalized = os.path.normcase(root)
+                if self._root_of(normalized) is None and not any(
+                        _is_within(normalized, os.path.normcase(other)) for other in outermost):
+                    outermost.append(root)
+            self._scan_roots(outermost)
+        return self
+
+    def invalidate(self) -> None:
+        """Descarta todo o inventário"""
+        with self._lock:
+            self._reset()
+
+    # Consultas
+
+    def dir_path(self, index: int) -> str:
+        parts = []
+        while self.dir_parent[index] >= 0:
+            parts.append(self.dir_name[index])
+            index = self.dir_parent[index]
+        return os.path.join(self.dir_name[index], *reversed(parts))
+
+    def file_path(self, index: int) -> str:
+        return os.path.join(self.dir_path(self.file_dir[index]), self.file_name[index])
+
+    def entry(self, index: int) -> Dict[str, Any]:
+        """Arquivo no formato usado pelos limpadores ({'path', 'size', 'modified', ...})"""
+        return {
+            'path': self.file_path(index),
+            'size': self.size[index],
+            'modified': self.mtime[index],
+            'accessed': self.atime[index],
+            'extension': self.extensions[self.ext[index]]
+        }
+
+    def find_file(self, path: str) -> Optional[int]:
+        """Índice de um arquivo do inventário, ou None"""
+        path = os.path.abspath(path)
+        directory = self._dir_lookup.get(os.path.normcase(os.path.dirname(path)))
+        if directory is None:
+            return None
+        name = os.path.normcase(os.path.basename(path))
+        start = self.dir_file_start[directory]
+        for index in range(start, start + self.dir_file_count[directory]):
+            if os.path.normcase(self.file_name[index]) == name:
+                return index
+        return None
+
+    def mark_removed(self, paths: Iterable[str]) -> int:
+        """Tira das consultas arquivos removidos depois da varredura"""
+        marked = 0
+        with self._lock:
+            for path in paths:
+                index = self.find_file(path)
+                if index is not None and not self.flags[index] & FLAG_REMOVED:
+                    self.flags[index] |= FLAG_REMOVED
+                    marked += 1
+        return marked
+
+    def _dir_mask(self, paths: Iterable[str]) -> bytearray:
+        """1 para as pastas dentro de alguma das paths"""
+        mask = bytearray(len(self.dir_name))
+        starts = [self._dir_lookup.get(os.path.normcase(os.path.abspath(path))) for path in paths]
+        starts = [start for start in starts if start is not None]
+        if not starts:
+            return mask
+        for start in starts:
+            mask[start] = 1
+        # Pastas vêm sempre depois da pasta pai: uma passagem para frente basta
+        parent = self.dir_parent
+        for index in range(min(starts) + 1, len(mask)):
+            if not mask[index] and parent[index] >= 0 and mask[parent[index]]:
+                mask[index] = 1
+        return mask
+
+    def select(self, paths: Optional[Iterable[str]] = None, min_size: int = 0,
+               max_size: Optional[int] = None, extensions: Optional[Iterable[str]] = None,
+               min_age_days: Optional[float] = None, include_hidden: bool = True,
+               exclude: Optional[Iterable[str]] = None) -> List[int]:
+        """
+        Índices dos arquivos que atendem aos filtros
+
+        Args:
+            paths: Pastas (e subpastas) consideradas (padrão: todo o inventário)
+            min_size / max_size: Limites de tamanho em bytes
+            extensions: Extensões aceitas ('.log', '.tmp'...)
+            min_age_days: Só arquivos sem modificação há pelo menos esses dias
+            include_hidden: Inclui arquivos ocultos e de sistema
+            exclude: Pastas (e subpastas) que ficam de fora
+        """
+        with self._lock:
+            dir_mask = self._dir_mask(paths) if paths is not None else None
+            if exclude:
+                excluded = self._dir_mask(exclude)
+                if dir_mask is None:
+                    dir_mask = bytearray(b'\x01') * len(self.dir_name)
+                dir_mask = bytearray(keep & (not drop) for keep, drop in zip(dir_mask, excluded))
+            ext_ids = None
+            if extensions is not None:
+                ext_ids = {self._ext_lookup[ext.lower()] for ext in extensions
+                           if ext.lower() in self._ext_lookup}
+            cutoff = time.time() - min_age_days * 86400 if min_age_days is not None else None
+            excluded_flags = FLAG_REMOVED | (0 if include_hidden else FLAG_HIDDEN | FLAG_SYSTEM)
+
+            if NUMPY_AVAILABLE:
+                return self._select_numpy(dir_mask, min_size, max_size, ext_ids, cutoff, excluded_flags)
+
+            selected = []
+            for index in range(len(self.file_name)):
+                size = self.size[index]
+                if size < min_size or (max_size is not None and size > max_size):
+                    continue
+                if self.flags[index] & excluded_flags:
+                    continue
+                if dir_mask is not None and not dir_mask[self.file_dir[index]]:
+                    continue
+                if ext_ids is not None and self.ext[index] not in ext_ids:
+                    continue
+                if cutoff is not None and self.mtime[index] > cutoff:
+                    continue
+                selected.append(index)
+            return selected
+
+    def _select_numpy(self, dir_mask, min_size, max_size, ext_ids, cutoff, excluded_flags) -> List[int]:
+        size = np.frombuffer(self.size, dtype=np.int64)
+        mask = size >= min_size
+        if max_size is not None:
+            mask &= size <= max_size
+        mask &= (np.frombuffer(self.flags, dtype=np.uint8) & excluded_flags) == 0
+        if dir_mask is not None:
+            mask &= np.frombuffer(dir_mask, dtype=np.uint8).astype(bool)[np.frombuffer(self.file_dir, dtype=np.int32)]
+        if ext_ids is not None:
+            mask &= np.isin(np.frombuffer(self.ext, dtype=np.int32), list(ext_ids))
+        if cutoff is not None:
+            mask &= np.frombuffer(self.mtime, dtype=np.float64) <= cutoff
+        return np.nonzero(mask)[0].tolist()
+
+    def top(self, indices: List[int], limit: int, by: str = 'size') -> List[int]:
+        """
+        Os limit arquivos de indices com maior tamanho (by='size') ou há mais
+        tempo sem uso (by='oldest', último uso = maior entre modificação e acesso)
+        """
+        with self._lock:
+            if NUMPY_AVAILABLE and indices:
+                selected = np.asarray(indices, dtype=np.int64)
+                if by == 'size':
+                    keys = np.frombuffer(self.size, dtype=np.int64)[selected].astype(np.float64)
+                else:
+                    keys = -np.maximum(np.frombuffer(self.mtime, dtype=np.float64)[selected],
+                                       np.frombuffer(self.atime, dtype=np.float64)[selected])
+                if len(selected) > limit:
+                    chosen = np.argpartition(-keys, limit - 1)[:limit]
+                else:
+                    chosen = np.arange(len(selected))
+                chosen = chosen[np.argsort(-keys[chosen], kind='stable')]
+                return selected[chosen].tolist()
+
+            if by == 'size':
+                key = self.size.__getitem__
+            else:
+                key = lambda index: -max(self.mtime[index], self.atime[index])
+            return heapq.nlargest(limit, indices, key=key)
+
+    def _sum_by(self, keys: array, indices: List[int], length: int) -> Tuple[List[int], List[int]]:
+        """Quantidade e bytes dos arquivos indices agrupados pela coluna keys"""
+        if NUMPY_AVAILABLE:
+            selected = np.asarray(indices, dtype=np.int64)
+            grouped = np.frombuffer(keys, dtype=np.int32)[selected]
+            sizes = np.frombuffer(self.size, dtype=np.int64)[selected]
+            counts = np.bincount(grouped, minlength=length)
+            totals = np.bincount(grouped, weights=sizes, minlength=length)
+            return counts.tolist(), [int(total) for total in totals]
+
+        counts = [0] * length
+        totals = [0] * length
+        for index in indices:
+            key = keys[index]
+            counts[key] += 1
+            totals[key] += self.size[index]
+        return counts, totals
+
+    def totals(self, paths: Optional[Iterable[str]] = None, **filters) -> Dict[str, int]:
+        """Quantidade e bytes dos arquivos selecionados"""
+        with self._lock:
+            indices = self.select(paths, **filters)
+            if NUMPY_AVAILABLE:
+                total = int(np.frombuffer(self.size, dtype=np.int64)[np.asarray(indices, dtype=np.int64)].sum())
+            else:
+                total = sum(self.size[index] for index in indices)
+            return {'files': len(indices), 'bytes': total}
+
+    def by_directory(self, paths: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Arquivos e bytes próprios de cada pasta (listas alinhadas à tabela de pastas)"""
+        with self._lock:
+            counts, totals = self._sum_by(self.file_dir, self.select(paths), len(self.dir_name))
+            return {'files': counts, 'bytes': totals}
+
+    def subtree_snapshot(self, root: str) -> Optional[Dict[str, Any]]:
+        """
+        Cópia consistente das pastas abaixo de root, para montar outras estruturas
+
+        Returns:
+            Dicionário com listas alinhadas 'names', 'parents' (posição da pasta
+            pai na própria lista, -1 para root), 'files' e 'bytes' (próprios de
+            cada pasta), com root primeiro e cada pasta depois da pasta pai;
+            None se root não estiver no inventário
+        """
+        with self._lock:
+            start = self._dir_lookup.get(os.path.normcase(os.path.abspath(root)))
+            if start is None:
+                return None
+            own = self.by_directory([root])
+            snapshot = {'names': [os.path.abspath(root)], 'parents': [-1],
+                        'files': [own['files'][start]], 'bytes': [own['bytes'][start]]}
+            mapping = {start: 0}
+            for index in range(start + 1, len(self.dir_name)):
+                parent = mapping.get(self.dir_parent[index])
+                if parent is None:
+                    continue
+                mapping[index] = len(snapshot['names'])
+                snapshot['names'].append(self.dir_name[index])
+                snapshot['parents'].append(parent)
+                snapshot['files'].append(own['files'][index])
+                snapshot['bytes'].append(own['bytes'][index])
+        return snapshot
+
+    def by_extension(self, paths: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Arquivos e bytes por extensão, da que ocupa mais para a que ocupa menos"""
+        with self._lock:
+            counts, totals = self._sum_by(self.ext, self.select(paths), len(self.extensions))
+            result = [{'extension': self.extensions[ext_id] or '(sem extensão)',
+                       'files': counts[ext_id], 'bytes': totals[ext_id]}
+                      for ext_id in range(len(self.extensions)) if counts[ext_id]]
+        result.sort(key=lambda item: item['bytes'], reverse=True)
+        return result
+
+    def by_age(self, paths: Optional[Iterable[str]] = None,
+               buckets: Iterable[int] = DEFAULT_AGE_BUCKETS) -> List[Dict[str, Any]]:
+        """Arquivos e bytes por faixa de idade (dias desde a última modificação)"""
+        buckets = sorted(buckets)
+        with self._lock:
+            indices = self.select(paths)
+            now = time.time()
+            if NUMPY_AVAILABLE:
+                selected = np.asarray(indices, dtype=np.int64)
+                ages = (now - np.frombuffer(self.mtime, dtype=np.float64)[selected]) / 86400
+                positions = np.searchsorted(np.asarray(buckets, dtype=np.float64), ages, side='right')
+                sizes = np.frombuffer(self.size, dtype=np.int64)[selected]
+                counts = np.bincount(positions, minlength=len(buckets) + 1).tolist()
+                totals = [int(total) for total in np.bincount(positions, weights=sizes,
+                                                              minlength=len(buckets) + 1)]
+            else:
+                counts = [0] * (len(buckets) + 1)
+                totals = [0] * (len(buckets) + 1)
+                for index in indices:
+                    age = (now - self.mtime[index]) / 86400
+                    position = next((i for i, limit in enumerate(buckets) if age < limit), len(buckets))
+                    counts[position] += 1
+                    totals[position] += self.size[index]
+
+        limits = [0] + buckets
+        return [{'min_days': limits[i], 'max_days': buckets[i] if i < len(buckets) else None,
+                 'files': counts[i], 'bytes': totals[i]} for i in range(len(buckets) + 1)]
+
+    def size_collisions(self, paths: Optional[Iterable[str]] = None, min_size: int = 0,
+                        max_size: Optional[int] = None) -> Dict[int, List[int]]:
+        """Tamanho -> índices dos arquivos, só para tamanhos com dois ou mais arquivos"""
+        with self._lock:
+            indices = self.select(paths, min_size=min_size, max_size=max_size)
+            if NUMPY_AVAILABLE and indices:
+                selected = np.asarray(indices, dtype=np.int64)
+                sizes = np.frombuffer(self.size, dtype=np.int64)[selected]
+                order = np.argsort(sizes, kind='stable')
+                sizes = sizes[order]
+                selected = selected[order]
+                unique, starts, counts = np.unique(sizes, return_index=True, return_counts=True)
+                return {int(size): selected[start:start + count].tolist()
+                        for size, start, count in zip(unique, starts, counts) if count > 1}
+
+            groups = defaultdict(list)
+            for index in indices:
+                groups[self.size[index]].append(index)
+            return {size: group for size, group in groups.items() if len(group) > 1}
+
+    def size_collision_paths(self, paths: Optional[Iterable[str]] = None, min_size: int = 0,
+                             max_size: Optional[int] = None) -> Dict[int, List[str]]:
+        """
+        Tamanho -> caminhos dos arquivos com tamanho repetido
+
+        Os índices só valem até o próximo ensure()/_reset(); aqui os caminhos
+        são resolvidos sob a mesma trava, então quem consome o resultado aos
+        poucos (ex.: intercalando com o hash) não lê um inventário já trocado.
+        """
+        with self._lock:
+            return {size: [self.file_path(index) for index in indices]
+                    for size, indices in self.size_collisions(paths, min_size, max_size).items()}
+
+
+_default_inventory = None
+_default_inventory_lock = threading.Lock()
+
+
+def get_file_inventory() -> FileInventory:
+    """Inventário compartilhado pelos limpadores, pela busca de duplicatas e pelo analisador de disco"""
+    global _default_inventory
+    with _default_inventory_lock:
+        if _default_inventory is None:
+            _default_inventory = FileInventory()
+        return _default_inventory
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Consolidação de Duplicatas por Links
+====================================
+
+Substitui arquivos duplicados por reflinks (clones de blocos) ou hardlinks
+para o arquivo original. Todos os caminhos continuam válidos, então
+launchers e jogos não quebram, mas o espaço é recuperado.
+
+Com reflink cada arquivo continua independente (alterar um não altera os
+outros). Com hardlink todos passam a ser o mesmo arquivo, por isso hardlinks
+só são usados quando pedidos explicitamente: o modo 'auto' nunca recorre a
+eles.
+
+Funcionalidades:
+- Verificação byte a byte antes de qualquer substituição
+- Reflink: FICLONE no Linux (Btrfs, XFS) e block cloning no Windows (ReFS, Dev Drive)
+- Hardlink apenas no modo 'hardlink', dentro do mesmo volume
+- Substituição atômica (nome temporário + os.replace)
+"""
+
+import os
+import sys
+import uuid
+import shutil
+import logging
+from typing import Optional
+
+COMPARE_BUFFER_SIZE = 1024 * 1024
+
+# ioctl FICLONE do Linux (Btrfs, XFS, bcachefs)
+FICLONE = 0x40049409
+
+# Block cloning do Windows (ReFS e Dev Drive)
+FSCTL_DUPLICATE_EXTENTS_TO_FILE = 0x00098344
+FSCTL_SET_SPARSE = 0x000900C4
+FILE_ATTRIBUTE_SPARSE_FILE = 0x200
+CLONE_CHUNK_SIZE = 1024 * 1024 * 1024  # Menor que o limite de 4 GB por chamada, múltiplo do cluster
+
+LINK_MODES = ('auto', 'reflink', 'hardlink')
+
+
+def files_identical(path_a: str, path_b: str, buffer_size: int = COMPARE_BUFFER_SIZE) -> bool:
+    """Compara o conteúdo de dois arquivos byte a byte"""
+    try:
+        if os.path.getsize(path_a) != os.path.getsize(path_b):
+            return False
+
+        buffer_a = bytearray(buffer_size)
+        buffer_b = bytearray(buffer_size)
+        view_a = memoryview(buffer_a)
+        view_b = memoryview(buffer_b)
+        with open(path_a, 'rb', buffering=0) as file_a, open(path_b, 'rb', buffering=0) as file_b:
+            while True:
+                read_a = file_a.readinto(buffer_a)
+                read_b = file_b.readinto(buffer_b)
+                if read_a != read_b or view_a[:read_a] != view_b[:read_b]:
+                    return False
+                if not read_a:
+                    return True
+    except OSError:
+        return False
+
+
+def _clone_linux(source: str, target: str) -> None:
+    import fcntl
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+def _cluster_size(path: str) -> int:
+    """Tamanho do cluster do volume de path (Windows)"""
+    import ctypes
+    from ctypes import wintypes
+    kernel32 = ctypes.windll.kernel32
+    volume = ctypes.create_unicode_buffer(260)
+    if not kernel32.GetVolumePathNameW(os.path.abspath(path), volume, len(volume)):
+        raise ctypes.WinError()
+    sectors_per_cluster = wintypes.DWORD()
+    bytes_per_sector = wintypes.DWORD()
+    free_clusters = wintypes.DWORD()
+    total_clusters = wintypes.DWORD()
+    if not kernel32.GetDiskFreeSpaceW(volume.value, ctypes.byref(sectors_per_cluster),
+                                      ctypes.byref(bytes_per_sector), ctypes.byref(free_clusters),
+                                      ctypes.byref(total_clusters)):
+        raise ctypes.WinError()
+    return sectors_per_cluster.value * bytes_per_sector.value
+
+
+def _clone_windows(source: str, target: str) -> None:
+    """Clona os blocos de source em target com FSCTL_DUPLICATE_EXTENTS_TO_FILE"""
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    class DuplicateExtentsData(ctypes.Structure):
+        _fields_ = [('FileHandle', wintypes.HANDLE),
+                    ('SourceFileOffset', ctypes.c_longlong),
+                    ('TargetFileOffset', ctypes.c_longlong),
+                    ('ByteCount', ctypes.c_longlong)]
+
+    kernel32 = ctypes.windll.kernel32
+    kernel32.DeviceIoControl.argtypes = [wintypes.HANDLE, wintypes.DWORD, wintypes.LPVOID, wintypes.DWORD,
+                                         wintypes.LPVOID, wintypes.DWORD, ctypes.POINTER(wintypes.DWORD),
+                                         wintypes.LPVOID]
+
+    def control(handle, code, data=None, size=0):
+        returned = wintypes.DWORD()
+        if not kernel32.DeviceIoControl(handle, code, data, size, None, 0, ctypes.byref(returned), None):
+            raise ctypes.WinError()
+
+    source_stat = os.stat(source)
+    size = source_stat.st_size
+    cluster = _cluster_size(target)
+    # A região clonada vai até o fim do último cluster (permitido no fim do arquivo)
+    rounded = (size + cluster - 1) // cluster * cluster
+
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        source_handle = msvcrt.get_osfhandle(src.fileno())
+        target_handle = msvcrt.get_osfhandle(dst.fileno())
+        # Origem e destino precisam ter o mesmo estado de arquivo esparso
+        if getattr(source_stat, 'st_file_attributes', 0) & FILE_ATTRIBUTE_SPARSE_FILE:
+            control(target_handle, FSCTL_SET_SPARSE)
+        dst.truncate(size)
+        dst.flush()
+        offset = 0
+        while offset < rounded:
+            count = min(CLONE_CHUNK_SIZE, rounded - offset)
+            data = DuplicateExtentsData(source_handle, offset, offset, count)
+            control(target_handle, FSCTL_DUPLICATE_EXTENTS_TO_FILE, ctypes.byref(data), ctypes.sizeof(data))
+            offset += count
+
+
+def _reflink(source: str, target: str) -> bool:
+    """Cria target como clone de blocos de source; False se não houver suporte"""
+    if sys.platform.startswith('linux'):
+        clone = _clone_linux
+    elif sys.platform == 'win32':
+        clone = _clone_windows
+    else:
+        return False
+
+    try:
+        clone(source, target)
+        shutil.copystat(source, target)
+        return True
+    except (OSError, ImportError, AttributeError):
+        try:
+            os.remove(target)
+        except OSError:
+            pass
+        return False
+
+
+def link_duplicate(original: str, duplicate: str, mode: str = 'auto') -> Optional[str]:
+    """
+    Substitui duplicate por um link para original
+
+    Args:
+        original: Arquivo que permanece
+        duplicate: Arquivo a substituir (mesmo conteúdo)
+        mode: 'reflink' ou 'auto' (clone de blocos; sem suporte o arquivo fica
+            como está) ou 'hardlink' (o arquivo passa a ser o mesmo do original)
+
+    Returns:
+        Método usado ('reflink', 'hardlink' ou 'already_linked'), ou None se não foi possível
+    """
+    logger = logging.getLogger(__name__)
+
+    if mode not in LINK_MODES:
+        raise ValueError(f"Modo de link inválido: {mode}")
+
+    try:
+        original_stat = os.stat(original)
+        duplicate_stat = os.lstat(duplicate)
+    except OSError as e:
+        logger.warning(f"Não foi possível consolidar {duplicate}: {e}")
+        return None
+
+    if original_stat.st_dev != duplicate_stat.st_dev:
+        logger.info(f"{duplicate} está em outro volume, ignorado")
+        return None
+    if original_stat.st_ino == duplicate_stat.st_ino:
+        return 'already_linked'
+
+    if not files_identical(original, duplicate):
+        logger.warning(f"Conteúdo de {duplicate} difere de {original}, ignorado")
+        return None
+
+    directory, name = os.path.split(duplicate)
+    temp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}.link")
+
+    method = None
+    if mode in ('auto', 'reflink') and _reflink(original, temp_path):
+        method = 'reflink'
+    elif mode == 'hardlink':
+        try:
+            os.link(original, temp_path)
+            method = 'hardlink'
+        except OSError as e:
+            logger.warning(f"Não foi possível criar hardlink para {duplicate}: {e}")
+
+    if method is None:
+        if mode == 'auto':
+            logger.info(f"{duplicate}: volume sem clone de blocos, mantido (hardlink só no modo 'hardlink')")
+        return None
+
+    try:
+        # O arquivo não pode ter mudado desde a verificação
+        current = os.lstat(duplicate)
+        if (current.st_size, current.st_mtime_ns) != (duplicate_stat.st_size, duplicate_stat.st_mtime_ns):
+            raise OSError(f"{duplicate} foi alterado durante a consolidação")
+        os.replace(temp_path, duplicate)
+    except OSError as e:
+        logger.warning(f"Não foi possível consolidar {duplicate}: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return None
+
+    return method
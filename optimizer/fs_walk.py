@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Varredura de Arquivos com os.scandir
+====================================
+
+Percorre árvores de diretórios em uma única passagem, entregando os
+DirEntry encontrados. No Windows o stat do DirEntry já vem da listagem
+do diretório, então tamanho e data não custam uma chamada extra por arquivo.
+
+Funcionalidades:
+- Varredura iterativa (sem recursão) de vários diretórios raiz
+- Não segue links simbólicos
+- Ignora diretórios e arquivos sem permissão de acesso
+"""
+
+import os
+from typing import Callable, Iterable, Iterator, Optional
+
+
+def iter_files(roots: Iterable[str],
+               on_directory: Optional[Callable[[str], None]] = None) -> Iterator[os.DirEntry]:
+    """
+    Percorre os diretórios e entrega cada arquivo regular encontrado
+
+    Args:
+        roots: Diretórios raiz
+        on_directory: Chamado com o caminho de cada diretório ao ser listado
+
+    Returns:
+        Iterador de os.DirEntry
+    """
+    stack = [root for root in reversed(list(roots)) if os.path.isdir(root)]
+
+    while stack:
+        directory = stack.pop()
+        if on_directory:
+            on_directory(directory)
+
+        try:
+            with os.scandir(directory) as entries:
+                subdirectories = []
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirectories.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+        # Subdiretórios são visitados na ordem em que foram listados
+        stack.extend(reversed(subdirectories))
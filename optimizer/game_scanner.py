@@ -13,6 +13,7 @@ Funcionalidades:
 - Escaneamento rápido e inteligente
 - Suporte multi-launcher
 - Atualização instantânea
+- Pastas em discos diferentes varridas em paralelo
 """
 
 import os
@@ -28,6 +29,9 @@ from typing import Dict, List, Any, Optional, Set, Callable
 from dataclasses import dataclass, asdict
 import subprocess
 
+from .file_inventory import FileInventory, get_file_inventory
+from .io_scheduler import get_io_scheduler
+
 @dataclass
 class GameInfo:
     """Informações de um jogo detectado"""
@@ -63,6 +67,7 @@ class GameScanner:
         self.scan_running = False
         self.last_scan_time = 0
         self.min_scan_interval = 1  # Mínimo 1 segundo entre escaneamentos
+        self._game_inventory = None  # Arquivos da pasta do último jogo analisado
         
         # Diretórios prioritários para busca rápida
         self.priority_dirs = [
@@ -308,9 +313,7 @@ class GameScanner:
                 r"C:\Program Files\Steam\steamapps\common"
             ]
             
-            for steam_dir in steam_dirs:
-                if os.path.exists(steam_dir):
-                    games.update(self._quick_scan_directory(steam_dir, "Steam", max_depth=2))
+            games.update(self._quick_scan_many(steam_dirs, "Steam"))
                     
         except Exception as e:
             self.logger.debug(f"Erro na busca Steam: {e}")
@@ -326,9 +329,7 @@ class GameScanner:
                 r"C:\Program Files (x86)\Epic Games"
             ]
             
-            for epic_dir in epic_dirs:
-                if os.path.exists(epic_dir):
-                    games.update(self._quick_scan_directory(epic_dir, "Epic Games", max_depth=2))
+            games.update(self._quick_scan_many(epic_dirs, "Epic Games"))
                     
         except Exception as e:
             self.logger.debug(f"Erro na busca Epic: {e}")
@@ -346,9 +347,7 @@ class GameScanner:
                 r"E:\Games"
             ]
             
-            for directory in priority_list:
-                if os.path.exists(directory):
-                    games.update(self._quick_scan_directory(directory, "Manual", max_depth=2))
+            games.update(self._quick_scan_many(priority_list, "Manual"))
                     
         except Exception as e:
             self.logger.debug(f"Erro na busca diretórios: {e}")
@@ -404,6 +403,20 @@ class GameScanner:
         
         return games
     
+    def _quick_scan_many(self, directories: List[str], launcher: str, max_depth: int = 2) -> Dict[str, GameInfo]:
+        """Escaneamento rápido de várias pastas: discos diferentes em paralelo, um disco por vez"""
+        existing = [directory for directory in directories if os.path.exists(directory)]
+        games = {}
+        results = get_io_scheduler().run_per_device(
+            existing, lambda directory: self._quick_scan_directory(directory, launcher, max_depth)
+        )
+        for directory, result in results:
+            if isinstance(result, dict):
+                games.update(result)
+            else:
+                self.logger.debug(f"Erro no scan rápido de {directory}: {result}")
+        return games
+    
     def _quick_scan_directory(self, directory: str, launcher: str, max_depth: int = 2) -> Dict[str, GameInfo]:
         """Escaneamento rápido de diretório específico"""
         games = {}
@@ -605,16 +618,16 @@ class GameScanner:
     
     def _scan_launcher_directories(self) -> None:
         """Escaneia diretórios específicos de launchers"""
-        for launcher, directories in self.launcher_dirs.items():
-            for directory in directories:
-                if os.path.exists(directory):
-                    self._scan_directory(directory, launcher)
+        targets = [(directory, launcher)
+                   for launcher, directories in self.launcher_dirs.items()
+                   for directory in directories if os.path.exists(directory)]
+        get_io_scheduler().run_per_device(targets, lambda target: self._scan_directory(*target),
+                                          key=lambda target: target[0])
     
     def _scan_common_directories(self) -> None:
         """Escaneia diretórios prioritários de jogos"""
-        for directory in self.priority_dirs:
-            if os.path.exists(directory):
-                self._scan_directory(directory, "Manual")
+        directories = [directory for directory in self.priority_dirs if os.path.exists(directory)]
+        get_io_scheduler().run_per_device(directories, lambda directory: self._scan_directory(directory, "Manual"))
     
     def _scan_directory(self, directory: str, launcher: str, max_depth: int = 3) -> None:
         """
@@ -703,31 +716,44 @@ class GameScanner:
         # Usar nome do arquivo sem extensão
         return os.path.splitext(filename)[0]
     
+    def _inventory_for(self, install_dir: str) -> FileInventory:
+        """Arquivos da pasta do jogo, varrida uma vez para executável, ícone e tamanho"""
+        shared = get_file_inventory()
+        if shared.covers(install_dir):
+            return shared
+        
+        inventory = self._game_inventory
+        if inventory is None or not inventory.covers(install_dir):
+            # Inventário só da pasta atual, para não acumular todos os jogos na memória
+            inventory = FileInventory().ensure([install_dir])
+            self._game_inventory = inventory
+        return inventory
+    
     def _find_main_executable(self, install_dir: str, game_name: str) -> Optional[str]:
         """Encontra o executável principal de um jogo"""
         try:
             exe_files = []
             
             # Procurar executáveis no diretório
-            for root, dirs, files in os.walk(install_dir):
-                for file in files:
-                    if file.lower().endswith('.exe'):
-                        exe_path = os.path.join(root, file)
-                        if self._is_game_executable(file, exe_path):
-                            exe_files.append((exe_path, file))
+            inventory = self._inventory_for(install_dir)
+            for index in inventory.select([install_dir], extensions=['.exe']):
+                file = inventory.file_name[index]
+                exe_path = inventory.file_path(index)
+                if self._is_game_executable(file, exe_path):
+                    exe_files.append((exe_path, file, inventory.size[index]))
             
             if not exe_files:
                 return None
             
             # Tentar encontrar o executável que mais se parece com o nome do jogo
             game_name_lower = game_name.lower()
-            for exe_path, filename in exe_files:
+            for exe_path, filename, _ in exe_files:
                 filename_lower = filename.lower()
                 if game_name_lower in filename_lower or filename_lower in game_name_lower:
                     return exe_path
             
             # Se não encontrou por nome, pegar o maior arquivo
-            exe_files.sort(key=lambda x: os.path.getsize(x[0]), reverse=True)
+            exe_files.sort(key=lambda x: x[2], reverse=True)
             return exe_files[0][0]
         
         except Exception as e:
@@ -769,16 +795,14 @@ class GameScanner:
             icon_extensions = ['.ico', '.png', '.jpg', '.jpeg']
             icon_names = ['icon', 'logo', 'game', os.path.splitext(os.path.basename(executable))[0]]
             
-            for root, dirs, files in os.walk(install_dir):
-                for file in files:
-                    filename_lower = file.lower()
-                    
-                    # Verificar se é um arquivo de ícone
-                    if any(filename_lower.endswith(ext) for ext in icon_extensions):
-                        # Verificar se o nome corresponde
-                        for icon_name in icon_names:
-                            if icon_name.lower() in filename_lower:
-                                return os.path.join(root, file)
+            inventory = self._inventory_for(install_dir)
+            for index in inventory.select([install_dir], extensions=icon_extensions):
+                filename_lower = inventory.file_name[index].lower()
+                
+                # Verificar se o nome corresponde
+                for icon_name in icon_names:
+                    if icon_name.lower() in filename_lower:
+                        return inventory.file_path(index)
             
             # Se não encontrou, tentar extrair ícone do executável
             return executable  # O sistema pode extrair ícone do .exe
@@ -790,15 +814,7 @@ class GameScanner:
     def _calculate_game_size(self, install_dir: str) -> Optional[float]:
         """Calcula tamanho do jogo em MB"""
         try:
-            total_size = 0
-            for root, dirs, files in os.walk(install_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    try:
-                        total_size += os.path.getsize(file_path)
-                    except:
-                        continue
-            
+            total_size = self._inventory_for(install_dir).totals([install_dir])['bytes']
             return round(total_size / (1024 * 1024), 2)  # MB
         
         except Exception as e:
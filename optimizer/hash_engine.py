@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor de Hash Paralelo
+======================
+
+Calcula hashes de arquivos em um pool de workers (threads ou processos)
+para a busca de duplicatas.
+
+Funcionalidades:
+- Pool configurável de threads ou processos
+- Limite de bytes em processamento para manter a memória estável
+- Resultados entregues na mesma ordem em que os arquivos foram enviados
+- Hash parcial (início + fim) e hash completo
+- Algoritmo de digest configurável (blake2b, xxh128 ou md5)
+- Leitura com buffer grande reutilizado (readinto) ou mmap para arquivos grandes
+"""
+
+import os
+import mmap
+import hashlib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+DEFAULT_ALGORITHM = 'blake2b'
+DEFAULT_PARTIAL_BLOCK = 64 * 1024
+READ_BUFFER_SIZE = 1024 * 1024  # 1MB por leitura
+MMAP_THRESHOLD = 64 * 1024 * 1024  # Arquivos a partir de 64MB são mapeados em memória
+
+# Buffer de leitura reutilizado por thread (evita uma alocação por bloco)
+_thread_buffers = threading.local()
+
+
+def available_algorithms() -> Tuple[str, ...]:
+    """Algoritmos de digest disponíveis nesta instalação"""
+    if XXHASH_AVAILABLE:
+        return ('blake2b', 'xxh128', 'md5')
+    return ('blake2b', 'md5')
+
+
+def new_digest(algorithm: str = DEFAULT_ALGORITHM):
+    """
+    Cria um objeto de digest
+
+    Args:
+        algorithm: 'blake2b' (digest de 16 bytes), 'xxh128' (requer xxhash) ou 'md5'
+    """
+    if algorithm == 'blake2b':
+        return hashlib.blake2b(digest_size=16)
+    if algorithm == 'xxh128':
+        if not XXHASH_AVAILABLE:
+            raise ValueError("Algoritmo xxh128 requer o pacote xxhash")
+        return xxhash.xxh3_128()
+    if algorithm == 'md5':
+        return hashlib.md5()
+    raise ValueError(f"Algoritmo de hash inválido: {algorithm}")
+
+
+def _get_read_buffer(buffer_size: int) -> bytearray:
+    """Retorna o buffer de leitura da thread atual"""
+    buffer = getattr(_thread_buffers, 'buffer', None)
+    if buffer is None or len(buffer) != buffer_size:
+        buffer = bytearray(buffer_size)
+        _thread_buffers.buffer = buffer
+    return buffer
+
+
+def calculate_full_hash(file_path: str, algorithm: str = DEFAULT_ALGORITHM,
+                        buffer_size: int = READ_BUFFER_SIZE) -> Optional[str]:
+    """
+    Calcula o hash de um arquivo inteiro
+
+    Arquivos grandes são mapeados com mmap e entregues ao digest de uma vez;
+    os demais são lidos com readinto em um buffer reutilizado.
+    """
+    try:
+        digest = new_digest(algorithm)
+        with open(file_path, "rb", buffering=0) as f:
+            file_size = os.fstat(f.fileno()).st_size
+
+            if file_size >= MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest.update(mapped)
+                return digest.hexdigest()
+
+            buffer = _get_read_buffer(buffer_size)
+            view = memoryview(buffer)
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                digest.update(view[:read])
+        return digest.hexdigest()
+    except (OSError, ValueError):
+        return None
+
+
+def calculate_partial_hash(file_path: str, file_size: int,
+                           block_size: int = DEFAULT_PARTIAL_BLOCK,
+                           algorithm: str = DEFAULT_ALGORITHM) -> Tuple[Optional[str], int]:
+    """
+    Calcula o hash dos blocos inicial e final de um arquivo
+
+    Arquivos com até dois blocos são lidos por inteiro, então o hash
+    parcial deles é igual ao hash completo.
+
+    Returns:
+        Tupla (hash, bytes lidos)
+    """
+    try:
+        digest = new_digest(algorithm)
+        with open(file_path, "rb") as f:
+            if file_size <= 2 * block_size:
+                data = f.read()
+                digest.update(data)
+                return digest.hexdigest(), len(data)
+
+            head = f.read(block_size)
+            f.seek(-block_size, os.SEEK_END)
+            tail = f.read(block_size)
+            digest.update(head)
+            digest.update(tail)
+            return digest.hexdigest(), len(head) + len(tail)
+    except (OSError, ValueError):
+        return None, 0
+
+
+def job_cost(file_size: int, kind: str, block_size: int = DEFAULT_PARTIAL_BLOCK) -> int:
+    """Bytes que um job de hash vai ler"""
+    if kind == 'partial':
+        return min(file_size, 2 * block_size)
+    return file_size
+
+
+def _hash_job(file_path: str, file_size: int, kind: str, block_size: int,
+              algorithm: str) -> Tuple[Optional[str], int]:
+    """Executa um job de hash (função de módulo para funcionar com ProcessPoolExecutor)"""
+    if kind == 'partial':
+        return calculate_partial_hash(file_path, file_size, block_size, algorithm)
+
+    file_hash = calculate_full_hash(file_path, algorithm)
+    return file_hash, (file_size if file_hash else 0)
+
+
+class ParallelHasher:
+    """Pool de hash com bytes em processamento limitados e resultados ordenados"""
+
+    def __init__(self, workers: Optional[int] = None, mode: str = 'thread',
+                 max_inflight_bytes: int = 256 * 1024 * 1024,
+                 partial_block: int = DEFAULT_PARTIAL_BLOCK,
+                 algorithm: str = DEFAULT_ALGORITHM, io_scheduler=None):
+        """
+        Args:
+            workers: Número de workers (None = núcleos disponíveis, até 32)
+            mode: 'thread' (hashlib libera o GIL) ou 'process'
+            max_inflight_bytes: Máximo de bytes enviados e ainda não processados
+            partial_block: Tamanho dos blocos do hash parcial
+            algorithm: Algoritmo de digest (ver available_algorithms)
+            io_scheduler: No modo 'thread', arquivos em HD rotacional vão para a
+                fila do seu disco (IOScheduler, um por vez); SSD, NVMe e discos
+                desconhecidos continuam no pool próprio de workers
+        """
+        if mode not in ('thread', 'process'):
+            raise ValueError(f"Modo de hash inválido: {mode}")
+        new_digest(algorithm)  # Valida o algoritmo antes de criar o pool
+
+        self.workers = workers or min(32, os.cpu_count() or 1)
+        self.mode = mode
+        self.max_inflight_bytes = max_inflight_bytes
+        self.partial_block = partial_block
+        self.algorithm = algorithm
+        self.io_scheduler = io_scheduler if mode == 'thread' else None
+
+        # Limita também a fila de resultados aguardando um job lento à frente
+        self.max_pending = self.workers * 64
+
+        self._executor = None
+        self._pending = deque()
+        self._inflight_bytes = 0
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _get_executor(self):
+        """Cria o pool sob demanda"""
+        if self._executor is None:
+            if self.mode == 'process':
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix='hash-worker')
+        return self._executor
+
+    def _release(self, cost: int) -> None:
+        """Libera bytes quando um job termina"""
+        with self._condition:
+            self._inflight_bytes -= cost
+            self._condition.notify_all()
+
+    def submit(self, key: Any, file_path: str, file_size: int, kind: str) -> None:
+        """
+        Envia um arquivo para hash, bloqueando se o limite de bytes foi atingido
+
+        Um único arquivo maior que o limite é aceito quando o pool está vazio.
+        """
+        cost = job_cost(file_size, kind, self.partial_block)
+
+        with self._condition:
+            while self._inflight_bytes and self._inflight_bytes + cost > self.max_inflight_bytes:
+                self._condition.wait()
+            self._inflight_bytes += cost
+
+        if self.io_scheduler is not None and self.io_scheduler.device_for(file_path).kind == 'hdd':
+            future = self.io_scheduler.submit(file_path, _hash_job, file_path, file_size, kind,
+                                              self.partial_block, self.algorithm)
+        else:
+            future = self._get_executor().submit(_hash_job, file_path, file_size, kind,
+                                                 self.partial_block, self.algorithm)
+        future.add_done_callback(lambda _, cost=cost: self._release(cost))
+        self._pending.append((key, future))
+
+    def pending_count(self) -> int:
+        """Jobs enviados cujo resultado ainda não foi entregue"""
+        return len(self._pending)
+
+    def is_saturated(self) -> bool:
+        """Indica se a fila de resultados atingiu o limite e deve ser consumida"""
+        return len(self._pending) >= self.max_pending
+
+    def next_result(self) -> Tuple[Any, Optional[str], int]:
+        """Remove o resultado mais antigo da fila (bloqueia até ficar pronto)"""
+        key, future = self._pending.popleft()
+        try:
+            file_hash, bytes_read = future.result()
+        except Exception:
+            file_hash, bytes_read = None, 0
+        return key, file_hash, bytes_read
+
+    def ready(self) -> Iterator[Tuple[Any, Optional[str], int]]:
+        """Entrega, em ordem de envio, os resultados já concluídos (sem bloquear)"""
+        while self._pending and self._pending[0][1].done():
+            yield self.next_result()
+
+    def drain(self) -> Iterator[Tuple[Any, Optional[str], int]]:
+        """Entrega todos os resultados restantes, em ordem de envio"""
+        while self._pending:
+            yield self.next_result()
+
+    def map(self, jobs: Iterable[Tuple[Any, str, int, str]]) -> Iterator[Tuple[Any, Optional[str], int]]:
+        """
+        Calcula hashes de uma sequência de jobs (chave, caminho, tamanho, tipo)
+
+        Returns:
+            Iterador de (chave, hash, bytes lidos) na ordem dos jobs
+        """
+        for key, file_path, file_size, kind in jobs:
+            if self.is_saturated():
+                yield self.next_result()
+            self.submit(key, file_path, file_size, kind)
+            yield from self.ready()
+
+        yield from self.drain()
+
+    def close(self) -> None:
+        """Encerra o pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
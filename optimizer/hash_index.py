@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice Persistente de Hashes de Arquivos
+========================================
+
+Guarda em disco (SQLite em logs/) os hashes já calculados pela busca de
+duplicatas, para que uma nova análise só precise ler arquivos novos ou
+alterados.
+
+Funcionalidades:
+- Chave por caminho, tamanho, mtime e inode/file-id
+- Armazena hash parcial e hash completo, registrando o algoritmo usado
+- Contadores de acertos e falhas por análise
+- Remoção de entradas de arquivos que não existem mais
+- Invalidação completa do índice
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+SCHEMA_VERSION = "1"
+
+
+class FileHashIndex:
+    """Índice incremental de hashes de arquivos armazenado em SQLite"""
+
+    def __init__(self, db_path: Optional[str] = None, partial_block: int = 64 * 1024,
+                 algorithm: str = 'blake2b'):
+        self.logger = logging.getLogger(__name__)
+
+        if db_path is None:
+            log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
+            os.makedirs(log_dir, exist_ok=True)
+            db_path = os.path.join(log_dir, 'hash_index.db')
+
+        self.db_path = db_path
+        self.partial_block = partial_block
+        self.algorithm = algorithm
+        self.hits = 0
+        self.misses = 0
+        self._pending_writes = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """Cria as tabelas e invalida o índice se os parâmetros mudaram"""
+        with self._lock:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS file_hashes (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    file_id INTEGER NOT NULL,
+                    partial_hash TEXT,
+                    full_hash TEXT,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._conn.commit()
+
+        expected = {
+            'schema_version': SCHEMA_VERSION,
+            'partial_block': str(self.partial_block),
+            'algorithm': self.algorithm
+        }
+        stored = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+
+        # Hashes de outro algoritmo ou outro tamanho de bloco não são comparáveis
+        if any(stored.get(key) != value for key, value in expected.items()):
+            if stored:
+                self.logger.info("Parâmetros do índice de hashes mudaram, invalidando")
+            self.invalidate()
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", expected.items()
+                )
+                self._conn.commit()
+
+    def lookup(self, path: str, stat_result: os.stat_result, kind: str) -> Optional[str]:
+        """
+        Busca um hash válido para o arquivo
+
+        Args:
+            path: Caminho do arquivo
+            stat_result: Resultado de os.stat do arquivo
+            kind: 'partial' ou 'full'
+
+        Returns:
+            Hash armazenado ou None se ausente/desatualizado
+        """
+        column = 'partial_hash' if kind == 'partial' else 'full_hash'
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {column} FROM file_hashes WHERE path = ? AND size = ? AND mtime_ns = ? AND file_id = ?",
+                (path, stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino)
+            ).fetchone()
+
+        if row and row[0]:
+            self.hits += 1
+            return row[0]
+
+        self.misses += 1
+        return None
+
+    def store(self, path: str, stat_result: os.stat_result,
+              partial_hash: Optional[str] = None, full_hash: Optional[str] = None) -> None:
+        """Grava os hashes de um arquivo, preservando os já conhecidos da mesma versão"""
+        key = (stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, file_id, partial_hash, full_hash FROM file_hashes WHERE path = ?",
+                (path,)
+            ).fetchone()
+
+            if row and tuple(row[:3]) == key:
+                partial_hash = partial_hash or row[3]
+                full_hash = full_hash or row[4]
+
+            self._conn.execute(
+                """INSERT OR REPLACE INTO file_hashes
+                   (path, size, mtime_ns, file_id, partial_hash, full_hash, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (path, *key, partial_hash, full_hash, time.time())
+            )
+
+            # Commit em lotes para não pagar um fsync por arquivo
+            self._pending_writes += 1
+            if self._pending_writes >= 500:
+                self._conn.commit()
+                self._pending_writes = 0
+
+    def prune(self, roots: Optional[Iterable[str]] = None) -> int:
+        """
+        Remove entradas de arquivos que não existem mais
+
+        Args:
+            roots: Limita a verificação a estes diretórios (None = índice inteiro)
+
+        Returns:
+            Número de entradas removidas
+        """
+        with self._lock:
+            if roots:
+                paths = []
+                for root in roots:
+                    prefix = os.path.join(os.path.normpath(root), '')
+                    paths.extend(
+                        row[0] for row in self._conn.execute(
+                            "SELECT path FROM file_hashes WHERE substr(path, 1, ?) = ?",
+                            (len(prefix), prefix)
+                        )
+                    )
+            else:
+                paths = [row[0] for row in self._conn.execute("SELECT path FROM file_hashes")]
+
+        vanished = [(path,) for path in paths if not os.path.isfile(path)]
+
+        with self._lock:
+            self._conn.executemany("DELETE FROM file_hashes WHERE path = ?", vanished)
+            self._conn.commit()
+            self._pending_writes = 0
+
+        if vanished:
+            self.logger.info(f"Índice de hashes: {len(vanished)} entradas removidas")
+        return len(vanished)
+
+    def invalidate(self) -> None:
+        """Apaga todos os hashes armazenados"""
+        with self._lock:
+            self._conn.execute("DELETE FROM file_hashes")
+            self._conn.commit()
+            self._pending_writes = 0
+        self.logger.info("Índice de hashes invalidado")
+
+    def reset_counters(self) -> None:
+        """Zera os contadores de acertos e falhas"""
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna contadores de uso e tamanho do índice"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM file_hashes").fetchone()[0]
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': entries,
+            'algorithm': self.algorithm
+        }
+
+    def commit(self) -> None:
+        """Grava escritas pendentes no disco"""
+        with self._lock:
+            self._conn.commit()
+            self._pending_writes = 0
+
+    def close(self) -> None:
+        """Fecha o banco de dados"""
+        self.commit()
+        with self._lock:
+            self._conn.close()
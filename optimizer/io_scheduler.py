@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agendador de E/S por Dispositivo
+================================
+
+Varreduras e hashes que passam por C:, D: e E: em sequência deixam discos
+parados; um pool único de threads resolve isso, mas em um HD mecânico
+várias leituras ao mesmo tempo fazem a cabeça de leitura pular de um lado
+para o outro e tudo fica mais lento.
+
+Este módulo descobre em qual disco físico cada caminho está (partições do
+psutil + número do disco / dispositivo de bloco) e mantém uma fila por
+disco, com concorrência de acordo com o tipo: alta em NVMe e SSD, um
+trabalho por vez em discos rotacionais. Discos diferentes trabalham em
+paralelo.
+
+Funcionalidades:
+- Mapeamento caminho -> disco físico (partições do mesmo disco dividem a fila)
+- Tipo do disco: NVMe, SSD, HD (rotacional), rede ou desconhecido
+- Fila por disco com concorrência por tipo (configurável)
+- submit(): trabalhos curtos de E/S (listar pasta, calcular hash)
+- run_per_device(): tarefas longas, uma thread por disco
+"""
+
+import os
+import sys
+import logging
+import threading
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import psutil
+
+# Trabalhos simultâneos por tipo de disco
+DEFAULT_CONCURRENCY = {
+    'nvme': 8,
+    'ssd': 4,
+    'hdd': 1,
+    'network': 2,
+    'unknown': 2
+}
+
+
+@dataclass
+class StorageDevice:
+    """Disco físico e os pontos de montagem (letras de unidade) nele"""
+    device_id: str
+    kind: str
+    mountpoints: List[str] = field(default_factory=list)
+
+
+def _linux_disk(device: str) -> Tuple[str, str]:
+    """Disco de uma partição (/dev/sda1 -> sda) e o tipo pelo /sys/block"""
+    name = os.path.basename(os.path.realpath(device))
+    sys_path = os.path.join('/sys/class/block', name)
+    if not os.path.exists(sys_path):
+        return device, 'unknown'
+    if os.path.exists(os.path.join(sys_path, 'partition')):
+        name = os.path.basename(os.path.dirname(os.path.realpath(sys_path)))
+
+    if name.startswith('nvme'):
+        return name, 'nvme'
+    try:
+        with open(os.path.join('/sys/block', name, 'queue', 'rotational'), 'r') as f:
+            return name, 'hdd' if f.read().strip() == '1' else 'ssd'
+    except OSError:
+        return name, 'unknown'
+
+
+def _windows_disks() -> Dict[str, Tuple[str, str]]:
+    """Letra da unidade -> (número do disco, tipo), pelo Get-PhysicalDisk"""
+    script = (
+        "Get-Partition | Where-Object DriveLetter | ForEach-Object { "
+        "$p = Get-PhysicalDisk | Where-Object DeviceId -eq $_.DiskNumber; "
+        "'{0};{1};{2};{3}' -f $_.DriveLetter, $_.DiskNumber, $p.MediaType, $p.BusType }"
+    )
+    disks = {}
+    try:
+        result = subprocess.run(['powershell', '-NoProfile', '-Command', script],
+                                capture_output=True, text=True, timeout=20,
+                                creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+    except (OSError, subprocess.SubprocessError):
+        return disks
+
+    for line in result.stdout.splitlines():
+        parts = [part.strip() for part in line.split(';')]
+        if len(parts) != 4 or not parts[0]:
+            continue
+        letter, number, media, bus = parts
+        if bus.lower() == 'nvme':
+            kind = 'nvme'
+        elif media.lower() == 'ssd':
+            kind = 'ssd'
+        elif media.lower() == 'hdd':
+            kind = 'hdd'
+        else:
+            kind = 'unknown'
+        disks[letter.upper()] = (f"disk{number}", kind)
+    return disks
+
+
+def detect_devices() -> Dict[str, StorageDevice]:
+    """
+    Pontos de montagem (normalizados) -> disco físico
+
+    Partições do mesmo disco apontam para o mesmo StorageDevice.
+    """
+    windows_disks = _windows_disks() if sys.platform == 'win32' else {}
+    devices: Dict[str, StorageDevice] = {}
+    mounts: Dict[str, StorageDevice] = {}
+
+    for partition in psutil.disk_partitions(all=False):
+        mountpoint = partition.mountpoint
+        if sys.platform == 'win32':
+            letter = mountpoint[:1].upper()
+            if 'remote' in partition.opts:
+                device_id, kind = f"network:{letter}", 'network'
+            else:
+                device_id, kind = windows_disks.get(letter, (f"volume:{letter}", 'unknown'))
+        elif partition.fstype in ('nfs', 'nfs4', 'cifs', 'smbfs', 'sshfs', 'fuse.sshfs'):
+            device_id, kind = f"network:{partition.device}", 'network'
+        else:
+            device_id, kind = _linux_disk(partition.device)
+
+        device = devices.setdefault(device_id, StorageDevice(device_id, kind))
+        device.mountpoints.append(mountpoint)
+        mounts[os.path.normcase(mountpoint)] = device
+    return mounts
+
+
+class IOScheduler:
+    """Filas de E/S por disco físico"""
+
+    def __init__(self, concurrency: Optional[Dict[str, int]] = None,
+                 devices: Optional[Dict[str, StorageDevice]] = None):
+        """
+        Args:
+            concurrency: Trabalhos simultâneos por tipo (padrão: DEFAULT_CONCURRENCY)
+            devices: Ponto de montagem -> disco (padrão: detect_devices())
+        """
+        self.logger = logging.getLogger(__name__)
+        self.concurrency = dict(DEFAULT_CONCURRENCY)
+        if concurrency:
+            self.concurrency.update(concurrency)
+        self._devices = devices
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+
+    def _get_devices(self) -> Dict[str, StorageDevice]:
+        if self._devices is None:
+            try:
+                self._devices = detect_devices()
+            except Exception as e:
+                self.logger.warning(f"Erro ao detectar discos: {e}")
+                self._devices = {}
+            for mountpoint, device in self._devices.items():
+                self.logger.debug(f"Disco {device.device_id} ({device.kind}): {mountpoint}")
+        return self._devices
+
+    def device_for(self, path: str) -> StorageDevice:
+        """Disco onde o caminho está (ponto de montagem mais longo que o contém)"""
+        path = os.path.normcase(os.path.abspath(path))
+        best = None
+        for mountpoint, device in self._get_devices().items():
+            root = mountpoint.rstrip(os.sep) + os.sep
+            if path == mountpoint or path.startswith(root):
+                if best is None or len(mountpoint) > len(best[0]):
+                    best = (mountpoint, device)
+        if best is None:
+            return StorageDevice('unknown', 'unknown')
+        return best[1]
+
+    def concurrency_for(self, path: str) -> int:
+        """Trabalhos simultâneos aceitos pelo disco do caminho"""
+        return max(1, self.concurrency.get(self.device_for(path).kind, 1))
+
+    def _executor_for(self, device: StorageDevice) -> ThreadPoolExecutor:
+        with self._lock:
+            executor = self._executors.get(device.device_id)
+            if executor is None:
+                workers = max(1, self.concurrency.get(device.kind, 1))
+                executor = ThreadPoolExecutor(max_workers=workers,
+                                              thread_name_prefix=f"io-{device.device_id}")
+                self._executors[device.device_id] = executor
+            return executor
+
+    def submit(self, path: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Coloca um trabalho curto na fila do disco de path
+
+        O trabalho não deve esperar outros trabalhos do agendador (com um
+        único worker no disco isso travaria a fila).
+        """
+        return self._executor_for(self.device_for(path)).submit(fn, *args, **kwargs)
+
+    def group_by_device(self, paths: Iterable[str]) -> Dict[str, List[str]]:
+        """Caminhos agrupados por disco, mantendo a ordem"""
+        groups: Dict[str, List[str]] = {}
+        for path in paths:
+            groups.setdefault(self.device_for(path).device_id, []).append(path)
+        return groups
+
+    def run_per_device(self, items: Iterable[Any], fn: Callable[[Any], Any],
+                       key: Callable[[Any], str] = lambda item: item,
+                       wrapper: Optional[Callable[[Callable[[], None]], None]] = None) -> List[Tuple[Any, Any]]:
+        """
+        Executa fn(item) para cada item: em sequência dentro de um disco e
+        em paralelo entre discos (uma thread por disco)
+
+        Args:
+            items: Itens a processar
+            fn: Função chamada com cada item
+            key: Caminho de um item (padrão: o próprio item)
+            wrapper: Envolve o trabalho de cada thread (ex.: entrar em um BackgroundThrottle)
+
+        Returns:
+            Lista de (item, resultado) na ordem dos itens; exceções viram o resultado
+        """
+        items = list(items)
+        groups: Dict[str, List[int]] = {}
+        for position, item in enumerate(items):
+            groups.setdefault(self.device_for(key(item)).device_id, []).append(position)
+
+        results: List[Any] = [None] * len(items)
+
+        def run_group(positions):
+            for position in positions:
+                try:
+                    results[position] = fn(items[position])
+                except Exception as e:
+                    results[position] = e
+
+        def thread_body(positions):
+            if wrapper is not None:
+                wrapper(lambda: run_group(positions))
+            else:
+                run_group(positions)
+
+        if len(groups) <= 1:
+            for positions in groups.values():
+                thread_body(positions)
+        else:
+            threads = [threading.Thread(target=thread_body, args=(positions,),
+                                        name=f"io-device-{device_id}", daemon=True)
+                       for device_id, positions in groups.items()]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return list(zip(items, results))
+
+    def get_devices(self) -> List[Dict[str, Any]]:
+        """Discos detectados, com o tipo e a concorrência usada"""
+        seen = {}
+        for device in self._get_devices().values():
+            seen[device.device_id] = {
+                'device_id': device.device_id,
+                'kind': device.kind,
+                'mountpoints': list(device.mountpoints),
+                'concurrency': max(1, self.concurrency.get(device.kind, 1))
+            }
+        return list(seen.values())
+
+    def shutdown(self) -> None:
+        """Encerra as filas (aguarda os trabalhos em andamento)"""
+        with self._lock:
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown(wait=True)
+
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_io_scheduler() -> IOScheduler:
+    """Agendador compartilhado (as filas por disco valem para todo o programa)"""
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = IOScheduler()
+        return _default_scheduler
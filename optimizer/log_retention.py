@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Retenção de Logs, Relatórios e Backups
+======================================
+
+O otimizador grava um log por execução, um relatório por benchmark em
+logs/reports e backups em logs/backups. Em máquinas que rodam a cada boot
+a pasta cresce sem limite. Este módulo mantém cada grupo dentro dos
+limites do config.json (seção "logging").
+
+Funcionalidades:
+- Compressão gzip em fluxo (sem carregar o arquivo na memória) dos
+  arquivos antigos, preservando a data de modificação
+- Limites por grupo: quantidade (max_log_files), tamanho total
+  (max_log_size_mb) e idade (max_log_age_days); saem os mais antigos
+- O log da execução atual nunca é tocado
+- O backup mais antigo de cada tipo (as configurações originais, de antes
+  do primeiro ajuste) nunca é apagado, só comprimido
+- Índice dos relatórios (logs/reports/index.json) para listar sem abrir
+  cada arquivo
+"""
+
+import os
+import re
+import gzip
+import json
+import shutil
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_DIR = os.path.join(BASE_DIR, 'logs')
+CONFIG_FILE = os.path.join(BASE_DIR, 'config.json')
+INDEX_NAME = 'index.json'
+MIN_COMPRESS_BYTES = 4096  # Abaixo disso o gzip quase não reduz
+
+DEFAULT_CONFIG = {
+    'max_log_files': 10,
+    'max_log_size_mb': 50,
+    'max_log_age_days': 30,
+    'compress_logs': True,
+    'compress_after_hours': 24
+}
+
+# Grupo -> (subpasta, extensões); o restante de logs/ (índices, quarentena) fica intocado
+ARTIFACT_GROUPS = {
+    'logs': ('', ('.log',)),
+    'reports': ('reports', ('.json', '.txt', '.log')),
+    'backups': ('backups', ('.json',))
+}
+
+_TIMESTAMP = re.compile(r'(\d{8}_\d{6})')
+_BACKUP_TYPE = re.compile(r'^(.*)_backup_')
+_index_lock = threading.Lock()
+
+
+def load_retention_config(config_file: str = CONFIG_FILE) -> Dict[str, Any]:
+    """Limites da seção "logging" do config.json, com os valores padrão"""
+    config = dict(DEFAULT_CONFIG)
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            section = json.load(f).get('logging', {})
+        config.update({key: section[key] for key in DEFAULT_CONFIG if key in section})
+    except (OSError, ValueError, AttributeError):
+        pass
+    return config
+
+
+def compress_file(path: str) -> Optional[str]:
+    """
+    Comprime um arquivo com gzip em fluxo e remove o original
+
+    Returns:
+        Caminho do .gz, ou None se falhou
+    """
+    target = path + '.gz'
+    temp = target + '.tmp'
+    try:
+        stat = os.stat(path)
+        with open(path, 'rb') as src, gzip.open(temp, 'wb', compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.utime(temp, (stat.st_atime, stat.st_mtime))
+        os.replace(temp, target)
+        os.remove(path)
+        return target
+    except OSError:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        return None
+
+
+def open_artifact(path: str, mode: str = 'rt'):
+    """Abre um artefato comprimido (.gz) ou não"""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode, encoding='utf-8' if 't' in mode else None)
+    return open(path, mode, encoding='utf-8' if 't' in mode else None)
+
+
+def _active_files() -> set:
+    """Arquivos abertos pelos FileHandler do logging nesta execução"""
+    active = set()
+    for logger in [logging.getLogger()] + [l for l in logging.Logger.manager.loggerDict.values()
+                                          if isinstance(l, logging.Logger)]:
+        for handler in logger.handlers:
+            filename = getattr(handler, 'baseFilename', None)
+            if filename:
+                active.add(os.path.normcase(os.path.abspath(filename)))
+    return active
+
+
+def _original_name(name: str) -> str:
+    return name[:-3] if name.endswith('.gz') else name
+
+
+def _original_backups(artifacts: List[Dict[str, Any]]) -> set:
+    """Caminhos do backup mais antigo de cada tipo (<tipo>_backup_<data>.json)"""
+    oldest = {}
+    for item in artifacts:  # Mais recentes primeiro: o último de cada tipo é o original
+        match = _BACKUP_TYPE.match(_original_name(item['name']))
+        oldest[match.group(1) if match else _original_name(item['name'])] = item['path']
+    return set(oldest.values())
+
+
+class RetentionManager:
+    """Aplica compressão e limites aos artefatos em logs/"""
+
+    def __init__(self, log_dir: str = LOG_DIR, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            log_dir: Pasta de logs do otimizador
+            config: Limites (padrão: load_retention_config())
+        """
+        self.logger = logging.getLogger(__name__)
+        self.log_dir = log_dir
+        self.config = dict(DEFAULT_CONFIG)
+        self.config.update(config if config is not None else load_retention_config())
+
+    @property
+    def reports_dir(self) -> str:
+        return os.path.join(self.log_dir, ARTIFACT_GROUPS['reports'][0])
+
+    def _list_group(self, group: str) -> List[Dict[str, Any]]:
+        subdir, extensions = ARTIFACT_GROUPS[group]
+        directory = os.path.join(self.log_dir, subdir)
+        artifacts = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = _original_name(entry.name)
+                    if name == INDEX_NAME or not name.endswith(extensions):
+                        continue
+                    try:
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    artifacts.append({'path': entry.path, 'name': entry.name, 'size': stat.st_size,
+                                      'mtime': stat.st_mtime, 'compressed': entry.name.endswith('.gz')})
+        except OSError:
+            pass
+        artifacts.sort(key=lambda item: item['mtime'], reverse=True)  # Mais recentes primeiro
+        return artifacts
+
+    def enforce(self) -> Dict[str, Any]:
+        """
+        Comprime e apaga artefatos antigos de todos os grupos
+
+        Returns:
+            Dicionário por grupo com 'compressed', 'deleted', 'bytes_saved' e 'kept'
+        """
+        active = _active_files()
+        now = time.time()
+        compress_before = now - self.config['compress_after_hours'] * 3600
+        max_age = self.config['max_log_age_days'] * 86400
+        max_files = max(1, int(self.config['max_log_files']))
+        max_bytes = self.config['max_log_size_mb'] * 1024 * 1024
+
+        summary = {}
+        for group in ARTIFACT_GROUPS:
+            result = {'compressed': 0, 'deleted': 0, 'bytes_saved': 0, 'kept': 0}
+            artifacts = [item for item in self._list_group(group)
+                         if os.path.normcase(os.path.abspath(item['path'])) not in active]
+
+            protected = _original_backups(artifacts) if group == 'backups' else set()
+
+            # Quantidade e idade primeiro, para não comprimir o que vai ser apagado
+            removed = []
+            survivors = []
+            position = 0
+            for item in artifacts:
+                if item['path'] in protected:
+                    survivors.append(item)
+                    continue
+                if position >= max_files or now - item['mtime'] > max_age:
+                    if self._delete(item, result):
+                        removed.append(item['name'])
+                        continue
+                position += 1
+                survivors.append(item)
+
+            if self.config['compress_logs']:
+                for item in survivors:
+                    if (item['compressed'] or item['mtime'] > compress_before
+                            or item['size'] < MIN_COMPRESS_BYTES):
+                        continue
+                    compressed = compress_file(item['path'])
+                    if compressed:
+                        new_size = os.path.getsize(compressed)
+                        result['compressed'] += 1
+                        result['bytes_saved'] += item['size'] - new_size
+                        self._rename_in_index(group, item['name'], os.path.basename(compressed))
+                        if item['path'] in protected:
+                            protected.add(compressed)
+                        item.update({'path': compressed, 'name': os.path.basename(compressed),
+                                     'size': new_size, 'compressed': True})
+
+            # Tamanho total: os mais recentes ficam enquanto couberem
+            total = 0
+            for item in survivors:
+                if item['path'] in protected:
+                    result['kept'] += 1
+                    continue
+                total += item['size']
+                if total > max_bytes and self._delete(item, result):
+                    removed.append(item['name'])
+                    total -= item['size']
+                else:
+                    result['kept'] += 1
+
+            if group == 'reports' and removed:
+                self._remove_from_index(removed)
+            summary[group] = result
+
+        deleted = sum(result['deleted'] for result in summary.values())
+        compressed = sum(result['compressed'] for result in summary.values())
+        if deleted or compressed:
+            self.logger.info(f"Retenção de logs: {compressed} comprimidos, {deleted} removidos")
+        return summary
+
+    @staticmethod
+    def _delete(item: Dict[str, Any], result: Dict[str, int]) -> bool:
+        try:
+            os.remove(item['path'])
+        except OSError:
+            return False
+        result['deleted'] += 1
+        result['bytes_saved'] += item['size']
+        return True
+
+    def enforce_in_background(self) -> threading.Thread:
+        """Executa enforce() em uma thread de fundo (não atrasa a inicialização)"""
+        def worker():
+            try:
+                self.enforce()
+            except Exception as e:
+                self.logger.warning(f"Erro na retenção de logs: {e}")
+
+        thread = threading.Thread(target=worker, name='log-retention', daemon=True)
+        thread.start()
+        return thread
+
+    # Índice de relatórios
+
+    def _index_path(self) -> str:
+        return os.path.join(self.reports_dir, INDEX_NAME)
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                return json.load(f).get('reports', {})
+        except (OSError, ValueError, AttributeError):
+            return self._rebuild_index()
+
+    def _save_index(self, reports: Dict[str, Dict[str, Any]]) -> None:
+        os.makedirs(self.reports_dir, exist_ok=True)
+        temp = self._index_path() + '.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'reports': reports}, f, ensure_ascii=False)
+        os.replace(temp, self._index_path())
+
+    def _rebuild_index(self) -> Dict[str, Dict[str, Any]]:
+        """Índice a partir dos nomes dos arquivos (sem abri-los)"""
+        reports = {}
+        for item in self._list_group('reports'):
+            name = _original_name(item['name'])
+            reports[name] = self._index_entry(item['name'], item['size'], item['mtime'])
+        return reports
+
+    @staticmethod
+    def _index_entry(file_name: str, size: int, mtime: float,
+                     summary: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        name = _original_name(file_name)
+        match = _TIMESTAMP.search(name)
+        if match:
+            timestamp = datetime.strptime(match.group(1), '%Y%m%d_%H%M%S').isoformat()
+            kind = name[:match.start()].rstrip('_') or 'report'
+        else:
+            timestamp = datetime.fromtimestamp(mtime).isoformat()
+            kind = os.path.splitext(name)[0]
+        return {'file': file_name, 'kind': kind, 'timestamp': timestamp, 'size': size,
+                'compressed': file_name.endswith('.gz'), 'summary': summary or {}}
+
+    def register_report(self, path: str, summary: Optional[Dict[str, Any]] = None) -> None:
+        """Adiciona um relatório recém-gravado ao índice"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        with _index_lock:
+            reports = self._load_index()
+            entry = self._index_entry(os.path.basename(path), stat.st_size, stat.st_mtime, summary)
+            reports[_original_name(os.path.basename(path))] = entry
+            self._save_index(reports)
+
+    def _rename_in_index(self, group: str, old_name: str, new_name: str) -> None:
+        if group != 'reports':
+            return
+        with _index_lock:
+            reports = self._load_index()
+            entry = reports.get(_original_name(old_name))
+            if entry is None:
+                return
+            entry['file'] = new_name
+            entry['compressed'] = new_name.endswith('.gz')
+            try:
+                entry['size'] = os.path.getsize(os.path.join(self.reports_dir, new_name))
+            except OSError:
+                pass
+            self._save_index(reports)
+
+    def _remove_from_index(self, names: List[str]) -> None:
+        with _index_lock:
+            reports = self._load_index()
+            for name in names:
+                reports.pop(_original_name(name), None)
+            self._save_index(reports)
+
+    def list_reports(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Relatórios do índice, do mais recente para o mais antigo
+
+        Args:
+            kind: Filtra pelo tipo (prefixo do nome, ex.: 'benchmark_report')
+        """
+        with _index_lock:
+            reports = list(self._load_index().values())
+        if kind:
+            reports = [entry for entry in reports if entry['kind'] == kind]
+        for entry in reports:
+            entry['path'] = os.path.join(self.reports_dir, entry['file'])
+        reports.sort(key=lambda entry: entry['timestamp'], reverse=True)
+        return reports
+
+    def read_report(self, entry: Dict[str, Any]) -> Any:
+        """Conteúdo de um relatório do índice (JSON decodificado ou texto)"""
+        path = entry.get('path') or os.path.join(self.reports_dir, entry['file'])
+        with open_artifact(path) as f:
+            content = f.read()
+        if _original_name(path).endswith('.json'):
+            return json.loads(content)
+        return content
@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Quarentena de Arquivos Removidos
+================================
+
+Em vez de apagar na hora, as limpezas movem arquivos e pastas para uma
+quarentena no mesmo volume. Mover é uma renomeação (O(1), mesmo para uma
+pasta inteira), então a limpeza termina quase instantaneamente e pode ser
+desfeita. Um purgador em segundo plano, com prioridade baixa, apaga de
+verdade as execuções mais antigas que o período de retenção.
+
+Funcionalidades:
+- Pasta de quarentena por volume (raiz do volume ou pasta do usuário)
+- Uma pasta e um manifesto por execução de limpeza
+- Desfazer uma execução inteira
+- Purga das execuções expiradas em thread de baixa prioridade
+- Exclusão direta quando não há quarentena possível no volume
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import errno
+import shutil
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .fs_walk import iter_files
+
+STORE_NAME = '.otimizador_quarentena'
+DEFAULT_RETENTION_DAYS = 7
+
+
+def tree_size(path: str) -> Tuple[int, int]:
+    """Retorna (arquivos, bytes) de um arquivo ou de uma pasta inteira"""
+    try:
+        if not os.path.isdir(path) or os.path.islink(path):
+            return 1, os.lstat(path).st_size
+    except OSError:
+        return 0, 0
+
+    files = 0
+    total = 0
+    for entry in iter_files([path]):
+        try:
+            total += entry.stat(follow_symlinks=False).st_size
+            files += 1
+        except OSError:
+            continue
+    return files, total
+
+
+def _set_background_priority() -> None:
+    """Coloca a thread atual em modo de segundo plano (CPU e E/S baixos no Windows)"""
+    if sys.platform != 'win32':
+        return
+    try:
+        import ctypes
+        THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN)
+    except Exception:
+        pass
+
+
+def _hide_directory(path: str) -> None:
+    """Marca a pasta como oculta no Windows"""
+    if sys.platform != 'win32':
+        return
+    try:
+        import ctypes
+        FILE_ATTRIBUTE_HIDDEN = 0x02
+        ctypes.windll.kernel32.SetFileAttributesW(path, FILE_ATTRIBUTE_HIDDEN)
+    except Exception:
+        pass
+
+
+class QuarantineRun:
+    """Uma execução de limpeza: tudo que ela mover pode ser desfeito em conjunto"""
+
+    def __init__(self, manager: 'QuarantineManager', run_id: str, label: str):
+        self.manager = manager
+        self.run_id = run_id
+        self.label = label
+        self.moved_files = 0
+        self.moved_size = 0
+        self.deleted_files = 0
+        self.deleted_size = 0
+        self._sequence = 0
+        self._run_dirs = {}  # pasta da quarentena -> pasta desta execução
+        self._manifest = None
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def total_files(self) -> int:
+        return self.moved_files + self.deleted_files
+
+    @property
+    def total_size(self) -> int:
+        return self.moved_size + self.deleted_size
+
+    def add(self, path: str, size: Optional[int] = None, files: Optional[int] = None) -> Optional[int]:
+        """
+        Remove um arquivo ou pasta movendo-o para a quarentena
+
+        Args:
+            path: Caminho a remover
+            size: Tamanho em bytes, se já conhecido (pastas são medidas se omitido)
+            files: Número de arquivos, se já conhecido
+
+        Returns:
+            Bytes liberados, ou None se não foi possível remover
+        """
+        if size is None or files is None:
+            measured_files, measured_size = tree_size(path)
+            size = measured_size if size is None else size
+            files = measured_files if files is None else files
+
+        run_dir = self._get_run_dir(path)
+        if run_dir is not None:
+            with self._lock:
+                self._sequence += 1
+                target = os.path.join(run_dir, f"{self._sequence:06d}_{os.path.basename(path)}")
+            try:
+                os.rename(path, target)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    return None
+            else:
+                self._record({
+                    'original': path,
+                    'quarantined': target,
+                    'size': size,
+                    'files': files,
+                    'is_dir': os.path.isdir(target)
+                })
+                with self._lock:
+                    self.moved_files += files
+                    self.moved_size += size
+                return size
+
+        # Sem quarentena no volume: exclusão direta, como antes
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        except OSError:
+            return None
+        with self._lock:
+            self.deleted_files += files
+            self.deleted_size += size
+        return size
+
+    def remove_tree(self, path: str) -> Optional[Tuple[int, int]]:
+        """Move uma pasta inteira; retorna (arquivos, bytes) ou None (gancho do CleaningEngine)"""
+        files, size = tree_size(path)
+        if self.add(path, size, files) is None:
+            return None
+        return files, size
+
+    def add_directory_contents(self, directory: str) -> Tuple[int, int]:
+        """
+        Move todo o conteúdo de uma pasta, mantendo a própria pasta
+
+        Subpastas são movidas inteiras; se uma delas não puder ser movida
+        (arquivo aberto lá dentro), o conteúdo dela é tentado item a item.
+
+        Returns:
+            Tupla (arquivos, bytes) removidos
+        """
+        removed_files = 0
+        removed_size = 0
+        stack = [directory]
+
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    entries = list(entries)
+            except OSError:
+                continue
+
+            for entry in entries:
+                if entry.name == STORE_NAME:
+                    continue  # Nunca move a própria quarentena
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if is_dir:
+                        files, size = tree_size(entry.path)
+                    else:
+                        files, size = 1, entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+
+                if self.add(entry.path, size, files) is not None:
+                    removed_files += files
+                    removed_size += size
+                elif is_dir:
+                    stack.append(entry.path)
+
+        return removed_files, removed_size
+
+    def _get_run_dir(self, path: str) -> Optional[str]:
+        """Pasta desta execução no volume do caminho (criada sob demanda)"""
+        store = self.manager.get_store(path)
+        if store is None:
+            return None
+
+        with self._lock:
+            run_dir = self._run_dirs.get(store)
+            if run_dir is None:
+                run_dir = os.path.join(store, self.run_id)
+                try:
+                    os.makedirs(run_dir, exist_ok=True)
+                except OSError:
+                    return None
+                self._run_dirs[store] = run_dir
+        return run_dir
+
+    def _record(self, entry: Dict[str, Any]) -> None:
+        """Acrescenta uma entrada ao manifesto (JSON por linha, gravado incrementalmente)"""
+        with self._lock:
+            if self._manifest is None:
+                self._manifest = open(self.manager.manifest_path(self.run_id), 'a', encoding='utf-8')
+                self._manifest.write(json.dumps({
+                    'run_id': self.run_id,
+                    'label': self.label,
+                    'created_at': time.time()
+                }, ensure_ascii=False) + '\n')
+            self._manifest.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def close(self) -> None:
+        """Grava o manifesto no disco"""
+        with self._lock:
+            if self._manifest is not None:
+                self._manifest.close()
+                self._manifest = None
+
+        if self.total_files:
+            self.logger.info(
+                f"Quarentena {self.run_id} ({self.label}): {self.moved_files} arquivos movidos, "
+                f"{self.deleted_files} excluídos diretamente"
+            )
+
+
+class QuarantineManager:
+    """Gerencia as pastas de quarentena, os manifestos e a purga"""
+
+    def __init__(self, manifest_dir: Optional[str] = None, retention_days: float = DEFAULT_RETENTION_DAYS,
+                 store_root: Optional[str] = None):
+        """
+        Args:
+            manifest_dir: Pasta dos manifestos (padrão: logs/quarantine)
+            retention_days: Dias que uma execução fica na quarentena antes da purga
+            store_root: Força uma única pasta de quarentena (usada se estiver no mesmo volume)
+        """
+        self.logger = logging.getLogger(__name__)
+
+        if manifest_dir is None:
+            manifest_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs', 'quarantine')
+        os.makedirs(manifest_dir, exist_ok=True)
+
+        self.manifest_dir = manifest_dir
+        self.retention_days = retention_days
+        self.store_root = store_root
+
+        self._stores = {}  # st_dev -> pasta de quarentena (ou None)
+        self._lock = threading.Lock()
+        self._purge_thread = None
+        self._purge_stop = threading.Event()
+
+    def begin_run(self, label: str) -> QuarantineRun:
+        """Inicia uma execução de limpeza"""
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        return QuarantineRun(self, run_id, label)
+
+    def manifest_path(self, run_id: str) -> str:
+        return os.path.join(self.manifest_dir, f'{run_id}.jsonl')
+
+    def get_store(self, path: str) -> Optional[str]:
+        """Pasta de quarentena no mesmo volume do caminho, ou None se não houver"""
+        try:
+            device = os.lstat(path).st_dev
+        except OSError:
+            return None
+
+        with self._lock:
+            if device in self._stores:
+                return self._stores[device]
+
+        if self.store_root:
+            candidates = [os.path.join(self.store_root, STORE_NAME)]
+        else:
+            candidates = [
+                os.path.join(self._volume_root(path), STORE_NAME),
+                os.path.join(os.path.expanduser('~'), STORE_NAME)
+            ]
+
+        store = None
+        for candidate in candidates:
+            try:
+                created = not os.path.isdir(candidate)
+                os.makedirs(candidate, exist_ok=True)
+                if os.stat(candidate).st_dev != device:
+                    continue
+                if created:
+                    _hide_directory(candidate)
+                store = candidate
+                break
+            except OSError:
+                continue
+
+        with self._lock:
+            self._stores[device] = store
+        return store
+
+    @staticmethod
+    def _volume_root(path: str) -> str:
+        """Ponto de montagem (raiz do volume) de um caminho"""
+        path = os.path.abspath(path)
+        while not os.path.ismount(path):
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+        return path
+
+    def _read_manifest(self, run_id: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Lê o cabeçalho e as entradas de um manifesto"""
+        header = {}
+        entries = []
+        with open(self.manifest_path(run_id), 'r', encoding='utf-8') as f:
+            for number, line in enumerate(f):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Linha incompleta de uma execução interrompida
+                if number == 0:
+                    header = record
+                else:
+                    entries.append(record)
+        return header, entries
+
+    def list_runs(self) -> List[Dict[str, Any]]:
+        """Execuções em quarentena, da mais recente para a mais antiga"""
+        runs = []
+        for file_name in os.listdir(self.manifest_dir):
+            if not file_name.endswith('.jsonl'):
+                continue
+            run_id = file_name[:-len('.jsonl')]
+            try:
+                header, entries = self._read_manifest(run_id)
+            except OSError:
+                continue
+            runs.append({
+                'run_id': run_id,
+                'label': header.get('label', ''),
+                'created_at': header.get('created_at', 0),
+                'entries': len(entries),
+                'files': sum(entry.get('files', 1) for entry in entries),
+                'total_size': sum(entry.get('size', 0) for entry in entries)
+            })
+
+        runs.sort(key=lambda run: run['created_at'], reverse=True)
+        return runs
+
+    def undo_run(self, run_id: str) -> Dict[str, Any]:
+        """
+        Restaura todos os itens de uma execução para os caminhos originais
+
+        Itens cujo caminho original voltou a existir ficam na quarentena.
+        """
+        try:
+            header, entries = self._read_manifest(run_id)
+        except OSError as e:
+            self.logger.error(f"Manifesto da quarentena {run_id} não encontrado: {e}")
+            return {'restored': 0, 'failed': 0, 'restored_size': 0}
+
+        restored = 0
+        restored_size = 0
+        remaining = []
+        for entry in entries:
+            try:
+                if os.path.lexists(entry['original']):
+                    raise FileExistsError(entry['original'])
+                os.makedirs(os.path.dirname(entry['original']), exist_ok=True)
+                os.rename(entry['quarantined'], entry['original'])
+                restored += 1
+                restored_size += entry.get('size', 0)
+            except OSError as e:
+                if os.path.lexists(entry['quarantined']):
+                    self.logger.warning(f"Não foi possível restaurar {entry['original']}: {e}")
+                    remaining.append(entry)
+
+        self._rewrite_manifest(run_id, header, remaining)
+        for run_dir in {os.path.dirname(entry['quarantined']) for entry in entries}:
+            try:
+                os.rmdir(run_dir)  # Só remove se ficou vazia
+            except OSError:
+                pass
+        self.logger.info(f"Quarentena {run_id} desfeita: {restored} itens restaurados, {len(remaining)} pendentes")
+
+        return {
+            'restored': restored,
+            'failed': len(remaining),
+            'restored_size': restored_size
+        }
+
+    def purge_run(self, run_id: str) -> int:
+        """Apaga definitivamente uma execução; retorna os bytes liberados"""
+        try:
+            _, entries = self._read_manifest(run_id)
+        except OSError:
+            return 0
+
+        freed = 0
+        run_dirs = set()
+        for entry in entries:
+            path = entry['quarantined']
+            run_dirs.add(os.path.dirname(path))
+            try:
+                if os.path.isdir(path) and not os.path.islink(path):
+                    shutil.rmtree(path)
+                elif os.path.lexists(path):
+                    os.remove(path)
+                freed += entry.get('size', 0)
+            except OSError as e:
+                self.logger.warning(f"Erro ao purgar {path}: {e}")
+
+        for run_dir in run_dirs:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+        try:
+            os.remove(self.manifest_path(run_id))
+        except OSError:
+            pass
+        return freed
+
+    def purge_expired(self, retention_days: Optional[float] = None) -> Dict[str, int]:
+        """Apaga as execuções mais antigas que o período de retenção"""
+        if retention_days is None:
+            retention_days = self.retention_days
+        limit = time.time() - retention_days * 86400
+
+        purged_runs = 0
+        freed = 0
+        for run in self.list_runs():
+            if run['created_at'] <= limit:
+                freed += self.purge_run(run['run_id'])
+                purged_runs += 1
+
+        if purged_runs:
+            self.logger.info(f"Quarentena: {purged_runs} execuções purgadas")
+        return {'runs': purged_runs, 'freed_size': freed}
+
+    def _rewrite_manifest(self, run_id: str, header: Dict[str, Any], entries: List[Dict[str, Any]]) -> None:
+        """Regrava o manifesto com as entradas restantes (remove se vazio)"""
+        manifest = self.manifest_path(run_id)
+        if not entries:
+            try:
+                os.remove(manifest)
+            except OSError:
+                pass
+            return
+
+        temp_path = manifest + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(header, ensure_ascii=False) + '\n')
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        os.replace(temp_path, manifest)
+
+    def start_background_purge(self, interval_seconds: float = 3600) -> None:
+        """Inicia a purga periódica em uma thread de baixa prioridade"""
+        if self._purge_thread and self._purge_thread.is_alive():
+            return
+
+        self._purge_stop.clear()
+
+        def purge_loop():
+            _set_background_priority()
+            while not self._purge_stop.is_set():
+                try:
+                    self.purge_expired()
+                except Exception as e:
+                    self.logger.error(f"Erro na purga da quarentena: {e}")
+                self._purge_stop.wait(interval_seconds)
+
+        self._purge_thread = threading.Thread(target=purge_loop, name='quarantine-purge', daemon=True)
+        self._purge_thread.start()
+
+    def stop_background_purge(self) -> None:
+        """Interrompe a purga periódica"""
+        self._purge_stop.set()
+        if self._purge_thread:
+            self._purge_thread.join(timeout=5)
+            self._purge_thread = None
+
+
+_default_manager = None
+_default_manager_lock = threading.Lock()
+
+
+def get_quarantine_manager() -> QuarantineManager:
+    """Quarentena compartilhada pelos limpadores (inicia a purga em segundo plano)"""
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            _default_manager = QuarantineManager()
+            _default_manager.start_background_purge()
+        return _default_manager
@@ -8,6 +8,8 @@ from datetime import datetime, timedelta
 from enum import Enum
 from typing import Optional
 
+from .background import BackgroundThrottle
+
 class ScheduleType(Enum):
     """Tipos de agendamento disponíveis"""
     DAILY = "daily"
@@ -46,6 +48,20 @@ class ScheduleManager:
         self.config_file = "schedule_config.json"
         self.task_callbacks = {}
         
+        # Contador de espaço recuperável (opcional) para pular limpezas desnecessárias
+        self.space_tracker = None
+        self.min_reclaimable_bytes = 100 * 1024 * 1024
+        self.space_gated_tasks = {'quick_cleanup'}
+        
+        # Limpezas agendadas rodam em segundo plano (prioridade baixa, taxa limitada)
+        self.background_throttle = None
+        self.background_tasks = {'quick_cleanup', 'deep_cleanup', 'duplicate_cleanup'}
+        
+        # Limpeza parada por sistema ocupado (jogo aberto etc.): o restante roda mais tarde
+        self.busy_retry_minutes = 30
+        self.max_busy_retries = 6
+        self.busy_retries = {}
+        
         # Configurações padrão
         self.default_schedules = {
             'quick_cleanup': {
@@ -104,6 +120,7 @@ class ScheduleManager:
     def stop_scheduler(self):
         """Para o agendador"""
         self.running = False
+        self.cancel_running_tasks()
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=5.0)
         
@@ -208,12 +225,14 @@ class ScheduleManager:
         """Cancela agendamento de uma tarefa"""
         try:
             schedule.clear(task.task_id)
+            schedule.clear(f"{task.task_id}_retry")
+            self.busy_retries.pop(task.task_id, None)
             task.next_run = None
             self.logger.info(f"Agendamento cancelado: {task.name}")
         except Exception as e:
             self.logger.error(f"Erro ao cancelar agendamento {task.task_id}: {e}")
     
-    def _run_task(self, task_id):
+    def _run_task(self, task_id, force=False):
         """Executa uma tarefa agendada"""
         if task_id not in self.tasks:
             return
@@ -222,12 +241,31 @@ class ScheduleManager:
         start_time = datetime.now()
         
         try:
+            if not force and not self._cleanup_worthwhile(task):
+                # Pouco espaço a recuperar: adia para a próxima execução
+                task.last_run = start_time
+                task.next_run = self._calculate_next_run(task)
+                self.save_configuration()
+                return
+            
             self.logger.info(f"Executando tarefa agendada: {task.name}")
             
             # Verificar se existe callback registrado
             if task.task_type in self.task_callbacks:
                 callback = self.task_callbacks[task.task_type]
-                success = callback(task_id, task.task_type)
+                if task.task_type in self.background_tasks:
+                    throttle = self._get_background_throttle()
+                    throttle.reset()
+                    with throttle:
+                        success = callback(task_id, task.task_type)
+                    if throttle.busy_timeout:
+                        self._schedule_busy_retry(task)
+                    elif throttle.interrupted:
+                        self.logger.info(f"Tarefa '{task.name}' interrompida antes do fim")
+                    else:
+                        self.busy_retries.pop(task_id, None)
+                else:
+                    success = callback(task_id, task.task_type)
             else:
                 self.logger.warning(f"Nenhum callback registrado para tipo: {task.task_type}")
                 success = False
@@ -258,6 +296,27 @@ class ScheduleManager:
             task.error_count += 1
             self.logger.error(f"Erro ao executar tarefa {task_id}: {e}")
     
+    def _schedule_busy_retry(self, task):
+        """Reagenda o restante de uma limpeza que parou porque o sistema ficou ocupado"""
+        retries = self.busy_retries.get(task.task_id, 0) + 1
+        if retries > self.max_busy_retries:
+            self.busy_retries.pop(task.task_id, None)
+            self.logger.info(f"Tarefa '{task.name}': sistema ocupado, restante fica para a próxima execução")
+            return
+        
+        self.busy_retries[task.task_id] = retries
+        schedule.every(self.busy_retry_minutes).minutes.do(
+            self._run_busy_retry, task.task_id
+        ).tag(f"{task.task_id}_retry")
+        self.logger.info(
+            f"Tarefa '{task.name}' pausada por sistema ocupado; restante em {self.busy_retry_minutes} min"
+        )
+    
+    def _run_busy_retry(self, task_id):
+        """Continua uma limpeza reagendada (o que já foi removido não é refeito)"""
+        self._run_task(task_id, force=True)
+        return schedule.CancelJob
+    
     def _run_startup_task(self, task_id):
         """Executa tarefa de startup (apenas uma vez)"""
         self._run_task(task_id)
@@ -340,6 +399,45 @@ class ScheduleManager:
         self.task_callbacks[task_type] = callback
         self.logger.info(f"Callback registrado para tipo: {task_type}")
     
+    def attach_space_tracker(self, tracker, min_reclaimable_mb=100):
+        """
+        Usa um ReclaimableSpaceTracker para decidir se limpezas agendadas valem a pena
+        
+        Args:
+            tracker: Contador de espaço recuperável já iniciado
+            min_reclaimable_mb: Mínimo de espaço recuperável para executar a limpeza
+        """
+        self.space_tracker = tracker
+        self.min_reclaimable_bytes = int(min_reclaimable_mb * 1024 * 1024)
+    
+    def set_background_throttle(self, throttle):
+        """Define o BackgroundThrottle usado pelas limpezas agendadas"""
+        self.background_throttle = throttle
+    
+    def cancel_running_tasks(self):
+        """Interrompe a limpeza em segundo plano em andamento (o que já foi removido fica removido)"""
+        if self.background_throttle is not None:
+            self.background_throttle.cancel()
+    
+    def _get_background_throttle(self):
+        if self.background_throttle is None:
+            self.background_throttle = BackgroundThrottle()
+        return self.background_throttle
+    
+    def _cleanup_worthwhile(self, task):
+        """Verifica se há espaço suficiente para justificar uma limpeza agendada"""
+        if self.space_tracker is None or task.task_type not in self.space_gated_tasks:
+            return True
+        
+        if self.space_tracker.worth_cleaning(self.min_reclaimable_bytes):
+            return True
+        
+        totals = self.space_tracker.get_totals()
+        self.logger.info(
+            f"Tarefa '{task.name}' pulada: apenas {totals['bytes_formatted']} recuperáveis"
+        )
+        return False
+    
     def get_scheduled_tasks(self):
         """Retorna lista de tarefas agendadas"""
         return {
@@ -464,7 +562,7 @@ class ScheduleManager:
     def run_task_now(self, task_id):
         """Executa uma tarefa imediatamente"""
         if task_id in self.tasks:
-            threading.Thread(target=self._run_task, args=(task_id,)).start()
+            threading.Thread(target=self._run_task, args=(task_id,), kwargs={'force': True}).start()
             return True
         return False
     
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gerenciador de Cache de Shaders por Jogo
+========================================
+
+Apagar todo o cache de shaders obriga cada jogo a recompilar tudo e
+travar (stutter) na próxima vez que abrir. Este módulo mapeia as entradas
+de cache para jogos quando possível e remove só o que não compensa manter.
+
+Entradas analisadas:
+- Steam: steamapps/shadercache/<appid> de cada biblioteca, com o nome do
+  jogo, se ainda está instalado e a última vez jogado (LastPlayed) vindos
+  do appmanifest_<appid>.acf
+- Drivers (D3DSCache, NVIDIA DXCache/GLCache, AMD DxCache/GLCache): cada
+  item da pasta é uma entrada; o jogo é reconhecido quando o nome do
+  executável aparece nos arquivos
+
+Regras, em ordem:
+1. Jogo desinstalado: cache removido
+2. Jogo jogado nos últimos keep_days (histórico de sessões do GameLauncher): mantido
+3. Sem uso há mais de max_age_days: removido (só Steam e caches de drivers
+   com jogo reconhecido; o driver lê o cache sem reescrevê-lo, então o mtime
+   sozinho não prova abandono)
+4. Acima do orçamento de espaço: removidos os de uso mais antigo (LRU)
+"""
+
+import os
+import re
+import json
+import time
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
+
+from .utils import Utils
+from .cleaning_engine import CleaningEngine, CleaningPolicy
+
+
+def _normalize(name: str) -> str:
+    """Nome de jogo comparável: só letras e números, minúsculas"""
+    return re.sub(r'[^a-z0-9]', '', (name or '').lower())
+
+
+def default_driver_cache_dirs() -> List[str]:
+    """Pastas de cache de shaders dos drivers e do DirectX"""
+    local = os.environ.get('LOCALAPPDATA', '')
+    return [
+        os.path.join(local, 'D3DSCache'),
+        os.path.join(local, 'NVIDIA', 'DXCache'),
+        os.path.join(local, 'NVIDIA', 'GLCache'),
+        os.path.join(local, 'AMD', 'DxCache'),
+        os.path.join(local, 'AMD', 'GLCache'),
+        os.path.join(local, 'AMD', 'VkCache'),
+        os.path.join(os.environ.get('TEMP', ''), 'NV_Cache'),
+        os.path.join(os.environ.get('PROGRAMDATA', ''), 'NVIDIA Corporation', 'NV_Cache'),
+    ]
+
+
+def default_steam_libraries() -> List[str]:
+    """Bibliotecas da Steam (registro e libraryfolders.vdf)"""
+    try:
+        from .game_scanner import GameScanner
+        scanner = GameScanner()
+        steam_path = scanner._get_steam_path()
+        if not steam_path:
+            return []
+        return [str(path) for path in scanner._get_steam_library_folders(steam_path)]
+    except Exception:
+        return []
+
+
+def _read_manifest(path: str) -> Dict[str, str]:
+    """Campos simples ("chave" "valor") de um appmanifest .acf"""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return dict(re.findall(r'"(\w+)"\s+"([^"]*)"', f.read()))
+    except OSError:
+        return {}
+
+
+def _entry_stats(path: str) -> Dict[str, Any]:
+    """Tamanho, arquivos, último uso (mtime mais recente) e nomes dos arquivos"""
+    size = 0
+    files = 0
+    last_used = 0.0
+    names = []
+
+    if os.path.isfile(path):
+        try:
+            stat = os.stat(path)
+            return {'size': stat.st_size, 'files': 1, 'last_used': stat.st_mtime,
+                    'names': [os.path.basename(path)]}
+        except OSError:
+            return {'size': 0, 'files': 0, 'last_used': 0.0, 'names': []}
+
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                            continue
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    size += stat.st_size
+                    files += 1
+                    last_used = max(last_used, stat.st_mtime)
+                    if len(names) < 64:
+                        names.append(entry.name)
+        except OSError:
+            continue
+    return {'size': size, 'files': files, 'last_used': last_used, 'names': names}
+
+
+class ShaderCacheManager:
+    """Poda seletiva dos caches de shaders por jogo"""
+
+    def __init__(self, keep_days: int = 30, max_age_days: int = 90,
+                 size_budget_mb: Optional[float] = 4096,
+                 stats_file: str = 'game_stats.json', games_cache_file: str = 'games_cache.json',
+                 steam_libraries: Optional[List[str]] = None,
+                 driver_cache_dirs: Optional[List[str]] = None):
+        """
+        Args:
+            keep_days: Caches de jogos jogados nesse período são sempre mantidos
+            max_age_days: Caches sem uso há mais tempo são removidos
+            size_budget_mb: Espaço máximo total dos caches (None = sem limite)
+            stats_file: Histórico de sessões do GameLauncher
+            games_cache_file: Jogos detectados pelo GameScanner (executáveis)
+            steam_libraries: Bibliotecas da Steam (padrão: detectadas)
+            driver_cache_dirs: Pastas de cache dos drivers (padrão: default_driver_cache_dirs())
+        """
+        self.logger = logging.getLogger(__name__)
+        self.keep_days = keep_days
+        self.max_age_days = max_age_days
+        self.size_budget_mb = size_budget_mb
+        self.stats_file = stats_file
+        self.games_cache_file = games_cache_file
+        self.steam_libraries = steam_libraries
+        self.driver_cache_dirs = driver_cache_dirs
+
+    def _recent_games(self) -> Set[str]:
+        """Nomes normalizados dos jogos com sessão nos últimos keep_days"""
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                sessions = json.load(f).get('sessions', [])
+        except (OSError, ValueError, AttributeError):
+            return set()
+
+        cutoff = datetime.now() - timedelta(days=self.keep_days)
+        recent = set()
+        for session in sessions:
+            try:
+                if datetime.fromisoformat(str(session.get('start_time'))) >= cutoff:
+                    recent.add(_normalize(session.get('game_name')))
+            except (TypeError, ValueError):
+                continue
+        recent.discard('')
+        return recent
+
+    def _known_executables(self) -> Dict[str, str]:
+        """Executável (nome sem extensão, minúsculo) -> nome do jogo"""
+        try:
+            with open(self.games_cache_file, 'r', encoding='utf-8') as f:
+                games = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        executables = {}
+        for game in games.values():
+            exe = os.path.splitext(os.path.basename(game.get('executable_path') or ''))[0].lower()
+            if len(exe) >= 4:  # Nomes curtos demais geram falsos positivos
+                executables[exe] = game.get('name', exe)
+        return executables
+
+    def scan(self) -> List[Dict[str, Any]]:
+        """
+        Lista as entradas de cache de shaders
+
+        Returns:
+            Lista de entradas com 'path', 'kind' ('steam' ou 'driver'),
+            'location', 'appid', 'game', 'installed', 'size', 'files' e 'last_used'
+        """
+        entries = []
+
+        libraries = self.steam_libraries if self.steam_libraries is not None else default_steam_libraries()
+        for library in dict.fromkeys(libraries):
+            steamapps = os.path.join(library, 'steamapps')
+            shadercache = os.path.join(steamapps, 'shadercache')
+            try:
+                appids = [entry.name for entry in os.scandir(shadercache) if entry.is_dir()]
+            except OSError:
+                continue
+            for appid in appids:
+                manifest = _read_manifest(os.path.join(steamapps, f'appmanifest_{appid}.acf'))
+                stats = _entry_stats(os.path.join(shadercache, appid))
+                try:
+                    last_played = float(manifest.get('LastPlayed') or 0)
+                except ValueError:
+                    last_played = 0.0
+                entries.append({
+                    'path': os.path.join(shadercache, appid),
+                    'kind': 'steam',
+                    'location': shadercache,
+                    'appid': appid,
+                    'game': manifest.get('name'),
+                    'installed': bool(manifest),
+                    'size': stats['size'],
+                    'files': stats['files'],
+                    # O cache é lido sem ser reescrito: o mtime fica velho mesmo jogando
+                    'last_used': max(stats['last_used'], last_played)
+                })
+
+        executables = self._known_executables()
+        cache_dirs = self.driver_cache_dirs if self.driver_cache_dirs is not None else default_driver_cache_dirs()
+        for cache_dir in dict.fromkeys(cache_dirs):
+            try:
+                items = [entry.path for entry in os.scandir(cache_dir)]
+            except OSError:
+                continue
+            for item in items:
+                stats = _entry_stats(item)
+                haystack = ' '.join([os.path.basename(item)] + stats['names']).lower()
+                game = next((name for exe, name in executables.items() if exe in haystack), None)
+                entries.append({
+                    'path': item,
+                    'kind': 'driver',
+                    'location': cache_dir,
+                    'appid': None,
+                    'game': game,
+                    'installed': None,  # Desconhecido para caches dos drivers
+                    'size': stats['size'],
+                    'files': stats['files'],
+                    'last_used': stats['last_used']
+                })
+
+        return entries
+
+    def plan(self, entries: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Decide o que remover e o que manter
+
+        Returns:
+            Dicionário com 'prune' e 'keep' (entradas com 'reason'),
+            'bytes_to_free' e 'bytes_kept'
+        """
+        if entries is None:
+            entries = self.scan()
+
+        now = time.time()
+        recent = self._recent_games()
+        max_age = self.max_age_days * 86400
+        prune = []
+        keep = []
+
+        for entry in entries:
+            entry = dict(entry)
+            if entry['installed'] is False:
+                entry['reason'] = 'uninstalled'
+                prune.append(entry)
+            elif entry['game'] and _normalize(entry['game']) in recent:
+                entry['reason'] = 'recent'
+                keep.append(entry)
+            elif entry['kind'] == 'driver' and not entry['game']:
+                # Sem jogo associado não dá para saber se ainda é usado: fica para o LRU
+                entry['reason'] = 'lru'
+                keep.append(entry)
+            elif entry['last_used'] and now - entry['last_used'] > max_age:
+                entry['reason'] = 'stale'
+                prune.append(entry)
+            else:
+                entry['reason'] = 'lru'
+                keep.append(entry)
+
+        # Orçamento: sai o uso mais antigo primeiro, nunca os jogos recentes
+        if self.size_budget_mb is not None:
+            budget = self.size_budget_mb * 1024 * 1024
+            kept_size = sum(entry['size'] for entry in keep)
+            for entry in sorted((e for e in keep if e['reason'] == 'lru'), key=lambda e: e['last_used']):
+                if kept_size <= budget:
+                    break
+                entry['reason'] = 'budget'
+                kept_size -= entry['size']
+            prune += [entry for entry in keep if entry['reason'] == 'budget']
+            keep = [entry for entry in keep if entry['reason'] != 'budget']
+
+        return {
+            'prune': prune,
+            'keep': keep,
+            'bytes_to_free': sum(entry['size'] for entry in prune),
+            'bytes_kept': sum(entry['size'] for entry in keep)
+        }
+
+    def prune(self, dry_run: bool = False, progress_callback=None) -> Dict[str, Any]:
+        """
+        Remove as entradas escolhidas por plan()
+
+        Returns:
+            Dicionário com 'files_deleted', 'bytes_freed', 'entries_removed',
+            'entries_kept', 'by_reason' (bytes por motivo) e o 'plan'
+        """
+        if progress_callback:
+            progress_callback("Analisando caches de shaders...", 0)
+
+        plan = self.plan()
+        engine = CleaningEngine(CleaningPolicy(remove_root=True), dry_run=dry_run)
+        result = {'files_deleted': 0, 'bytes_freed': 0, 'entries_removed': 0,
+                  'entries_kept': len(plan['keep']), 'by_reason': {}, 'plan': plan}
+
+        for index, entry in enumerate(plan['prune']):
+            if progress_callback:
+                label = entry['game'] or os.path.basename(entry['path'])
+                progress_callback(f"Removendo cache de shaders: {label}",
+                                  index / max(1, len(plan['prune'])) * 100)
+            try:
+                cleaned = engine.clean(entry['path'])
+            except Exception as e:
+                self.logger.warning(f"Erro ao remover {entry['path']}: {e}")
+                continue
+            result['files_deleted'] += cleaned['files_deleted']
+            result['bytes_freed'] += cleaned['bytes_freed']
+            result['entries_removed'] += 1
+            result['by_reason'][entry['reason']] = result['by_reason'].get(entry['reason'], 0) + cleaned['bytes_freed']
+
+        self.logger.info(
+            f"Cache de shaders: {Utils.format_size(result['bytes_freed'])} removidos em "
+            f"{result['entries_removed']} entradas, {Utils.format_size(plan['bytes_kept'])} mantidos"
+        )
+        if progress_callback:
+            progress_callback("Poda do cache de shaders concluída", 100)
+        return result
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Agrupamento por Tamanho em Memória Externa
+==========================================
+
+Permite procurar duplicatas em discos com milhões de arquivos sem manter
+um registro por arquivo na RAM. Os pares (tamanho, id do caminho) são
+gravados em arquivos ordenados no disco e depois intercalados para
+encontrar os tamanhos repetidos.
+
+Funcionalidades:
+- Caminhos gravados em um arquivo auxiliar (id = posição no arquivo)
+- Runs ordenados com tamanho limitado pelo teto de memória configurado
+- Intercalação (merge) dos runs entregando apenas grupos com colisão
+- Limpeza automática dos arquivos temporários
+"""
+
+import os
+import heapq
+import shutil
+import struct
+import tempfile
+import logging
+from typing import Iterator, List, Optional, Tuple
+
+RECORD = struct.Struct('<QQ')      # tamanho, posição do caminho
+PATH_LENGTH = struct.Struct('<I')  # prefixo de tamanho de cada caminho
+
+# Memória estimada por registro durante a ordenação (int Python + ponteiro da lista)
+BYTES_PER_RECORD = 48
+OFFSET_BITS = 40  # Até 1TB de caminhos no arquivo auxiliar
+
+
+class ExternalSizeGrouper:
+    """Agrupa arquivos por tamanho usando runs ordenados em disco"""
+
+    def __init__(self, max_memory_bytes: int = 64 * 1024 * 1024, temp_dir: Optional[str] = None):
+        """
+        Args:
+            max_memory_bytes: Teto de memória para os registros em RAM
+            temp_dir: Diretório para os arquivos temporários (None = padrão do sistema)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_records = max(1024, max_memory_bytes // BYTES_PER_RECORD)
+        self.work_dir = tempfile.mkdtemp(prefix='dup_spill_', dir=temp_dir)
+
+        self._paths_file = open(os.path.join(self.work_dir, 'paths.bin'), 'wb')
+        self._paths_offset = 0
+        self._buffer: List[int] = []
+        self._runs: List[str] = []
+        self.records = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add(self, path: str, size: int) -> None:
+        """Registra um arquivo"""
+        encoded = os.fsencode(path)
+        self._paths_file.write(PATH_LENGTH.pack(len(encoded)))
+        self._paths_file.write(encoded)
+
+        # Tamanho e posição combinados em um único int ordenável
+        self._buffer.append((size << OFFSET_BITS) | self._paths_offset)
+        self._paths_offset += PATH_LENGTH.size + len(encoded)
+        self.records += 1
+
+        if len(self._buffer) >= self.max_records:
+            self._spill()
+
+    def _spill(self) -> None:
+        """Ordena os registros em memória e grava um run no disco"""
+        if not self._buffer:
+            return
+
+        self._buffer.sort()
+        mask = (1 << OFFSET_BITS) - 1
+        run_path = os.path.join(self.work_dir, f'run_{len(self._runs):05d}.bin')
+        with open(run_path, 'wb') as f:
+            for start in range(0, len(self._buffer), 8192):
+                f.write(b''.join(
+                    RECORD.pack(key >> OFFSET_BITS, key & mask)
+                    for key in self._buffer[start:start + 8192]
+                ))
+
+        self._runs.append(run_path)
+        self._buffer = []
+
+    @staticmethod
+    def _read_run(run_path: str) -> Iterator[Tuple[int, int]]:
+        """Lê um run em blocos"""
+        chunk_size = RECORD.size * 4096
+        with open(run_path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield from RECORD.iter_unpack(chunk)
+
+    def iter_collisions(self) -> Iterator[Tuple[int, List[str]]]:
+        """
+        Intercala os runs e entrega os tamanhos com mais de um arquivo
+
+        Returns:
+            Iterador de (tamanho, caminhos) em ordem crescente de tamanho
+        """
+        self._spill()
+        self._paths_file.flush()
+        self.logger.info(f"Agrupamento externo: {self.records} arquivos em {len(self._runs)} runs")
+
+        with open(os.path.join(self.work_dir, 'paths.bin'), 'rb') as paths:
+            def read_path(offset: int) -> str:
+                paths.seek(offset)
+                length = PATH_LENGTH.unpack(paths.read(PATH_LENGTH.size))[0]
+                return os.fsdecode(paths.read(length))
+
+            current_size = None
+            offsets: List[int] = []
+            for size, offset in heapq.merge(*(self._read_run(run) for run in self._runs)):
+                if size != current_size:
+                    if len(offsets) > 1:
+                        yield current_size, [read_path(o) for o in offsets]
+                    current_size = size
+                    offsets = []
+                offsets.append(offset)
+
+            if len(offsets) > 1:
+                yield current_size, [read_path(o) for o in offsets]
+
+    def close(self) -> None:
+        """Remove os arquivos temporários"""
+        if not self._paths_file.closed:
+            self._paths_file.close()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
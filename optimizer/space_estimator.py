@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Estimativa Instantânea de Espaço Recuperável
+============================================
+
+Estima, antes de qualquer limpeza, quanto espaço as pastas temporárias e
+de cache ocupam, listando só uma quantidade limitada de diretórios.
+
+Cada pasta é explorada primeiro por largura até um limite de listagens;
+se a árvore couber no limite o valor é exato. Caso contrário são feitas
+sondagens aleatórias da raiz até uma folha (estimador de Knuth): em cada
+sondagem, os bytes de cada nível são multiplicados pelo produto dos graus
+de ramificação do caminho, o que dá uma estimativa sem viés do total. A
+média das sondagens e o erro padrão formam o intervalo de confiança.
+
+Depois, uma thread em segundo plano mede cada pasta por completo e
+substitui a estimativa pelo valor exato.
+
+Funcionalidades:
+- Estimativa de bytes e arquivos com intervalo de confiança de 95%
+- Orçamento de tempo e de listagens de diretório
+- Refinamento em segundo plano até o valor exato
+- Pastas padrão: temporários, caches de navegadores e caches de shader
+"""
+
+import os
+import math
+import time
+import random
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .utils import Utils
+from .cleaning_engine import CleaningEngine, CleaningPolicy
+from .browser_profiles import discover_profiles
+
+Z_95 = 1.96
+
+
+def default_locations() -> Dict[str, List[str]]:
+    """Pastas temporárias e de cache analisadas, por categoria"""
+    local = os.environ.get('LOCALAPPDATA', '')
+
+    # Cache de todos os perfis de todos os navegadores instalados
+    browser = [path for profile in discover_profiles() for path in profile.cache_paths]
+
+    shader = [
+        os.path.join(local, 'D3DSCache'),
+        os.path.join(local, 'NVIDIA', 'DXCache'),
+        os.path.join(local, 'NVIDIA', 'GLCache'),
+        os.path.join(local, 'AMD', 'DxCache'),
+        os.path.join(local, 'AMD', 'GLCache'),
+    ]
+
+    return {
+        'temp': Utils.get_temp_dirs(),
+        'browser': browser,
+        'shader': shader
+    }
+
+
+def _unique_roots(locations: Dict[str, List[str]]) -> List[Tuple[str, str]]:
+    """Remove pastas repetidas ou contidas em outra pasta da lista"""
+    candidates = []
+    for category, paths in locations.items():
+        for path in paths:
+            if path and os.path.isdir(path):
+                candidates.append((os.path.normcase(os.path.realpath(path)), path, category))
+
+    candidates.sort(key=lambda item: len(item[0]))
+    roots = []
+    kept = []
+    for key, path, category in candidates:
+        if any(key == parent or key.startswith(os.path.join(parent, '')) for parent in kept):
+            continue
+        kept.append(key)
+        roots.append((path, category))
+    return roots
+
+
+class _TreeSampler:
+    """Listagens em cache e sondagens aleatórias de uma árvore"""
+
+    def __init__(self, root: str, policy: CleaningPolicy, rng: random.Random):
+        self.root = root
+        self.policy = policy
+        self.rng = rng
+        self.listings = {}  # pasta -> (arquivos, bytes, subpastas)
+        self.now = time.time()
+
+    def list_directory(self, path: str) -> Tuple[int, int, List[str]]:
+        cached = self.listings.get(path)
+        if cached is not None:
+            return cached
+
+        files = 0
+        size = 0
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self.policy.is_kept(entry.path, entry.name):
+                                subdirs.append(entry.path)
+                            continue
+                        entry_stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if not self.policy.is_kept(entry.path, entry.name) and \
+                            self.policy.accepts(entry.name, entry_stat, self.now):
+                        files += 1
+                        size += entry_stat.st_size
+        except OSError:
+            pass
+
+        listing = (files, size, subdirs)
+        self.listings[path] = listing
+        return listing
+
+    def exhaustive(self, max_listings: int, deadline: float) -> bool:
+        """Lista por largura até o limite; True se a árvore inteira foi listada"""
+        queue = deque([self.root])
+        while queue:
+            if len(self.listings) >= max_listings or time.perf_counter() >= deadline:
+                return False
+            _, _, subdirs = self.list_directory(queue.popleft())
+            queue.extend(subdirs)
+        return True
+
+    def observed(self) -> Tuple[int, int]:
+        """(arquivos, bytes) já vistos nas pastas listadas (limite inferior)"""
+        return (sum(listing[0] for listing in self.listings.values()),
+                sum(listing[1] for listing in self.listings.values()))
+
+    def probe(self) -> Tuple[float, float]:
+        """Uma sondagem de Knuth da raiz até uma folha"""
+        path = self.root
+        weight = 1
+        files = 0.0
+        size = 0.0
+        while True:
+            listing_files, listing_size, subdirs = self.list_directory(path)
+            files += weight * listing_files
+            size += weight * listing_size
+            if not subdirs:
+                return files, size
+            weight *= len(subdirs)
+            path = self.rng.choice(subdirs)
+
+
+def _mean_and_margin(samples: List[float]) -> Tuple[float, float]:
+    """Média e meia-largura do intervalo de confiança de 95%"""
+    count = len(samples)
+    mean = sum(samples) / count
+    if count < 2:
+        return mean, mean  # Uma única sondagem: incerteza do tamanho da própria estimativa
+    variance = sum((sample - mean) ** 2 for sample in samples) / (count - 1)
+    return mean, Z_95 * math.sqrt(variance / count)
+
+
+class ReclaimableSpaceEstimator:
+    """Estimativa rápida (com refinamento em segundo plano) do espaço recuperável"""
+
+    def __init__(self, locations: Optional[Dict[str, List[str]]] = None,
+                 policy: Optional[CleaningPolicy] = None,
+                 time_budget: float = 0.5, max_listings: int = 2000,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            locations: Pastas por categoria (padrão: default_locations())
+            policy: Política de limpeza que define quais arquivos contam
+            time_budget: Tempo máximo da estimativa inicial, em segundos
+            max_listings: Máximo de diretórios listados na estimativa inicial
+            seed: Semente das sondagens aleatórias (para resultados reprodutíveis)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.locations = locations if locations is not None else default_locations()
+        self.policy = policy or CleaningPolicy()
+        self.time_budget = time_budget
+        self.max_listings = max_listings
+        self.rng = random.Random(seed)
+
+        self._estimate = None
+        self._lock = threading.Lock()
+        self._refine_thread = None
+        self._stop = threading.Event()
+
+    def estimate(self) -> Dict[str, Any]:
+        """
+        Calcula a estimativa inicial dentro do orçamento de tempo
+
+        Returns:
+            Dicionário com 'bytes', 'bytes_low', 'bytes_high', 'files',
+            'files_low', 'files_high', 'exact', 'elapsed' e o detalhe por pasta
+        """
+        start = time.perf_counter()
+        roots = _unique_roots(self.locations)
+
+        results = {}
+        for index, (root, category) in enumerate(roots):
+            # Orçamento dividido entre as pastas que faltam
+            remaining = len(roots) - index
+            time_left = max(0.0, self.time_budget - (time.perf_counter() - start))
+            deadline = time.perf_counter() + time_left / remaining
+            listings_left = max(1, self.max_listings // len(roots))
+            results[root] = self._estimate_root(root, category, deadline, listings_left)
+
+        estimate = self._combine(results)
+        estimate['elapsed'] = time.perf_counter() - start
+
+        with self._lock:
+            self._estimate = estimate
+
+        self.logger.info(
+            f"Espaço recuperável estimado: {Utils.format_size(estimate['bytes'])} "
+            f"({Utils.format_size(estimate['bytes_low'])} a {Utils.format_size(estimate['bytes_high'])}) "
+            f"em {estimate['elapsed']:.2f}s"
+        )
+        return estimate
+
+    def _estimate_root(self, root: str, category: str, deadline: float, max_listings: int) -> Dict[str, Any]:
+        """Estimativa de uma pasta: exata se couber no orçamento, senão por sondagens"""
+        sampler = _TreeSampler(root, self.policy, self.rng)
+        # Metade do orçamento de listagens para a exploração por largura
+        if sampler.exhaustive(max(1, max_listings // 2), deadline):
+            files, size = sampler.observed()
+            return self._location(category, files, size, 0, 0, exact=True, probes=0)
+
+        file_samples = []
+        size_samples = []
+        while len(file_samples) < 3 or (time.perf_counter() < deadline
+                                        and len(sampler.listings) < max_listings):
+            files, size = sampler.probe()
+            file_samples.append(files)
+            size_samples.append(size)
+
+        observed_files, observed_size = sampler.observed()
+        files, files_margin = _mean_and_margin(file_samples)
+        size, size_margin = _mean_and_margin(size_samples)
+
+        # A estimativa nunca fica abaixo do que já foi visto
+        files = max(files, observed_files)
+        size = max(size, observed_size)
+        location = self._location(category, files, size, files_margin, size_margin,
+                                  exact=False, probes=len(size_samples))
+        location['files_low'] = max(location['files_low'], observed_files)
+        location['bytes_low'] = max(location['bytes_low'], observed_size)
+        return location
+
+    @staticmethod
+    def _location(category: str, files: float, size: float, files_margin: float,
+                  size_margin: float, exact: bool, probes: int) -> Dict[str, Any]:
+        return {
+            'category': category,
+            'files': int(round(files)),
+            'files_low': int(max(0, files - files_margin)),
+            'files_high': int(math.ceil(files + files_margin)),
+            'bytes': int(round(size)),
+            'bytes_low': int(max(0, size - size_margin)),
+            'bytes_high': int(math.ceil(size + size_margin)),
+            'files_margin': files_margin,
+            'bytes_margin': size_margin,
+            'exact': exact,
+            'probes': probes
+        }
+
+    @staticmethod
+    def _combine(locations: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Soma as pastas (erros independentes: margens somadas em quadratura)"""
+        estimate = {
+            'bytes': sum(loc['bytes'] for loc in locations.values()),
+            'files': sum(loc['files'] for loc in locations.values()),
+            'exact': all(loc['exact'] for loc in locations.values()),
+            'by_category': {},
+            'locations': locations
+        }
+        bytes_margin = math.sqrt(sum(loc['bytes_margin'] ** 2 for loc in locations.values()))
+        files_margin = math.sqrt(sum(loc['files_margin'] ** 2 for loc in locations.values()))
+        estimate['bytes_low'] = max(sum(loc['bytes_low'] for loc in locations.values()),
+                                    int(estimate['bytes'] - bytes_margin))
+        estimate['bytes_high'] = int(math.ceil(estimate['bytes'] + bytes_margin))
+        estimate['files_low'] = max(sum(loc['files_low'] for loc in locations.values()),
+                                    int(estimate['files'] - files_margin))
+        estimate['files_high'] = int(math.ceil(estimate['files'] + files_margin))
+        estimate['bytes_formatted'] = Utils.format_size(estimate['bytes'])
+
+        for loc in locations.values():
+            category = estimate['by_category'].setdefault(loc['category'], {'bytes': 0, 'files': 0})
+            category['bytes'] += loc['bytes']
+            category['files'] += loc['files']
+        return estimate
+
+    def get_estimate(self) -> Optional[Dict[str, Any]]:
+        """Estimativa mais recente (inicial ou já refinada)"""
+        with self._lock:
+            return self._estimate
+
+    def start_refinement(self, callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> None:
+        """
+        Mede as pastas estimadas por completo em segundo plano
+
+        Args:
+            callback: Chamado com a estimativa atualizada após cada pasta medida
+        """
+        if self._refine_thread and self._refine_thread.is_alive():
+            return
+        if self.get_estimate() is None:
+            self.estimate()
+
+        self._stop.clear()
+        self._refine_thread = threading.Thread(target=self._refine, args=(callback,),
+                                               name='space-estimate-refine', daemon=True)
+        self._refine_thread.start()
+
+    def stop_refinement(self) -> None:
+        """Interrompe o refinamento em segundo plano"""
+        self._stop.set()
+        if self._refine_thread:
+            self._refine_thread.join(timeout=5)
+            self._refine_thread = None
+
+    def _refine(self, callback: Optional[Callable[[Dict[str, Any]], None]]) -> None:
+        # Simulação do motor de limpeza: mesma política, contagem exata
+        engine = CleaningEngine(self.policy, dry_run=True)
+        locations = dict(self.get_estimate()['locations'])
+
+        # Pastas menores primeiro: o valor exato aparece mais cedo para a maioria
+        for root, location in sorted(locations.items(), key=lambda item: item[1]['bytes']):
+            if self._stop.is_set():
+                return
+            if location['exact']:
+                continue
+            try:
+                measured = engine.clean(root)
+            except Exception as e:
+                self.logger.warning(f"Erro ao medir {root}: {e}")
+                continue
+
+            locations[root] = self._location(location['category'], measured['files_deleted'],
+                                             measured['bytes_freed'], 0, 0, exact=True, probes=0)
+            estimate = self._combine(locations)
+            estimate['elapsed'] = self.get_estimate()['elapsed']
+            with self._lock:
+                self._estimate = estimate
+            if callback:
+                callback(estimate)
+
+        self.logger.info(f"Espaço recuperável medido: {self.get_estimate()['bytes_formatted']}")
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Contador Contínuo de Espaço Recuperável
+=======================================
+
+Mantém, por categoria de limpeza, o total de bytes e arquivos que a
+limpeza removeria, sem varrer as pastas de novo a cada consulta.
+
+Depois de uma varredura inicial, cada diretório fica em cache com sua
+contagem. Um observador de mudanças marca os diretórios alterados e só
+eles são listados de novo, aplicando a diferença aos totais:
+- Linux: inotify (eventos de criação, remoção, renomeação e escrita)
+- Outros sistemas: instantâneo das datas de modificação dos diretórios,
+  comparado a cada intervalo
+
+A data de um diretório não muda quando um arquivo dele cresce, e a idade
+mínima da política muda com o tempo, então uma varredura completa
+periódica corrige qualquer desvio.
+
+Funcionalidades:
+- Totais por categoria disponíveis instantaneamente
+- Decisão rápida se uma limpeza vale a pena (worth_cleaning)
+- Mesmas pastas e mesma política da estimativa de espaço recuperável
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .utils import Utils
+from .cleaning_engine import CleaningPolicy
+from .space_estimator import default_locations, _unique_roots
+
+# Constantes do inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class _InotifyWatcher:
+    """Observador de diretórios via inotify (apenas Linux)"""
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._ctypes = ctypes
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        self.paths = {}  # descritor de observação -> diretório
+
+    def add(self, path: str) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            error = self._ctypes.get_errno()
+            if error == errno.ENOSPC:
+                raise OSError(error, "Limite de observações do inotify atingido")
+            return  # Pasta removida entre a listagem e a observação
+        self.paths[wd] = path
+
+    def read(self, timeout: float) -> Optional[Set[str]]:
+        """
+        Aguarda eventos e retorna os diretórios alterados
+
+        Returns:
+            Conjunto de diretórios (vazio se nada mudou), ou None se a fila
+            de eventos do kernel transbordou
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        dirty = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return dirty
+            if not data:
+                return dirty
+
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size + length
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                path = self.paths.get(wd)
+                if path is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del self.paths[wd]
+                    continue
+                dirty.add(path)
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    dirty.add(os.path.dirname(path))
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class ReclaimableSpaceTracker:
+    """Totais de espaço recuperável atualizados por um observador de mudanças"""
+
+    def __init__(self, locations: Optional[Dict[str, List[str]]] = None,
+                 policy: Optional[CleaningPolicy] = None,
+                 poll_interval: float = 30.0, rescan_interval: float = 900.0,
+                 use_inotify: Optional[bool] = None):
+        """
+        Args:
+            locations: Pastas por categoria (padrão: default_locations())
+            policy: Política de limpeza que define quais arquivos contam
+            poll_interval: Intervalo entre verificações do observador por datas, em segundos
+            rescan_interval: Intervalo entre varreduras completas de correção, em segundos
+            use_inotify: Força ou desativa o inotify (None = usar se disponível)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.locations = locations if locations is not None else default_locations()
+        self.policy = policy or CleaningPolicy()
+        self.poll_interval = poll_interval
+        self.rescan_interval = rescan_interval
+        self.debounce = 0.5
+        if use_inotify is None:
+            use_inotify = sys.platform.startswith('linux')
+        self.use_inotify = use_inotify
+
+        # diretório -> [arquivos, bytes, subpastas, raiz, mtime_ns]
+        self._dirs = {}
+        self._roots = {}    # raiz -> categoria
+        self._totals = {}   # raiz -> [arquivos, bytes]
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._watcher = None
+        self.backend = None
+        self.updated_at = None
+        self.last_full_scan = None
+
+    def start(self) -> None:
+        """Inicia a varredura inicial e o observador em segundo plano"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._watcher = None
+        self.backend = 'poll'
+        if self.use_inotify:
+            try:
+                self._watcher = _InotifyWatcher()
+                self.backend = 'inotify'
+            except (OSError, AttributeError) as e:
+                self.logger.info(f"inotify indisponível, usando verificação por datas: {e}")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='space-tracker', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Interrompe o observador"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._watcher:
+            self._watcher.close()
+            self._watcher = None
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda o fim da varredura inicial"""
+        return self._ready.wait(timeout)
+
+    def get_totals(self) -> Dict[str, Any]:
+        """
+        Totais atuais
+
+        Returns:
+            Dicionário com 'bytes', 'files', 'by_category', 'ready',
+            'backend', 'updated_at' e 'bytes_formatted'
+        """
+        by_category = {}
+        with self._lock:
+            for root, (files, size) in self._totals.items():
+                category = by_category.setdefault(self._roots[root], {'bytes': 0, 'files': 0})
+                category['bytes'] += size
+                category['files'] += files
+
+        total_bytes = sum(category['bytes'] for category in by_category.values())
+        return {
+            'bytes': total_bytes,
+            'files': sum(category['files'] for category in by_category.values()),
+            'by_category': by_category,
+            'ready': self._ready.is_set(),
+            'backend': self.backend,
+            'updated_at': self.updated_at,
+            'bytes_formatted': Utils.format_size(total_bytes)
+        }
+
+    def worth_cleaning(self, min_bytes: int, categories: Optional[Iterable[str]] = None) -> bool:
+        """
+        Indica se há espaço recuperável suficiente para justificar uma limpeza
+
+        Enquanto a varredura inicial não termina a resposta é True, para
+        não deixar de limpar por falta de informação.
+
+        Args:
+            min_bytes: Mínimo de bytes recuperáveis
+            categories: Categorias consideradas (padrão: todas)
+        """
+        if not self._ready.is_set():
+            return True
+
+        by_category = self.get_totals()['by_category']
+        if categories is not None:
+            by_category = {name: by_category.get(name, {'bytes': 0}) for name in categories}
+        return sum(category['bytes'] for category in by_category.values()) >= min_bytes
+
+    def _list_directory(self, path: str, now: float) -> Optional[list]:
+        """Conta os arquivos removíveis de uma pasta; None se ela não existe mais"""
+        files = 0
+        size = 0
+        subdirs = set()
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self.policy.is_kept(entry.path, entry.name):
+                                subdirs.add(entry.path)
+                            continue
+                        entry_stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if not self.policy.is_kept(entry.path, entry.name) and \
+                            self.policy.accepts(entry.name, entry_stat, now):
+                        files += 1
+                        size += entry_stat.st_size
+        except FileNotFoundError:
+            return None
+        except OSError:
+            return [0, 0, set(), None, 0]
+
+        return [files, size, subdirs, None, mtime_ns]
+
+    def _scan_tree(self, path: str, root: str, dirs: Dict[str, list], now: float,
+                   watch: bool) -> None:
+        """Lista uma subárvore inteira para o cache dirs"""
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            record = self._list_directory(current, now)
+            if record is None:
+                continue
+            record[3] = root
+            dirs[current] = record
+            if watch:
+                self._watch(current)
+            stack.extend(record[2])
+
+    def _watch(self, path: str) -> None:
+        if self._watcher is None:
+            return
+        try:
+            self._watcher.add(path)
+        except OSError as e:
+            # Sem observações suficientes: passa a verificar por datas
+            self.logger.warning(f"{e}; usando verificação por datas")
+            self._watcher.close()
+            self._watcher = None
+            self.backend = 'poll'
+
+    def _full_scan(self) -> None:
+        """Varre todas as pastas e substitui o cache"""
+        start = time.perf_counter()
+        now = time.time()
+        roots = dict(_unique_roots(self.locations))
+
+        dirs = {}
+        for root in roots:
+            if self._stop.is_set():
+                return
+            self._scan_tree(root, root, dirs, now, watch=True)
+
+        totals = {root: [0, 0] for root in roots}
+        for record in dirs.values():
+            totals[record[3]][0] += record[0]
+            totals[record[3]][1] += record[1]
+
+        with self._lock:
+            self._dirs = dirs
+            self._roots = roots
+            self._totals = totals
+        self.updated_at = time.time()
+        self.last_full_scan = time.monotonic()
+        self._ready.set()
+
+        self.logger.info(
+            f"Espaço recuperável: {self.get_totals()['bytes_formatted']} em {len(dirs)} pastas "
+            f"({time.perf_counter() - start:.2f}s, {self.backend})"
+        )
+
+    def _drop_tree(self, path: str, deltas: Dict[str, list]) -> None:
+        """Remove do cache uma pasta e suas subpastas"""
+        stack = [path]
+        while stack:
+            record = self._dirs.pop(stack.pop(), None)
+            if record is None:
+                continue
+            deltas.setdefault(record[3], [0, 0])
+            deltas[record[3]][0] -= record[0]
+            deltas[record[3]][1] -= record[1]
+            stack.extend(record[2])
+
+    def _refresh(self, dirty: Set[str]) -> None:
+        """Lista de novo os diretórios alterados e aplica a diferença aos totais"""
+        now = time.time()
+        deltas = {}
+
+        # Pais antes dos filhos: subárvores removidas saem do cache primeiro
+        for path in sorted(dirty, key=lambda item: item.count(os.sep)):
+            old = self._dirs.get(path)
+            if old is None:
+                continue
+
+            record = self._list_directory(path, now)
+            if record is None:
+                self._drop_tree(path, deltas)
+                continue
+            record[3] = old[3]
+            self._dirs[path] = record
+
+            delta = deltas.setdefault(old[3], [0, 0])
+            delta[0] += record[0] - old[0]
+            delta[1] += record[1] - old[1]
+
+            for removed in old[2] - record[2]:
+                self._drop_tree(removed, deltas)
+
+            added = {}
+            for subdir in record[2] - old[2]:
+                self._scan_tree(subdir, old[3], added, now, watch=True)
+            for subdir_path, subdir_record in added.items():
+                self._dirs[subdir_path] = subdir_record
+                delta[0] += subdir_record[0]
+                delta[1] += subdir_record[1]
+
+        with self._lock:
+            for root, (files, size) in deltas.items():
+                if root in self._totals:
+                    self._totals[root][0] += files
+                    self._totals[root][1] += size
+        self.updated_at = time.time()
+
+    def _poll_changes(self) -> Set[str]:
+        """Diretórios cuja data de modificação mudou desde a última listagem"""
+        dirty = set()
+        for path, record in list(self._dirs.items()):
+            try:
+                if os.stat(path).st_mtime_ns != record[4]:
+                    dirty.add(path)
+            except OSError:
+                dirty.add(path)
+        return dirty
+
+    def _run(self) -> None:
+        try:
+            self._full_scan()
+            while not self._stop.is_set():
+                if self._watcher is not None:
+                    dirty = self._watcher.read(self.poll_interval)
+                    if dirty and self._watcher is not None and not self._stop.wait(self.debounce):
+                        # Agrupa rajadas de eventos em uma única atualização
+                        more = self._watcher.read(0)
+                        dirty = None if more is None else dirty | more
+                else:
+                    if self._stop.wait(self.poll_interval):
+                        return
+                    dirty = self._poll_changes()
+
+                if dirty is None or time.monotonic() - self.last_full_scan >= self.rescan_interval:
+                    self._full_scan()
+                elif dirty:
+                    self._refresh(dirty)
+        except Exception as e:
+            self.logger.error(f"Erro no contador de espaço recuperável: {e}")
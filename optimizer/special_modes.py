@@ -16,6 +16,9 @@ import subprocess
 import ctypes
 from pathlib import Path
 
+from .log_retention import RetentionManager
+from .step_executor import StepExecutor
+
 @dataclass
 class PerformanceReport:
     """Relatório de performance do sistema"""
@@ -41,6 +44,7 @@ class SpecialModes:
         self.advanced_optimizer = advanced_optimizer
         self.reports_dir = Path("logs/reports")
         self.reports_dir.mkdir(parents=True, exist_ok=True)
+        self.retention = RetentionManager(log_dir=str(self.reports_dir.parent))
         self.current_mode = None
         self.active_services_backup = {}
         
@@ -61,19 +65,12 @@ class SpecialModes:
         Pode ser revertido quando necessário
         """
         if progress_callback:
-            progress_callback("Iniciando Modo TURBO...", 0, 10)
+            progress_callback("Iniciando Modo TURBO...", 0, 6)
         
         self.current_mode = "turbo"
         optimizations_applied = []
         
         try:
-            # Backup dos serviços atuais
-            self._backup_current_services()
-            
-            # 1. Desativar serviços não essenciais
-            if progress_callback:
-                progress_callback("Desativando serviços desnecessários...", 1, 10)
-            
             # 🎤 SERVIÇOS PROTEGIDOS - NUNCA DESABILITAR (ÁUDIO/MICROFONE)
             protected_audio_services = [
                 'AudioSrv', 'Audiosrv', 'AudioEndpointBuilder', 'RpcEptMapper', 
@@ -127,16 +124,15 @@ class SpecialModes:
                 "XboxNetApiSvc",  # Xbox Live Networking
             ]
             
-            for service in services_to_disable:
-                # 🎤 PROTEÇÃO DE ÁUDIO - Verificar se não é serviço de áudio
-                if service.lower() in [s.lower() for s in protected_audio_services]:
-                    continue
-                if self._disable_service(service):
-                    optimizations_applied.append(f"Serviço desativado: {service}")
-            
-            # 2. 🔥 PARAR PROCESSOS DESNECESSÁRIOS (LISTA EXTREMA)
-            if progress_callback:
-                progress_callback("🔥 Finalizando processos desnecessários...", 3, 10)
+            def disable_services():
+                disabled = []
+                for service in services_to_disable:
+                    # 🎤 PROTEÇÃO DE ÁUDIO - Verificar se não é serviço de áudio
+                    if service.lower() in [s.lower() for s in protected_audio_services]:
+                        continue
+                    if self._disable_service(service):
+                        disabled.append(f"Serviço desativado: {service}")
+                return disabled
             
             processes_to_stop = [
                 # Comunicação/Social
@@ -173,40 +169,48 @@ class SpecialModes:
                 "audiodg.exe",  # 🎤 ÁUDIO PROTEGIDO
             ]
             
-            for process in processes_to_stop:
-                # Verificar se não é crítico
-                if process.lower() not in [p.lower() for p in critical_processes]:
-                    if self._stop_process(process):
-                        optimizations_applied.append(f"🔥 Processo finalizado: {process}")
-            
-            # 3. Configurações de performance extrema
-            if progress_callback:
-                progress_callback("Aplicando configurações de performance...", 5, 10)
-            
-            self._apply_extreme_performance_settings()
+            def stop_processes():
+                stopped = []
+                for process in processes_to_stop:
+                    # Verificar se não é crítico
+                    if process.lower() not in [p.lower() for p in critical_processes]:
+                        if self._stop_process(process):
+                            stopped.append(f"🔥 Processo finalizado: {process}")
+                return stopped
+            
+            # Serviços só são desativados depois do backup; o resto é independente.
+            # _clear_memory_cache vem depois dos processos finalizados, para valer a pena
+            executor = StepExecutor(progress_callback=progress_callback)
+            executor.add_step('backup_services', self._backup_current_services,
+                              resource='process', label="Backup dos serviços")
+            executor.add_step('disable_services', disable_services, depends_on=['backup_services'],
+                              resource='process', label="Desativando serviços desnecessários")
+            executor.add_step('stop_processes', stop_processes,
+                              resource='process', label="🔥 Finalizando processos desnecessários")
+            executor.add_step('performance_settings', self._apply_extreme_performance_settings,
+                              resource='registry', label="Aplicando configurações de performance")
+            executor.add_step('clear_memory', self._clear_memory_cache, depends_on=['stop_processes'],
+                              resource='process', label="Limpando RAM e cache")
+            executor.add_step('cpu_priorities', self._optimize_cpu_priorities,
+                              resource='registry', label="Otimizando prioridades de CPU")
+            pipeline = executor.run()
+            if not pipeline['success']:
+                raise RuntimeError(pipeline['steps'][pipeline['failed'][0]]['error'])
+            
+            optimizations_applied.extend(pipeline['results']['disable_services'])
+            optimizations_applied.extend(pipeline['results']['stop_processes'])
             optimizations_applied.append("Configurações de performance extrema aplicadas")
-            
-            # 4. Limpar RAM e cache
-            if progress_callback:
-                progress_callback("Limpando RAM e cache...", 7, 10)
-            
-            self._clear_memory_cache()
             optimizations_applied.append("RAM e cache limpos")
-            
-            # 5. Configurar prioridade de CPU para jogos
-            if progress_callback:
-                progress_callback("Otimizando prioridades de CPU...", 9, 10)
-            
-            self._optimize_cpu_priorities()
             optimizations_applied.append("Prioridades de CPU otimizadas")
             
             if progress_callback:
-                progress_callback("Modo TURBO ativado! Sistema otimizado para jogos", 10, 10)
+                progress_callback("Modo TURBO ativado! Sistema otimizado para jogos", len(executor), len(executor))
             
             return {
                 "success": True,
                 "mode": "turbo",
                 "optimizations": optimizations_applied,
+                "step_times": {name: round(info['duration'], 3) for name, info in pipeline['steps'].items()},
                 "message": "Modo TURBO ativado! Performance máxima para jogos."
             }
             
@@ -259,56 +263,45 @@ class SpecialModes:
         Ideal para execução no boot do sistema
         """
         if progress_callback:
-            progress_callback("Iniciando Modo Silencioso...", 0, 8)
+            progress_callback("Iniciando Modo Silencioso...", 0, 5)
         
         optimizations_applied = []
         
         try:
-            # 1. Limpeza de arquivos temporários
-            if progress_callback:
-                progress_callback("Limpeza de arquivos temporários...", 1, 8)
-            
-            temp_cleaned = self._silent_temp_cleanup()
-            optimizations_applied.append(f"Arquivos temporários limpos: {temp_cleaned} MB")
-            
-            # 2. Limpeza de cache do sistema
-            if progress_callback:
-                progress_callback("Limpeza de cache do sistema...", 2, 8)
-            
-            cache_cleaned = self._silent_cache_cleanup()
-            optimizations_applied.append(f"Cache limpo: {cache_cleaned} MB")
-            
-            # 3. Otimização de registro
-            if progress_callback:
-                progress_callback("Otimização de registro...", 4, 8)
-            
-            registry_optimized = self._silent_registry_optimization()
-            optimizations_applied.append(f"Entradas de registro otimizadas: {registry_optimized}")
-            
-            # 4. Otimização de rede
-            if progress_callback:
-                progress_callback("Otimização de rede...", 6, 8)
-            
-            self._silent_network_optimization()
+            # Limpezas, registro, rede e preparação para jogos são independentes
+            executor = StepExecutor(progress_callback=progress_callback)
+            executor.add_step('temp_cleanup', self._silent_temp_cleanup,
+                              resource='disk', label="Limpeza de arquivos temporários")
+            executor.add_step('cache_cleanup', self._silent_cache_cleanup,
+                              resource='disk', label="Limpeza de cache do sistema")
+            executor.add_step('registry', self._silent_registry_optimization,
+                              resource='registry', label="Otimização de registro")
+            executor.add_step('network', self._silent_network_optimization,
+                              resource='network', label="Otimização de rede")
+            executor.add_step('gaming', self._prepare_system_for_gaming,
+                              resource='process', label="Preparando sistema para jogos")
+            pipeline = executor.run()
+            if not pipeline['success']:
+                raise RuntimeError(pipeline['steps'][pipeline['failed'][0]]['error'])
+            
+            results = pipeline['results']
+            optimizations_applied.append(f"Arquivos temporários limpos: {results['temp_cleanup']} MB")
+            optimizations_applied.append(f"Cache limpo: {results['cache_cleanup']} MB")
+            optimizations_applied.append(f"Entradas de registro otimizadas: {results['registry']}")
             optimizations_applied.append("Configurações de rede otimizadas")
-            
-            # 5. Preparação para jogos
-            if progress_callback:
-                progress_callback("Preparando sistema para jogos...", 7, 8)
-            
-            self._prepare_system_for_gaming()
             optimizations_applied.append("Sistema preparado para jogos")
             
             # Salvar log da execução silenciosa
             self._save_silent_log(optimizations_applied)
             
             if progress_callback:
-                progress_callback("Modo Silencioso concluído!", 8, 8)
+                progress_callback("Modo Silencioso concluído!", len(executor), len(executor))
             
             return {
                 "success": True,
                 "mode": "silent",
                 "optimizations": optimizations_applied,
+                "step_times": {name: round(info['duration'], 3) for name, info in pipeline['steps'].items()},
                 "message": "Modo Silencioso executado com sucesso."
             }
             
@@ -331,24 +324,23 @@ class SpecialModes:
         before_metrics = self._collect_system_metrics()
         
         try:
-            # Aplicar TODAS as otimizações
-            if progress_callback:
-                progress_callback("Aplicando otimizações personalizadas...", 2, 15)
-            
-            if self.advanced_optimizer:
-                personal_result = self.advanced_optimizer.apply_personal_optimizations()
-            
-            if progress_callback:
-                progress_callback("Aplicando otimizações avançadas...", 5, 15)
-            
-            if self.advanced_optimizer:
-                advanced_result = self.advanced_optimizer.apply_all_advanced_optimizations()
-            
-            if progress_callback:
-                progress_callback("Aplicando otimizações ULTRA...", 8, 15)
-            
+            # Aplicar TODAS as otimizações, em cadeia: cada nível sobrescreve o anterior
             if self.advanced_optimizer:
-                ultra_result = self.advanced_optimizer.apply_all_ultra_advanced_optimizations()
+                executor = StepExecutor(progress_callback=(
+                    (lambda message, done, total: progress_callback(message, 2 + done * 3, 15))
+                    if progress_callback else None
+                ))
+                executor.add_step('personal', self.advanced_optimizer.apply_personal_optimizations,
+                                  resource='registry', label="Aplicando otimizações personalizadas")
+                executor.add_step('advanced', self.advanced_optimizer.apply_all_advanced_optimizations,
+                                  depends_on=['personal'], resource='registry',
+                                  label="Aplicando otimizações avançadas")
+                executor.add_step('ultra', self.advanced_optimizer.apply_all_ultra_advanced_optimizations,
+                                  depends_on=['advanced'], resource='registry',
+                                  label="Aplicando otimizações ULTRA")
+                pipeline = executor.run()
+                if not pipeline['success']:
+                    raise RuntimeError(pipeline['steps'][pipeline['failed'][0]]['error'])
             
             # Aguardar estabilização do sistema
             if progress_callback:
@@ -391,67 +383,46 @@ class SpecialModes:
         Modo LIMPEZA PROFUNDA: Remove todos os arquivos desnecessários
         """
         if progress_callback:
-            progress_callback("Iniciando Limpeza Profunda...", 0, 12)
+            progress_callback("Iniciando Limpeza Profunda...", 0, 6)
         
         cleaned_items = []
         total_space_freed = 0
         
         try:
-            # 1. Limpeza de arquivos temporários avançada
-            if progress_callback:
-                progress_callback("Limpeza profunda de temporários...", 1, 12)
-            
-            temp_space = self._deep_clean_temp_files()
-            total_space_freed += temp_space
-            cleaned_items.append(f"Arquivos temporários: {temp_space} MB")
-            
-            # 2. Limpeza de logs do sistema
-            if progress_callback:
-                progress_callback("Limpeza de logs do sistema...", 2, 12)
-            
-            logs_space = self._deep_clean_system_logs()
-            total_space_freed += logs_space
-            cleaned_items.append(f"Logs do sistema: {logs_space} MB")
-            
-            # 3. Limpeza de cache de aplicativos
-            if progress_callback:
-                progress_callback("Limpeza de cache de aplicativos...", 4, 12)
-            
-            app_cache_space = self._deep_clean_app_cache()
-            total_space_freed += app_cache_space
-            cleaned_items.append(f"Cache de aplicativos: {app_cache_space} MB")
-            
-            # 4. Limpeza de arquivos de dump
-            if progress_callback:
-                progress_callback("Limpeza de arquivos de dump...", 6, 12)
-            
-            dump_space = self._deep_clean_dump_files()
-            total_space_freed += dump_space
-            cleaned_items.append(f"Arquivos de dump: {dump_space} MB")
-            
-            # 5. Limpeza de arquivos de instalação
-            if progress_callback:
-                progress_callback("Limpeza de instaladores antigos...", 8, 12)
-            
-            installer_space = self._deep_clean_installers()
-            total_space_freed += installer_space
-            cleaned_items.append(f"Instaladores antigos: {installer_space} MB")
-            
-            # 6. Limpeza do registro órfão
-            if progress_callback:
-                progress_callback("Limpeza de entradas órfãs do registro...", 10, 12)
-            
-            registry_entries = self._deep_clean_registry()
-            cleaned_items.append(f"Entradas de registro órfãs: {registry_entries}")
+            # Cada limpeza devolve os MB liberados; as de disco rodam uma por vez
+            # e a do registro em paralelo com elas
+            steps = [
+                ('temp_files', self._deep_clean_temp_files, 'disk', "Limpeza profunda de temporários", "Arquivos temporários"),
+                ('system_logs', self._deep_clean_system_logs, 'disk', "Limpeza de logs do sistema", "Logs do sistema"),
+                ('app_cache', self._deep_clean_app_cache, 'disk', "Limpeza de cache de aplicativos", "Cache de aplicativos"),
+                ('dump_files', self._deep_clean_dump_files, 'disk', "Limpeza de arquivos de dump", "Arquivos de dump"),
+                ('installers', self._deep_clean_installers, 'disk', "Limpeza de instaladores antigos", "Instaladores antigos"),
+                ('registry', self._deep_clean_registry, 'registry', "Limpeza de entradas órfãs do registro", None),
+            ]
+            executor = StepExecutor(progress_callback=progress_callback)
+            for name, func, resource, label, _ in steps:
+                executor.add_step(name, func, resource=resource, label=label)
+            pipeline = executor.run()
+            if not pipeline['success']:
+                raise RuntimeError(pipeline['steps'][pipeline['failed'][0]]['error'])
+            
+            for name, _, _, _, description in steps:
+                value = pipeline['results'][name]
+                if description is None:
+                    cleaned_items.append(f"Entradas de registro órfãs: {value}")
+                    continue
+                total_space_freed += value
+                cleaned_items.append(f"{description}: {value} MB")
             
             if progress_callback:
-                progress_callback("Limpeza Profunda concluída!", 12, 12)
+                progress_callback("Limpeza Profunda concluída!", len(executor), len(executor))
             
             return {
                 "success": True,
                 "mode": "deep_clean",
                 "cleaned_items": cleaned_items,
                 "total_space_freed": total_space_freed,
+                "step_times": {name: round(info['duration'], 3) for name, info in pipeline['steps'].items()},
                 "message": f"Limpeza Profunda concluída! {total_space_freed} MB liberados."
             }
             
@@ -469,62 +440,48 @@ class SpecialModes:
         ATENÇÃO: Pode causar instabilidade em sistemas não preparados
         """
         if progress_callback:
-            progress_callback("⚠️ INICIANDO MODO EXTREMO ⚠️", 0, 20)
+            progress_callback("⚠️ INICIANDO MODO EXTREMO ⚠️", 0, 6)
         
         optimizations_applied = []
         
         try:
-            # 1. Todas as otimizações ULTRA
-            if progress_callback:
-                progress_callback("Aplicando otimizações ULTRA...", 2, 20)
-            
-            if self.advanced_optimizer:
-                ultra_result = self.advanced_optimizer.apply_all_ultra_advanced_optimizations()
-                optimizations_applied.extend(ultra_result.get("optimizations", []))
-            
-            # 2. Configurações extremas de CPU
-            if progress_callback:
-                progress_callback("Configurações extremas de CPU...", 5, 20)
-            
-            self._apply_extreme_cpu_settings()
-            optimizations_applied.append("Configurações extremas de CPU aplicadas")
-            
-            # 3. Configurações extremas de memória
-            if progress_callback:
-                progress_callback("Configurações extremas de memória...", 8, 20)
-            
-            self._apply_extreme_memory_settings()
-            optimizations_applied.append("Configurações extremas de memória aplicadas")
-            
-            # 4. Configurações extremas de GPU
-            if progress_callback:
-                progress_callback("Configurações extremas de GPU...", 11, 20)
-            
-            self._apply_extreme_gpu_settings()
-            optimizations_applied.append("Configurações extremas de GPU aplicadas")
-            
-            # 5. Desabilitar TODAS as funcionalidades desnecessárias
-            if progress_callback:
-                progress_callback("Desabilitando funcionalidades desnecessárias...", 14, 20)
-            
-            self._disable_all_unnecessary_features()
-            optimizations_applied.append("Todas as funcionalidades desnecessárias desabilitadas")
-            
-            # 6. Configurações extremas de rede
-            if progress_callback:
-                progress_callback("Configurações extremas de rede...", 17, 20)
+            # CPU, memória e GPU mexem em chaves diferentes do registro; rede e
+            # serviços/recursos do Windows rodam ao lado. As ULTRA vêm antes de tudo,
+            # para as configurações extremas prevalecerem sobre elas
+            executor = StepExecutor(progress_callback=progress_callback)
+            executor.add_step('ultra', self._apply_ultra_optimizations,
+                              resource='registry', label="Aplicando otimizações ULTRA")
+            steps = [
+                ('cpu', self._apply_extreme_cpu_settings, 'registry', "Configurações extremas de CPU",
+                 "Configurações extremas de CPU aplicadas"),
+                ('memory', self._apply_extreme_memory_settings, 'registry', "Configurações extremas de memória",
+                 "Configurações extremas de memória aplicadas"),
+                ('gpu', self._apply_extreme_gpu_settings, 'registry', "Configurações extremas de GPU",
+                 "Configurações extremas de GPU aplicadas"),
+                ('features', self._disable_all_unnecessary_features, 'process',
+                 "Desabilitando funcionalidades desnecessárias",
+                 "Todas as funcionalidades desnecessárias desabilitadas"),
+                ('network', self._apply_extreme_network_settings, 'network', "Configurações extremas de rede",
+                 "Configurações extremas de rede aplicadas"),
+            ]
+            for name, func, resource, label, _ in steps:
+                executor.add_step(name, func, depends_on=['ultra'], resource=resource, label=label)
+            pipeline = executor.run()
+            if not pipeline['success']:
+                raise RuntimeError(pipeline['steps'][pipeline['failed'][0]]['error'])
             
-            self._apply_extreme_network_settings()
-            optimizations_applied.append("Configurações extremas de rede aplicadas")
+            optimizations_applied.extend(pipeline['results']['ultra'])
+            optimizations_applied.extend(description for _, _, _, _, description in steps)
             
             if progress_callback:
-                progress_callback("⚡ MODO EXTREMO ATIVADO! ⚡", 20, 20)
+                progress_callback("⚡ MODO EXTREMO ATIVADO! ⚡", len(executor), len(executor))
             
             return {
                 "success": True,
                 "mode": "extreme_performance",
                 "optimizations": optimizations_applied,
                 "message": "⚡ MODO EXTREMO ATIVADO! Performance máxima alcançada.",
+                "step_times": {name: round(info['duration'], 3) for name, info in pipeline['steps'].items()},
                 "warning": "Sistema configurado para performance extrema. Monitore a estabilidade."
             }
             
@@ -535,6 +492,13 @@ class SpecialModes:
                 "message": "Erro no Modo Desempenho Extremo"
             }
     
+    def _apply_ultra_optimizations(self) -> List[str]:
+        """Otimizações ULTRA do AdvancedOptimizer (lista vazia sem ele)"""
+        if not self.advanced_optimizer:
+            return []
+        ultra_result = self.advanced_optimizer.apply_all_ultra_advanced_optimizations()
+        return ultra_result.get("optimizations", [])
+    
     # 📊 MÉTODOS DE MONITORAMENTO E RELATÓRIOS
     
     def _collect_system_metrics(self) -> Dict:
@@ -597,6 +561,10 @@ class SpecialModes:
             report_file = self.reports_dir / f"benchmark_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             with open(report_file, 'w', encoding='utf-8') as f:
                 json.dump(report, f, indent=2, ensure_ascii=False)
+            self.retention.register_report(str(report_file), {
+                "overall_score": report["overall_score"],
+                "improvements": improvements
+            })
             
             return report
             
@@ -622,6 +590,9 @@ class SpecialModes:
                 
                 f.write("MÉTRICAS COMPLETAS:\n")
                 f.write(json.dumps(report_data, indent=2, ensure_ascii=False))
+            self.retention.register_report(str(txt_file), {
+                "overall_score": report_data.get("overall_score")
+            })
             
             return True
         except Exception as e:
@@ -908,6 +879,7 @@ class SpecialModes:
             f.write(f"Execução Silenciosa - {datetime.now()}\n")
             for opt in optimizations:
                 f.write(f"✓ {opt}\n")
+        self.retention.register_report(str(log_file), {"optimizations": len(optimizations)})
     
     def _deep_clean_temp_files(self) -> int:
         """Limpeza profunda de temporários"""
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Executor de Etapas com Dependências
+===================================
+
+As rotinas de otimização (boot, otimização completa da interface e modos
+especiais) são listas de etapas em grande parte independentes: limpar
+temporários não precisa esperar o plano de energia, que não precisa
+esperar o DNS. Este módulo executa essas etapas como um grafo: cada etapa
+declara de quais depende e qual recurso usa, e as etapas prontas rodam ao
+mesmo tempo respeitando um limite por recurso (um trabalho de disco por
+vez, alguns comandos de rede ao mesmo tempo, etc.).
+
+Funcionalidades:
+- Dependências entre etapas (com detecção de ciclos e nomes inválidos)
+- Classes de recurso: disk, network, registry, process e cpu
+- Limite de etapas simultâneas por recurso e no total
+- Progresso agregado (mensagem, concluídas, total) na thread que chamou run()
+- Tempo de cada etapa; falhas pulam apenas as etapas dependentes
+- Interrupção cooperativa: nenhuma etapa nova começa após should_stop()
+"""
+
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Etapas simultâneas por classe de recurso
+DEFAULT_RESOURCE_LIMITS = {
+    'disk': 1,       # Limpezas e varreduras (as filas por disco ficam no IOScheduler)
+    'network': 2,    # netsh, ipconfig, DNS
+    'registry': 2,   # Escritas no registro
+    'process': 2,    # Serviços, processos, powercfg, PowerShell
+    'cpu': max(1, os.cpu_count() or 1)
+}
+
+# Estados de uma etapa ao fim da execução
+STEP_DONE = 'done'
+STEP_FAILED = 'failed'
+STEP_SKIPPED = 'skipped'      # Uma dependência falhou ou foi pulada
+STEP_CANCELLED = 'cancelled'  # Interrompida antes de começar
+
+
+@dataclass
+class PipelineStep:
+    """Etapa de uma rotina de otimização"""
+    name: str
+    func: Callable[[], Any]
+    depends_on: Tuple[str, ...] = ()
+    resource: str = 'cpu'
+    label: str = ''
+
+
+class StepExecutor:
+    """Executa etapas em paralelo respeitando dependências e limites por recurso"""
+
+    def __init__(self, resource_limits: Optional[Dict[str, int]] = None, max_workers: int = 6,
+                 progress_callback: Optional[Callable[[str, int, int], None]] = None,
+                 should_stop: Optional[Callable[[], bool]] = None):
+        """
+        Args:
+            resource_limits: Etapas simultâneas por recurso (padrão: DEFAULT_RESOURCE_LIMITS)
+            max_workers: Etapas simultâneas no total
+            progress_callback: Função (mensagem, etapas concluídas, total de etapas)
+            should_stop: Consultada antes de iniciar etapas; True cancela as que faltam
+        """
+        self.logger = logging.getLogger(__name__)
+        self.resource_limits = dict(DEFAULT_RESOURCE_LIMITS)
+        if resource_limits:
+            self.resource_limits.update(resource_limits)
+        self.max_workers = max(1, max_workers)
+        self.progress_callback = progress_callback
+        self.should_stop = should_stop
+        self._steps: Dict[str, PipelineStep] = {}
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def add_step(self, name: str, func: Callable[[], Any], depends_on: Iterable[str] = (),
+                 resource: str = 'cpu', label: Optional[str] = None) -> 'StepExecutor':
+        """
+        Adiciona uma etapa
+
+        Args:
+            name: Nome único da etapa (chave dos resultados)
+            func: Função sem argumentos; o retorno vira o resultado da etapa
+            depends_on: Etapas que precisam terminar com sucesso antes
+            resource: Classe de recurso usada ('disk', 'network', 'registry', 'process', 'cpu')
+            label: Mensagem de progresso (padrão: o nome)
+        """
+        if name in self._steps:
+            raise ValueError(f"Etapa duplicada: {name}")
+        if resource not in self.resource_limits:
+            raise ValueError(f"Recurso desconhecido na etapa {name}: {resource}")
+        self._steps[name] = PipelineStep(name, func, tuple(depends_on), resource, label or name)
+        return self
+
+    def _validate(self) -> None:
+        """Confere dependências inexistentes e ciclos"""
+        for step in self._steps.values():
+            for dependency in step.depends_on:
+                if dependency not in self._steps:
+                    raise ValueError(f"Etapa {step.name} depende de etapa inexistente: {dependency}")
+
+        remaining = {name: len(step.depends_on) for name, step in self._steps.items()}
+        dependents: Dict[str, List[str]] = {name: [] for name in self._steps}
+        for step in self._steps.values():
+            for dependency in step.depends_on:
+                dependents[dependency].append(step.name)
+        ready = [name for name, count in remaining.items() if count == 0]
+        visited = 0
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if visited != len(self._steps):
+            cycle = sorted(name for name, count in remaining.items() if count > 0)
+            raise ValueError(f"Dependência circular entre as etapas: {', '.join(cycle)}")
+
+    def _report(self, message: str, completed: int) -> None:
+        if self.progress_callback:
+            try:
+                self.progress_callback(message, completed, len(self._steps))
+            except Exception as e:
+                self.logger.debug(f"Erro no callback de progresso: {e}")
+
+    def _execute(self, step: PipelineStep) -> Tuple[Any, Optional[Exception], float]:
+        started = time.monotonic()
+        try:
+            return step.func(), None, time.monotonic() - started
+        except Exception as e:
+            return None, e, time.monotonic() - started
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Executa todas as etapas
+
+        Returns:
+            Dicionário com 'success', 'results' (etapa -> retorno), 'steps'
+            (etapa -> estado, recurso, início relativo, duração e erro),
+            listas 'failed', 'skipped' e 'cancelled' e 'total_time'
+        """
+        self._validate()
+        start = time.monotonic()
+        status = {name: 'pending' for name in self._steps}
+        steps_info: Dict[str, Dict[str, Any]] = {
+            name: {'status': 'pending', 'resource': step.resource, 'started_at': None,
+                   'duration': 0.0, 'error': None}
+            for name, step in self._steps.items()
+        }
+        results: Dict[str, Any] = {}
+        running = {resource: 0 for resource in self.resource_limits}
+        pending = {}
+        completed = 0
+
+        def finish(name: str, state: str) -> None:
+            status[name] = state
+            steps_info[name]['status'] = state
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pipeline') as pool:
+            while True:
+                # Etapas cuja dependência não terminou com sucesso não rodam
+                changed = True
+                while changed:
+                    changed = False
+                    for name, step in self._steps.items():
+                        if status[name] == 'pending' and any(
+                                status[dependency] in (STEP_FAILED, STEP_SKIPPED, STEP_CANCELLED)
+                                for dependency in step.depends_on):
+                            finish(name, STEP_SKIPPED)
+                            completed += 1
+                            changed = True
+
+                if self.should_stop is not None and self.should_stop():
+                    for name in self._steps:
+                        if status[name] == 'pending':
+                            finish(name, STEP_CANCELLED)
+                else:
+                    # Inicia as etapas prontas, na ordem em que foram adicionadas
+                    for name, step in self._steps.items():
+                        if len(pending) >= self.max_workers:
+                            break
+                        if (status[name] != 'pending'
+                                or running[step.resource] >= self.resource_limits[step.resource]
+                                or any(status[dependency] != STEP_DONE for dependency in step.depends_on)):
+                            continue
+                        status[name] = 'running'
+                        steps_info[name]['started_at'] = round(time.monotonic() - start, 3)
+                        running[step.resource] += 1
+                        pending[pool.submit(self._execute, step)] = step
+                        self._report(f"{step.label}...", completed)
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = pending.pop(future)
+                    running[step.resource] -= 1
+                    value, error, duration = future.result()
+                    steps_info[step.name]['duration'] = duration
+                    completed += 1
+                    if error is None:
+                        results[step.name] = value
+                        finish(step.name, STEP_DONE)
+                        self._report(f"{step.label}: concluído", completed)
+                    else:
+                        steps_info[step.name]['error'] = str(error)
+                        finish(step.name, STEP_FAILED)
+                        self.logger.error(f"Erro na etapa {step.name}: {error}")
+                        self._report(f"{step.label}: erro", completed)
+
+        # Nenhuma etapa pode ficar pendente (só aconteceria com dependências inválidas)
+        for name in self._steps:
+            if status[name] == 'pending':
+                finish(name, STEP_SKIPPED)
+
+        by_state = {state: [name for name in self._steps if status[name] == state]
+                    for state in (STEP_FAILED, STEP_SKIPPED, STEP_CANCELLED)}
+        total_time = time.monotonic() - start
+        busy_time = sum(info['duration'] for info in steps_info.values())
+        self.logger.info(
+            f"{len(results)}/{len(self._steps)} etapas concluídas em {total_time:.2f}s "
+            f"(soma das etapas: {busy_time:.2f}s)"
+        )
+        return {
+            'success': not by_state[STEP_FAILED],
+            'results': results,
+            'steps': steps_info,
+            'failed': by_state[STEP_FAILED],
+            'skipped': by_state[STEP_SKIPPED],
+            'cancelled': by_state[STEP_CANCELLED],
+            'total_time': total_time
+        }
@@ -46,6 +46,59 @@ class SystemMonitor:
             'peak_memory': 0.0,
             'uptime': 0
         }
+        
+        # Contador de espaço recuperável (opcional)
+        self.space_tracker = None
+        
+        # Última leitura de E/S de disco para get_load
+        self._last_disk_io = None
+        self._load_lock = threading.Lock()
+    
+    def attach_space_tracker(self, tracker):
+        """Inclui os totais de um ReclaimableSpaceTracker nas métricas"""
+        self.space_tracker = tracker
+    
+    def get_reclaimable_space(self):
+        """Espaço recuperável atual por categoria, ou None sem contador"""
+        if self.space_tracker is None:
+            return None
+        return self.space_tracker.get_totals()
+    
+    def get_load(self):
+        """
+        Carga atual de CPU e de disco, sem bloquear
+        
+        A ocupação do disco é a fração do tempo, desde a chamada anterior,
+        em que algum disco estava atendendo leituras ou escritas.
+        """
+        # Na primeira chamada não há leitura anterior para comparar
+        cpu_percent = psutil.cpu_percent(interval=None if self._last_disk_io else 0.1)
+        disk_busy_percent = 0.0
+        
+        with self._load_lock:
+            try:
+                counters = psutil.disk_io_counters(perdisk=True) or {}
+                now = time.monotonic()
+                busy = {}
+                for disk, io in counters.items():
+                    # busy_time só existe em Linux/BSD; no Windows usa o tempo de leitura + escrita
+                    busy[disk] = getattr(io, 'busy_time', io.read_time + io.write_time)
+                
+                if self._last_disk_io is not None:
+                    last_time, last_busy = self._last_disk_io
+                    elapsed_ms = (now - last_time) * 1000
+                    if elapsed_ms > 0:
+                        deltas = [busy[disk] - last_busy[disk] for disk in busy if disk in last_busy]
+                        if deltas:
+                            disk_busy_percent = min(100.0, max(deltas) / elapsed_ms * 100)
+                self._last_disk_io = (now, busy)
+            except Exception as e:
+                self.logger.debug(f"Erro ao ler E/S de disco: {e}")
+        
+        return {
+            'cpu_percent': cpu_percent,
+            'disk_busy_percent': disk_busy_percent
+        }
     
     def start_monitoring(self, interval=1.0, progress_callback=None):
         """Inicia o monitoramento em tempo real"""
@@ -227,6 +280,7 @@ class SystemMonitor:
                 'disk_total_gb': disk.total / (1024**3),
                 'network': network,
                 'temperatures': temperatures,
+                'reclaimable': self.get_reclaimable_space(),
                 'timestamp': time.time()
             }
         except Exception as e:
@@ -421,6 +475,7 @@ class SystemMonitor:
                     'packets_recv': network.packets_recv
                 },
                 'top_processes': top_processes,
+                'reclaimable': self.get_reclaimable_space(),
                 'uptime': time.time() - psutil.boot_time()
             }
             
@@ -25,6 +25,10 @@ class Utils:
                 logging.StreamHandler()
             ]
         )
+        
+        # Comprime e apaga logs, relatórios e backups antigos sem atrasar a inicialização
+        from .log_retention import RetentionManager
+        RetentionManager(log_dir).enforce_in_background()
         return logging.getLogger(__name__)
     
     @staticmethod
@@ -68,9 +72,10 @@ class Utils:
     
     @staticmethod
     def load_backup(backup_file):
-        """Carrega backup das configurações"""
+        """Carrega backup das configurações (também backups comprimidos .gz)"""
+        from .log_retention import open_artifact
         try:
-            with open(backup_file, 'r', encoding='utf-8') as f:
+            with open_artifact(backup_file) as f:
                 return json.load(f)
         except Exception as e:
             logging.error(f"Erro ao carregar backup: {e}")
@@ -119,9 +119,62 @@ def test_advanced_cleaning():
         # Teste básico de inicialização
         print("✅ Advanced Cleaner inicializado")
         
-        # Teste de detecção de duplicatas (apenas simulação)
-        print("✅ Módulo de detecção de duplicatas: OK")
-        
+        # Teste de detecção de duplicatas em diretório temporário
+        import tempfile
+        with tempfile.TemporaryDirectory() as temp_dir:
+            content = os.urandom(300 * 1024)
+            for name in ('a.bin', 'b.bin'):
+                with open(os.path.join(temp_dir, name), 'wb') as f:
+                    f.write(content)
+            with open(os.path.join(temp_dir, 'c.bin'), 'wb') as f:
+                f.write(content[:-1] + bytes([content[-1] ^ 1]))  # Mesmo tamanho, último byte diferente
+
+            duplicates = cleaner.find_duplicate_files([temp_dir])
+            stats = cleaner.duplicate_scan_stats
+            assert len(duplicates) == 1 and len(duplicates[0]['files']) == 2
+            print(f"✅ Módulo de detecção de duplicatas: OK (bytes lidos: {stats['bytes_read']})")
+            
+            duplicates = cleaner.find_duplicate_files([temp_dir], use_index=False, external_memory=True)
+            assert len(duplicates) == 1 and len(duplicates[0]['files']) == 2
+            print("✅ Detecção de duplicatas em memória externa: OK")
+
+        # Pastas duplicadas aninhadas: a ≡ b e c/mods ≡ a/mods ≡ b/mods
+        with tempfile.TemporaryDirectory() as temp_dir:
+            mods = {'m1.bin': os.urandom(300 * 1024), 'm2.bin': os.urandom(200 * 1024)}
+            for folder in ('a', 'b', 'c'):
+                os.makedirs(os.path.join(temp_dir, folder, 'mods'))
+                for name, data in mods.items():
+                    with open(os.path.join(temp_dir, folder, 'mods', name), 'wb') as f:
+                        f.write(data)
+            for folder in ('a', 'b'):
+                with open(os.path.join(temp_dir, folder, 'readme.txt'), 'wb') as f:
+                    f.write(b'leia-me' * 1000)
+
+            groups = cleaner.find_duplicate_directories([temp_dir], use_index=False, min_size=1)
+            mods_size = sum(len(data) for data in mods.values())
+            assert len(groups) == 2
+            assert {os.path.basename(group['original']['path']) for group in groups} == {'a', 'mods'}
+            assert groups[0]['total_size'] == mods_size + 7000
+            assert [d['path'] for d in groups[0]['duplicates']] in ([os.path.join(temp_dir, 'b')],
+                                                                     [os.path.join(temp_dir, 'a')])
+            assert groups[1]['duplicates'][0]['path'] == os.path.join(temp_dir, 'c', 'mods')
+            assert groups[1]['total_size'] == mods_size
+            print("✅ Pastas duplicadas aninhadas: OK")
+
+        # Maiores pastas de uma subpasta de uma árvore já analisada
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for folder, size in (('fora', 400), (os.path.join('alvo', 'a'), 200), (os.path.join('alvo', 'b'), 100)):
+                os.makedirs(os.path.join(temp_dir, folder))
+                with open(os.path.join(temp_dir, folder, 'dados.bin'), 'wb') as f:
+                    f.write(b'x' * size * 1024)
+
+            cleaner.get_largest_folders(temp_dir)
+            target = os.path.join(temp_dir, 'alvo')
+            folders = cleaner.get_largest_folders(target)
+            assert [os.path.basename(folder['path']) for folder in folders] == ['a', 'b']
+            assert all(folder['path'].startswith(target + os.sep) for folder in folders)
+            print("✅ Maiores pastas de uma subpasta: OK")
+
         # Teste de limpeza de drivers
         print("✅ Módulo de limpeza de drivers: OK")
         
@@ -133,6 +186,192 @@ def test_advanced_cleaning():
         print(f"⚠️ Limpeza avançada falhou: {e}")
         return False
 
+def test_file_linker():
+    """Testa a consolidação de duplicatas por links."""
+    print("\n🔗 Testando consolidação por links...")
+
+    try:
+        import tempfile
+        from unittest import mock
+        from optimizer import file_linker
+        from optimizer.file_linker import link_duplicate
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            def create(name, data):
+                path = os.path.join(temp_dir, name)
+                with open(path, 'wb') as f:
+                    f.write(data)
+                return path
+
+            content = os.urandom(64 * 1024)
+            original = create('original.bin', content)
+
+            # Conteúdo diferente (mesmo tamanho): nunca substitui
+            different = create('diferente.bin', content[:-1] + bytes([content[-1] ^ 1]))
+            assert link_duplicate(original, different, 'hardlink') is None
+            with open(different, 'rb') as f:
+                assert f.read() != content
+            print("✅ Conteúdo diferente recusado: OK")
+
+            # Outro volume: ignorado sem tocar no arquivo
+            other_volume = create('outro_volume.bin', content)
+            real_lstat = os.lstat
+
+            def lstat_other_volume(path, *args, **kwargs):
+                result = real_lstat(path, *args, **kwargs)
+                if path == other_volume:
+                    values = list(result)
+                    values[2] = result.st_dev + 1  # st_dev
+                    return os.stat_result(values)
+                return result
+
+            with mock.patch.object(file_linker.os, 'lstat', lstat_other_volume):
+                assert link_duplicate(original, other_volume, 'hardlink') is None
+            assert os.stat(other_volume).st_ino != os.stat(original).st_ino
+            print("✅ Outro volume ignorado: OK")
+
+            # Hardlink explícito e depois 'already_linked'
+            duplicate = create('duplicata.bin', content)
+            assert link_duplicate(original, duplicate, 'hardlink') == 'hardlink'
+            assert os.stat(duplicate).st_ino == os.stat(original).st_ino
+            assert link_duplicate(original, duplicate) == 'already_linked'
+            print("✅ Hardlink e already_linked: OK")
+
+            # 'auto' nunca cria hardlink: sem clone de blocos o arquivo fica como está
+            auto = create('auto.bin', content)
+            auto_inode = os.stat(auto).st_ino
+            method = link_duplicate(original, auto)
+            assert method in ('reflink', None)
+            if method is None:
+                assert os.stat(auto).st_ino == auto_inode
+            assert os.stat(auto).st_ino != os.stat(original).st_ino
+            print(f"✅ Modo auto sem hardlink: OK ({method or 'sem clone de blocos'})")
+
+            # Arquivo alterado durante a consolidação: desfaz e mantém a alteração
+            changing = create('alterado.bin', content)
+            real_identical = file_linker.files_identical
+
+            def identical_then_change(path_a, path_b, *args, **kwargs):
+                result = real_identical(path_a, path_b, *args, **kwargs)
+                with open(changing, 'ab') as f:
+                    f.write(b'novo')
+                return result
+
+            with mock.patch.object(file_linker, 'files_identical', identical_then_change):
+                assert link_duplicate(original, changing, 'hardlink') is None
+            with open(changing, 'rb') as f:
+                assert f.read() == content + b'novo'
+            assert not [name for name in os.listdir(temp_dir) if name.endswith('.link')]
+            print("✅ Alteração durante a consolidação desfeita: OK")
+
+        return True
+    except Exception as e:
+        print(f"⚠️ Consolidação por links falhou: {e}")
+        return False
+
+def test_quarantine():
+    """Testa a quarentena: desfazer e purga após a retenção."""
+    print("\n🗃️ Testando quarentena...")
+
+    try:
+        import tempfile
+        from optimizer.quarantine import QuarantineManager
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = QuarantineManager(manifest_dir=os.path.join(temp_dir, 'manifests'),
+                                        store_root=temp_dir)
+            target = os.path.join(temp_dir, 'alvo')
+            os.makedirs(os.path.join(target, 'sub'))
+            for name in ('a.tmp', os.path.join('sub', 'b.tmp')):
+                with open(os.path.join(target, name), 'wb') as f:
+                    f.write(b'x' * 100)
+
+            # Adicionar e desfazer restaura os arquivos
+            with manager.begin_run('teste') as run:
+                assert run.add(os.path.join(target, 'a.tmp')) == 100
+                assert run.remove_tree(os.path.join(target, 'sub')) == (1, 100)
+            assert run.moved_files == 2 and not os.path.exists(os.path.join(target, 'sub'))
+            undo = manager.undo_run(run.run_id)
+            assert undo['restored'] == 2 and undo['failed'] == 0
+            assert os.path.isfile(os.path.join(target, 'a.tmp'))
+            assert os.path.isfile(os.path.join(target, 'sub', 'b.tmp'))
+            assert not os.path.exists(manager.manifest_path(run.run_id))
+            print("✅ Desfazer quarentena: OK")
+
+            # Adicionar e purgar após a retenção remove a pasta e o manifesto
+            with manager.begin_run('teste') as run:
+                run.add_directory_contents(target)
+            store = manager.get_store(target)
+            assert os.listdir(target) == []
+            assert os.path.isdir(os.path.join(store, run.run_id))
+            purge = manager.purge_expired(retention_days=0)
+            assert purge['runs'] == 1 and purge['freed_size'] == 200
+            assert not os.path.exists(os.path.join(store, run.run_id))
+            assert not os.path.exists(manager.manifest_path(run.run_id))
+            assert manager.list_runs() == []
+            print("✅ Purga da quarentena: OK")
+
+        return True
+    except Exception as e:
+        print(f"⚠️ Quarentena falhou: {e}")
+        return False
+
+def test_step_executor():
+    """Testa o executor de etapas: falhas e limites por recurso."""
+    print("\n🧩 Testando executor de etapas...")
+
+    try:
+        import threading
+        from optimizer.step_executor import StepExecutor, STEP_DONE, STEP_SKIPPED
+
+        # Uma falha pula só as etapas que dependem dela
+        def fail():
+            raise RuntimeError("falha proposital")
+
+        executor = StepExecutor()
+        executor.add_step('a', fail)
+        executor.add_step('b', lambda: 'b', depends_on=['a'])
+        executor.add_step('c', lambda: 'c', depends_on=['b'])
+        executor.add_step('d', lambda: 'd')
+        executor.add_step('e', lambda: 'e', depends_on=['d'])
+        pipeline = executor.run()
+        assert not pipeline['success'] and pipeline['failed'] == ['a']
+        assert pipeline['skipped'] == ['b', 'c']
+        assert pipeline['results'] == {'d': 'd', 'e': 'e'}
+        assert pipeline['steps']['a']['error'] == "falha proposital"
+        assert pipeline['steps']['e']['status'] == STEP_DONE
+        assert pipeline['steps']['c']['status'] == STEP_SKIPPED
+        print("✅ Falha pula só as dependentes: OK")
+
+        # Nunca mais etapas simultâneas do que o limite do recurso
+        lock = threading.Lock()
+        running = {'disk': 0, 'network': 0}
+        peak = {'disk': 0, 'network': 0}
+
+        def step(resource):
+            def run():
+                with lock:
+                    running[resource] += 1
+                    peak[resource] = max(peak[resource], running[resource])
+                time.sleep(0.05)
+                with lock:
+                    running[resource] -= 1
+            return run
+
+        executor = StepExecutor(resource_limits={'disk': 1, 'network': 2}, max_workers=6)
+        for index in range(4):
+            executor.add_step(f'disk{index}', step('disk'), resource='disk')
+            executor.add_step(f'net{index}', step('network'), resource='network')
+        pipeline = executor.run()
+        assert pipeline['success'] and len(pipeline['results']) == 8
+        assert peak == {'disk': 1, 'network': 2}
+        print("✅ Limites por recurso: OK")
+
+        return True
+    except Exception as e:
+        print(f"⚠️ Executor de etapas falhou: {e}")
+        return False
+
 def test_advanced_optimization():
     """Testa as otimizações avançadas."""
     print("\n⚡ Testando otimizações avançadas...")
@@ -309,6 +548,9 @@ def main():
     test_results["Basic Functionality"] = test_basic_functionality()
     test_results["Hardware Detection"] = test_hardware_detection()
     test_results["Advanced Cleaning"] = test_advanced_cleaning()
+    test_results["Quarantine"] = test_quarantine()
+    test_results["File Linker"] = test_file_linker()
+    test_results["Step Executor"] = test_step_executor()
     test_results["Advanced Optimization"] = test_advanced_optimization()
     test_results["System Monitoring"] = test_system_monitoring()
     test_results["Scheduling"] = test_scheduling()
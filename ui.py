@@ -6,6 +6,8 @@ import json
 import os
 from datetime import datetime
 from optimizer import SystemCleaner, PerformanceOptimizer, NetworkOptimizer, RegistryOptimizer, Utils
+from optimizer.step_executor import StepExecutor
+from optimizer.background import BackgroundThrottle
 
 class OptimizerUI:
     """Interface gráfica moderna para o otimizador Windows"""
@@ -37,6 +39,9 @@ class OptimizerUI:
         # Configuração de logging
         self.logger = Utils.setup_logging()
         
+        # Estimativa de espaço recuperável (não bloqueia a abertura da janela)
+        threading.Thread(target=self.estimate_reclaimable_space, daemon=True).start()
+        
         # Verifica se é admin
         if not Utils.is_admin():
             self.show_admin_warning()
@@ -160,6 +165,14 @@ class OptimizerUI:
             font=ctk.CTkFont(size=12)
         )
         self.status_label.pack(pady=(0, 15))
+        
+        # Espaço recuperável estimado antes da limpeza
+        self.reclaimable_label = ctk.CTkLabel(
+            options_frame,
+            text="💾 Calculando espaço recuperável...",
+            font=ctk.CTkFont(size=12)
+        )
+        self.reclaimable_label.pack(pady=(0, 15))
     
     def create_individual_tab(self):
         """Cria aba de otimizações individuais"""
@@ -415,6 +428,22 @@ Você pode restaurar as configurações originais a qualquer momento.
         self.log_text.see(tk.END)
         self.root.update_idletasks()
     
+    def estimate_reclaimable_space(self):
+        """Calcula a estimativa de espaço recuperável e a atualiza conforme é refinada"""
+        def show(estimate):
+            if estimate['exact']:
+                text = f"💾 Espaço recuperável: {Utils.format_size(estimate['bytes'])} ({estimate['files']} arquivos)"
+            else:
+                text = (f"💾 Espaço recuperável estimado: {Utils.format_size(estimate['bytes'])} "
+                        f"({Utils.format_size(estimate['bytes_low'])} a {Utils.format_size(estimate['bytes_high'])})")
+            # Widgets só podem ser alterados pela thread da interface
+            self.root.after(0, lambda: self.reclaimable_label.configure(text=text))
+        
+        try:
+            show(self.cleaner.estimate_reclaimable_space(refine=True, callback=show))
+        except Exception as e:
+            self.logger.error(f"Erro ao estimar espaço recuperável: {e}")
+    
     # Métodos de otimização individual
     def clean_temp_files(self):
         """Limpa arquivos temporários"""
@@ -542,71 +571,82 @@ Você pode restaurar as configurações originais a qualquer momento.
         try:
             self.log_message("🚀 Iniciando otimização completa do sistema...")
             
-            total_steps = sum(1 for option in self.optimization_options.values() if option.get())
-            current_step = 0
+            # Etapas independentes rodam ao mesmo tempo, limitadas por recurso
+            # (um trabalho de disco por vez, escritas no registro em paralelo, etc.)
+            executor = StepExecutor(progress_callback=self._pipeline_progress,
+                                    should_stop=lambda: not self.is_optimizing)
+            step = self._step_progress
             
-            # Limpeza do sistema
+            # Limpeza do sistema (o botão Parar interrompe também a limpeza em andamento)
             if self.optimization_options['clean_system'].get():
-                current_step += 1
-                self.update_progress(f"Limpeza do sistema ({current_step}/{total_steps})", 
-                                   (current_step / total_steps) * 100)
-                
-                self.cleaner.clean_temp_files(self.update_progress)
-                self.cleaner.clean_recycle_bin(self.update_progress)
-                self.cleaner.clean_browser_data(self.update_progress)
-                self.cleaner.clean_windows_logs(self.update_progress)
+                stoppable = self._stoppable
+                executor.add_step('clean_temp', stoppable(lambda: self.cleaner.clean_temp_files(step)),
+                                  resource='disk', label="Limpeza de arquivos temporários")
+                executor.add_step('clean_recycle_bin', lambda: self.cleaner.clean_recycle_bin(step),
+                                  resource='disk', label="Esvaziando a lixeira")
+                executor.add_step('clean_browser', stoppable(lambda: self.cleaner.clean_browser_data(step)),
+                                  resource='disk', label="Limpeza dos navegadores")
+                executor.add_step('clean_logs', stoppable(lambda: self.cleaner.clean_windows_logs(step)),
+                                  resource='disk', label="Limpeza de logs do Windows")
             
             # Otimização de desempenho
             if self.optimization_options['optimize_performance'].get():
-                current_step += 1
-                self.update_progress(f"Otimização de desempenho ({current_step}/{total_steps})", 
-                                   (current_step / total_steps) * 100)
-                
-                self.performance.optimize_power_settings(self.update_progress)
-                self.performance.disable_unnecessary_services(self.update_progress)
-                self.performance.disable_visual_effects(self.update_progress)
-                self.performance.disable_indexing(self.update_progress)
-                self.performance.optimize_startup_programs(self.update_progress)
-                self.performance.optimize_memory_management(self.update_progress)
+                executor.add_step('power_settings', lambda: self.performance.optimize_power_settings(step),
+                                  resource='process', label="Plano de energia")
+                executor.add_step('services', lambda: self.performance.disable_unnecessary_services(step),
+                                  resource='process', label="Serviços desnecessários")
+                executor.add_step('visual_effects', lambda: self.performance.disable_visual_effects(step),
+                                  resource='registry', label="Efeitos visuais")
+                # Indexação também mexe em serviços: espera a etapa de serviços
+                executor.add_step('indexing', lambda: self.performance.disable_indexing(step),
+                                  depends_on=['services'], resource='process', label="Indexação de discos")
+                executor.add_step('startup_programs', lambda: self.performance.optimize_startup_programs(step),
+                                  resource='registry', label="Programas de inicialização")
+                executor.add_step('memory_management', lambda: self.performance.optimize_memory_management(step),
+                                  resource='registry', label="Gerenciamento de memória")
             
             # Otimização de rede
             if self.optimization_options['optimize_network'].get():
-                current_step += 1
-                self.update_progress(f"Otimização de rede ({current_step}/{total_steps})", 
-                                   (current_step / total_steps) * 100)
-                
-                self.network.optimize_dns('Cloudflare', self.update_progress)
-                self.network.optimize_tcp_settings(self.update_progress)
-                self.network.disable_qos_bandwidth_limit(self.update_progress)
-                self.network.optimize_network_adapter(self.update_progress)
+                executor.add_step('dns', lambda: self.network.optimize_dns('Cloudflare', step),
+                                  resource='network', label="DNS")
+                executor.add_step('tcp_settings', lambda: self.network.optimize_tcp_settings(step),
+                                  resource='registry', label="Configurações TCP")
+                executor.add_step('qos', lambda: self.network.disable_qos_bandwidth_limit(step),
+                                  resource='registry', label="Limite de banda do QoS")
+                # netsh ajusta os mesmos parâmetros TCP globais: roda depois do registro
+                executor.add_step('network_adapter', lambda: self.network.optimize_network_adapter(step),
+                                  depends_on=['tcp_settings'], resource='network', label="Adaptador de rede")
             
             # Otimização do registro
             if self.optimization_options['optimize_registry'].get():
-                current_step += 1
-                self.update_progress(f"Otimização do registro ({current_step}/{total_steps})", 
-                                   (current_step / total_steps) * 100)
-                
-                self.registry.disable_telemetry(self.update_progress)
-                self.registry.disable_cortana(self.update_progress)
-                self.registry.disable_windows_tips(self.update_progress)
-                self.registry.optimize_explorer_performance(self.update_progress)
-                self.registry.disable_background_apps(self.update_progress)
+                executor.add_step('telemetry', lambda: self.registry.disable_telemetry(step),
+                                  resource='registry', label="Telemetria")
+                executor.add_step('cortana', lambda: self.registry.disable_cortana(step),
+                                  resource='registry', label="Cortana")
+                executor.add_step('windows_tips', lambda: self.registry.disable_windows_tips(step),
+                                  resource='registry', label="Dicas do Windows")
+                executor.add_step('explorer', lambda: self.registry.optimize_explorer_performance(step),
+                                  resource='registry', label="Desempenho do Explorer")
+                executor.add_step('background_apps', lambda: self.registry.disable_background_apps(step),
+                                  resource='registry', label="Apps em segundo plano")
             
             # Remoção de bloatware (opcional)
             if self.optimization_options['remove_bloatware'].get():
-                current_step += 1
-                self.update_progress(f"Removendo bloatware ({current_step}/{total_steps})", 
-                                   (current_step / total_steps) * 100)
-                
-                self.cleaner.remove_bloatware(self.update_progress)
+                executor.add_step('bloatware', lambda: self.cleaner.remove_bloatware(step),
+                                  resource='process', label="Removendo bloatware")
             
             # Desabilitar Defender (opcional e perigoso)
             if self.optimization_options['disable_defender'].get():
-                current_step += 1
-                self.update_progress(f"Configurando Windows Defender ({current_step}/{total_steps})", 
-                                   (current_step / total_steps) * 100)
-                
-                self.performance.disable_windows_defender_realtime(self.update_progress)
+                executor.add_step('defender', lambda: self.performance.disable_windows_defender_realtime(step),
+                                  resource='process', label="Configurando Windows Defender")
+            
+            pipeline = executor.run()
+            for name in pipeline['failed']:
+                self.log_message(f"❌ Erro em {name}: {pipeline['steps'][name]['error']}")
+            if pipeline['cancelled']:
+                self.log_message(f"⏹️ {len(pipeline['cancelled'])} etapas não executadas")
+                return
+            self.log_message(f"⏱️ {len(executor)} etapas em {pipeline['total_time']:.1f}s")
             
             # Criar backup
             self.update_progress("Criando backup das configurações...", 95)
@@ -626,6 +666,26 @@ Você pode restaurar as configurações originais a qualquer momento.
             self.optimize_button.configure(state="normal")
             self.stop_button.configure(state="disabled")
     
+    def _stoppable(self, func):
+        """
+        Roda uma etapa de limpeza com um limite só de cancelamento: sem taxa nem
+        pausa por carga, mas os motores de limpeza param quando o usuário clica em Parar
+        """
+        def run():
+            with BackgroundThrottle(files_per_second=None, bytes_per_second=None,
+                                    cpu_pause_percent=None, disk_pause_percent=None,
+                                    lower_priority=False, should_stop=lambda: not self.is_optimizing):
+                return func()
+        return run
+    
+    def _pipeline_progress(self, message, completed, total):
+        """Progresso geral da otimização completa (etapas concluídas / total)"""
+        self.update_progress(f"{message} ({completed}/{total})", (completed / max(1, total)) * 95)
+    
+    def _step_progress(self, message, progress=None):
+        """Progresso interno de uma etapa: várias rodam ao mesmo tempo, então só a mensagem"""
+        self.root.after(0, lambda: self.status_label.configure(text=message))
+    
     def stop_optimization(self):
         """Para a otimização em andamento"""
         self.is_optimizing = False
@@ -699,7 +759,7 @@ Você pode restaurar as configurações originais a qualquer momento.
     def select_backup_file(self):
         """Seleciona arquivo de backup para restauração"""
         filename = filedialog.askopenfilename(
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            filetypes=[("JSON files", "*.json *.json.gz"), ("All files", "*.*")],
             title="Selecionar Arquivo de Backup"
         )
         